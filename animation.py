@@ -0,0 +1,111 @@
+import math
+import time
+import pygame
+
+class AnimationScheduler:
+    """
+    Plays a stream of tour moves on the board at a set rate without blocking the window.
+
+    The moves come from a generator such as KnightTour.random_moves, and the scheduler pulls them from the event loop's tick, so the window keeps handling
+    events between moves: it can be closed, exposed or sped up at any time. Moves are paid for with credit that grows with the time that has passed,
+    so when more than one move is due in a frame (a high rate, or a slow frame on a huge board) they are all applied and the board is only drawn once.
+    With no rate the moves are played as fast as possible, filling most of each frame and drawing once per frame.
+
+    Keys while playing: up or + doubles the rate, down or - halves it, space pauses and resumes.
+
+    Attributes:
+        ui (UserInteraction): The user interaction object that draws the board.
+        rate (float | None): Moves per second, or None to play as fast as possible.
+        fps (int): The maximum number of frames drawn per second.
+        paused (bool): True while the animation is paused.
+    """
+
+    def __init__(self, ui, rate=1.0, fps=60):
+        """
+        Initializes the scheduler.
+
+        Args:
+            ui (UserInteraction): The user interaction object that draws the board.
+            rate (float | None): Moves per second, or None to play as fast as possible.
+            fps (int): The maximum number of frames drawn per second.
+        """
+
+        self.ui = ui
+        self.rate = rate
+        self.fps = fps
+        self.paused = False
+
+    def handle_key(self, key):
+        """
+        Changes the speed of the animation or pauses it.
+
+        Args:
+            key (int): The pygame key code that was pressed.
+        """
+
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif self.rate is not None and key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.rate *= 2
+        elif self.rate is not None and key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.rate /= 2
+
+    def play(self, moves, on_frame=None):
+        """
+        Plays the moves until the generator is exhausted or the window is closed.
+
+        Args:
+            moves (Iterator[TourMove]): The moves to play. The generator applies each move to the chessboard as it is pulled.
+            on_frame (Callable[[TourMove], None]): Called after each drawn frame with the last move in it, for example to play a sound.
+
+        Returns:
+            bool: True if all moves were played, False if the window was closed. The quit event is posted again so the caller's loop sees it as well.
+        """
+
+        credit = 0.0
+        last_tick = time.perf_counter()
+        frame_budget = 0.8 / self.fps
+
+        def handle_event(event):
+            if event.type == pygame.QUIT:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+                return False
+            elif event.type == pygame.KEYDOWN:
+                self.handle_key(event.key)
+
+        def tick():
+            nonlocal credit, last_tick
+
+            now = time.perf_counter()
+            elapsed = now - last_tick
+            last_tick = now
+            if self.paused:
+                return None
+
+            if self.rate is None:
+                deadline = now + frame_budget
+                due = math.inf
+            else:
+                credit += elapsed * self.rate
+                due = int(credit)
+                credit -= due
+
+            last_move = None
+            finished = False
+            while due > 0:
+                move = next(moves, None)
+                if move is None:
+                    finished = True
+                    break
+                last_move = move
+                due -= 1
+                if self.rate is None and time.perf_counter() >= deadline:
+                    break
+
+            if last_move is not None:
+                self.ui.update_display()
+                if on_frame is not None:
+                    on_frame(last_move)
+            return True if finished else None
+
+        return self.ui.events.run(handle_event, self.ui.redraw, tick, self.fps)
@@ -0,0 +1,124 @@
+import numpy as np
+from move_table import KNIGHT, leaper_moves
+
+def neighbor_array(size, height=None, piece=KNIGHT):
+    """
+    Builds the move table of a piece as a NumPy array. Squares with fewer moves than the piece has offsets are padded with the number of squares,
+    which the batch engine uses as an extra square that is always visited.
+
+    Args:
+        size (int): The width of the chessboard.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that moves.
+
+    Returns:
+        numpy.ndarray: A (squares, len(piece.offsets)) array of neighbor square indices.
+    """
+
+    table = leaper_moves(piece, size, height)
+    squares = len(table)
+    neighbors = np.full((squares, len(piece.offsets)), squares, dtype=np.intp)
+    for square, moves in enumerate(table):
+        neighbors[square, :len(moves)] = moves
+    return neighbors
+
+def simulate_batch(size, iterations, seed=None, chunk_size=16384, memory_limit=64 * 2**20, height=None, piece=KNIGHT, start=None):
+    """
+    Runs many random tours in lockstep and returns the number of squares visited in each run.
+
+    Every tour starts on a uniformly random square, or on the given start square, and moves to a uniformly random unvisited neighbor until it gets stuck,
+    which gives the same moves-per-run distribution as KnightTour.random_tour(False, True).
+    The tours are processed in chunks so that the visited matrix stays within memory_limit bytes.
+
+    Args:
+        size (int): The size of the chessboard.
+        iterations (int): The number of tours to run.
+        seed (int | numpy.random.Generator | None): Seed or generator for the random moves.
+        chunk_size (int): The largest number of tours advanced together.
+        memory_limit (int): The largest visited matrix, in bytes, that a chunk may allocate.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that moves.
+        start (int | None): The flat index of the square every tour starts on, or None for a random square per tour.
+
+    Returns:
+        numpy.ndarray: The number of squares visited in each run.
+    """
+
+    rng = np.random.default_rng(seed)
+    neighbors = neighbor_array(size, height, piece)
+    chunk_size = max(1, min(chunk_size, memory_limit // (neighbors.shape[0] + 1)))
+
+    lengths = np.empty(iterations, dtype=np.int64)
+    for first in range(0, iterations, chunk_size):
+        count = min(chunk_size, iterations - first)
+        lengths[first:first + count] = run_chunk(neighbors, count, rng, start)
+    return lengths
+
+def simulate_batch_histogram(size, iterations, seed=None, height=None, piece=KNIGHT, start=None):
+    """
+    Runs many random tours with simulate_batch and counts how many runs visited each number of squares.
+
+    Args:
+        size (int): The width of the chessboard.
+        iterations (int): The number of tours to run.
+        seed (int | numpy.random.Generator | None): Seed or generator for the random moves.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that moves.
+        start (int | None): The flat index of the square every tour starts on, or None for a random square per tour.
+
+    Returns:
+        list[int]: A histogram where entry k is the number of runs that visited k squares.
+    """
+
+    squares = size * (size if height is None else height)
+    return np.bincount(simulate_batch(size, iterations, seed, height=height, piece=piece, start=start), minlength=squares + 1).tolist()
+
+def run_chunk(neighbors, count, rng, start=None):
+    """
+    Advances count random tours one move at a time until every tour is stuck.
+
+    Args:
+        neighbors (numpy.ndarray): The padded adjacency table from neighbor_array.
+        count (int): The number of tours to run.
+        rng (numpy.random.Generator): The random generator.
+        start (int | None): The flat index of the square every tour starts on, or None for a random square per tour.
+
+    Returns:
+        numpy.ndarray: The number of squares visited in each run.
+    """
+
+    squares = neighbors.shape[0]
+    stride = squares + 1
+    visited = np.zeros(count * stride, dtype=bool)
+    visited[squares::stride] = True
+
+    tours = np.arange(count)
+    position = rng.integers(0, squares, size=count) if start is None else np.full(count, start, dtype=np.intp)
+    visited[tours * stride + position] = True
+    lengths = np.ones(count, dtype=np.int64)
+
+    while tours.size > 0:
+        offsets = tours * stride
+        candidates = neighbors[position]
+        legal = ~visited[offsets[:, None] + candidates]
+        ranks = np.cumsum(legal, axis=1, dtype=np.int8)
+        moves = ranks[:, -1]
+
+        alive = moves > 0
+        if not alive.all():
+            tours = tours[alive]
+            offsets = offsets[alive]
+            candidates = candidates[alive]
+            ranks = ranks[alive]
+            moves = moves[alive]
+            if tours.size == 0:
+                break
+
+        choice = (rng.random(tours.size) * moves).astype(np.int8)
+        column = (ranks <= choice[:, None]).sum(axis=1, dtype=np.intp)
+        position = candidates[np.arange(tours.size), column]
+
+        visited[offsets + position] = True
+        lengths[tours] += 1
+
+    return lengths
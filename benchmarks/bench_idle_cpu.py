@@ -0,0 +1,80 @@
+"""
+Measures the CPU used by the menu and input loops while they sit idle waiting for the user.
+
+Each case runs in its own interpreter with pygame's dummy video and audio drivers. A timer posts a QUIT event after a few seconds,
+and the CPU time spent until then is reported as a share of one core. The busy-waiting loop the menu used before is included as the baseline.
+
+Run from the repository root with: python -m benchmarks.bench_idle_cpu
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+IDLE_SECONDS = 3
+
+def legacy_main_menu(menu):
+    """
+    The previous Menu.main_menu loop, which redraws and polls continuously, kept here as the baseline.
+    """
+
+    import pygame
+
+    running = True
+    while running:
+        menu.screen.fill((0, 0, 0))
+        start_button = menu.draw_start_button()
+        pygame.display.flip()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if start_button.collidepoint(event.pos):
+                    running = False
+
+def run_case(case):
+    """
+    Runs one idle loop until the QUIT timer fires and prints the CPU share it used.
+    """
+
+    import pygame
+    from chessboard import Chessboard
+    from user_interaction import UserInteraction
+    from knight_tour import KnightTour
+    from menu import Menu
+
+    chessboard = Chessboard(8)
+    ui = UserInteraction(chessboard)
+    menu = Menu(640, 640, chessboard, KnightTour(chessboard, ui), ui)
+    pygame.time.set_timer(pygame.QUIT, IDLE_SECONDS * 1000, loops=1)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        if case == "legacy main_menu":
+            legacy_main_menu(menu)
+        elif case == "main_menu":
+            menu.main_menu()
+        elif case == "knight_tour_done":
+            menu.knight_tour_done()
+        elif case == "click_to_coordinates":
+            ui.click_to_coordinates()
+    except SystemExit:
+        pass
+    print((time.process_time() - start_cpu) / (time.perf_counter() - start_wall))
+
+def main():
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    print(f"{'loop':<24} {'idle CPU':>9}")
+    for case in ("legacy main_menu", "main_menu", "knight_tour_done", "click_to_coordinates"):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_idle_cpu", case], env=environment,
+                                check=True, capture_output=True, text=True).stdout
+        print(f"{case:<24} {float(output.split()[-1]):>8.1%}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_case(" ".join(sys.argv[1:]))
+    else:
+        main()
@@ -0,0 +1,77 @@
+"""
+Measures how many knight moves per second next_valid_moves generates, comparing the
+offset arithmetic it used to do on every call against the cached adjacency table.
+
+Run from the repository root with: python -m benchmarks.bench_moves
+"""
+
+import random
+import time
+
+from chessboard import Chessboard
+from knight_tour import KnightTour
+
+def legacy_next_valid_moves(board, x, y):
+    """
+    The previous implementation of KnightTour.next_valid_moves on the list of lists board it used to read, kept here as the baseline.
+    """
+
+    valid_moves = []
+    size = len(board)
+
+    positions = [2, 2, -2, -2, 1, -1, 1, -1]
+    for position in range(len(positions)):
+        if y + positions[position] < size and y + positions[position] > -1 and x + positions[len(positions) - 1 - position] < size and x + positions[len(positions) - 1 - position] > -1:
+            if board[y + positions[position]][x + positions[len(positions) - 1 - position]] == 0:
+                valid_moves.append([x + positions[len(positions) - 1 - position], y + positions[position]])
+
+    return valid_moves
+
+def half_visited_board(size, seed):
+    """
+    Creates a chessboard where roughly half of the squares are marked as visited.
+    """
+
+    rng = random.Random(seed)
+    chessboard = Chessboard(size)
+    for y in range(size):
+        for x in range(size):
+            if rng.random() < 0.5:
+                chessboard.mark_square(x + 1, y + 1, 1)
+    return chessboard
+
+def legacy_board(chessboard):
+    """
+    Copies a chessboard into a plain list of lists, the board representation the baseline was written for.
+    """
+
+    return [[chessboard.value(y * chessboard.size + x) for x in range(chessboard.size)] for y in range(chessboard.size)]
+
+def measure(function, chessboard, repeats):
+    """
+    Calls function(x, y) for every square of the board, repeats times, and returns generated moves per second.
+    """
+
+    squares = [(x, y) for y in range(chessboard.size) for x in range(chessboard.size)]
+    generated = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for x, y in squares:
+            generated += len(function(x, y))
+    elapsed = time.perf_counter() - start
+    return generated / elapsed
+
+def main():
+    print(f"{'size':>6} {'before (moves/s)':>18} {'after (moves/s)':>18} {'speedup':>8}")
+    for size in (5, 8, 16, 32):
+        chessboard = half_visited_board(size, seed=size)
+        board = legacy_board(chessboard)
+        tour = KnightTour(chessboard, None)
+        repeats = max(1, 200000 // (size * size))
+
+        before = measure(lambda x, y: legacy_next_valid_moves(board, x, y), chessboard, repeats)
+        after = measure(tour.next_valid_moves, chessboard, repeats)
+        print(f"{size:>6} {before:>18,.0f} {after:>18,.0f} {after / before:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
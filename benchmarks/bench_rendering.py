@@ -0,0 +1,97 @@
+"""
+Measures the frame time of UserInteraction.update_display during a random tour, against redrawing every square and flipping the whole window on each
+move, which is how the board used to be drawn.
+
+Run from the repository root with: python -m benchmarks.bench_rendering
+The benchmark uses the dummy SDL drivers, so it needs no window and measures drawing rather than the display server.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import random
+import time
+
+import pygame
+
+from chessboard import Chessboard
+from move_table import knight_moves
+from user_interaction import UserInteraction
+
+def legacy_update_display(ui):
+    """
+    The previous update_display, kept here as the baseline: every square is filled, every number is rendered again and the whole window is flipped.
+    """
+
+    colors = [(255, 255, 255), (0, 0, 0)]
+    size = ui.chessboard.size
+    for row in range(size):
+        for col in range(size):
+            color = colors[(row + col) % 2]
+            pygame.draw.rect(ui.screen, color, pygame.Rect(col * ui.square_size, row * ui.square_size, ui.square_size, ui.square_size))
+
+    for row in range(size):
+        for col in range(size):
+            if ui.chessboard.board[row][col] == ui.chessboard.move:
+                ui.screen.blit(ui.knight_sprite, (col * ui.square_size, (size - 1 - row) * ui.square_size))
+            elif ui.chessboard.board[row][col] != 0:
+                text = ui.font.render(str(ui.chessboard.board[row][col]), True, (255, 0, 0))
+                text_rect = text.get_rect(center=(col * ui.square_size + ui.square_size // 2, (size - 1 - row) * ui.square_size + ui.square_size // 2))
+                ui.screen.blit(text, text_rect)
+
+    pygame.display.flip()
+
+def frame_times(ui, update, seed, frames):
+    """
+    Plays a random tour on the board, starting again when it gets stuck, and times update after each move.
+
+    Returns:
+        list[float]: The time of each frame in milliseconds.
+    """
+
+    chessboard = ui.chessboard
+    table = knight_moves(chessboard.size)
+    rng = random.Random(seed)
+    chessboard.reset_board()
+    ui.invalidate()
+    times = []
+    square = None
+
+    while len(times) < frames:
+        moves = [] if square is None else [move for move in table[square] if not chessboard.is_visited(move)]
+        if not moves:
+            chessboard.reset_board()
+            chessboard.move = 0
+            moves = [rng.randrange(chessboard.squares)]
+        square = moves[rng.randrange(len(moves))]
+        chessboard.move += 1
+        chessboard.mark_index(square, chessboard.move)
+
+        start = time.perf_counter()
+        update(ui)
+        times.append((time.perf_counter() - start) * 1000)
+
+    chessboard.reset_board()
+    return times
+
+def main():
+    print(f"{'size':>6} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    for size in (8, 32, 64):
+        chessboard = Chessboard(size)
+        ui = UserInteraction(chessboard)
+        frames = 200 if size < 64 else 60
+
+        before = frame_times(ui, legacy_update_display, 0, frames)
+        after = frame_times(ui, UserInteraction.update_display, 0, frames)
+        # The first incremental frame is a full redraw, which is reported separately from the steady state.
+        before_mean = sum(before) / len(before)
+        after_mean = sum(after[1:]) / (len(after) - 1)
+        print(f"{size:>6} {before_mean:>12.3f} {after_mean:>12.3f} {before_mean / after_mean:>7.1f}x")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures the cost of Chessboard.reset_board against clearing a list of lists cell by cell, which is how the board used to be reset.
+
+Run from the repository root with: python -m benchmarks.bench_reset
+"""
+
+import time
+
+from chessboard import Chessboard
+
+def legacy_reset(board):
+    """
+    The previous reset_board loop over a list of lists, kept here as the baseline.
+    """
+
+    for row in board:
+        for column in range(len(row)):
+            row[column] = 0
+
+def per_call(function, repeats):
+    """
+    Returns the average time of function() in microseconds.
+    """
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main():
+    print(f"{'size':>6} {'before (us)':>12} {'after (us)':>12}")
+    for size in (8, 32, 128, 512):
+        legacy_board = [[1] * size for _ in range(size)]
+        chessboard = Chessboard(size)
+        repeats = max(10, 100000 // (size * size))
+
+        before = per_call(lambda: legacy_reset(legacy_board), repeats)
+        after = per_call(chessboard.reset_board, repeats * 10)
+        print(f"{size:>6} {before:>12.2f} {after:>12.2f}")
+
+if __name__ == "__main__":
+    main()
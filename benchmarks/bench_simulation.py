@@ -0,0 +1,46 @@
+"""
+Measures random tours per second for the one-at-a-time simulation loop and the vectorized batch engine.
+
+Run from the repository root with: python -m benchmarks.bench_simulation
+"""
+
+import random
+import time
+
+from chessboard import Chessboard
+from knight_tour import KnightTour
+from batch_simulation import simulate_batch
+
+def loop_tours_per_second(size, iterations):
+    """
+    Runs the tours through KnightTour.random_tour(False, True) as KnightTour.simulation does.
+    """
+
+    chessboard = Chessboard(size)
+    tour = KnightTour(chessboard, None)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        tour.random_tour(False, True)
+        chessboard.reset_board()
+    return iterations / (time.perf_counter() - start)
+
+def batch_tours_per_second(size, iterations):
+    """
+    Runs the tours through the batch engine.
+    """
+
+    start = time.perf_counter()
+    simulate_batch(size, iterations, seed=0)
+    return iterations / (time.perf_counter() - start)
+
+def main():
+    random.seed(0)
+    print(f"{'size':>6} {'loop (tours/s)':>16} {'batch (tours/s)':>16}")
+    for size in (5, 8, 16):
+        loop = loop_tours_per_second(size, 2000)
+        batch = batch_tours_per_second(size, 100000)
+        print(f"{size:>6} {loop:>16,.0f} {batch:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
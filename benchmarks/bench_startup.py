@@ -0,0 +1,44 @@
+"""
+Measures import time and startup time of the headless simulator against the GUI modules it no longer loads.
+
+Every case runs in a fresh interpreter and is repeated a few times, the best time is reported.
+
+Run from the repository root with: python -m benchmarks.bench_startup
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+CASES = [
+    ("import pygame + matplotlib.pyplot (what importing knight_tour used to cost)", ["-c", "import pygame, matplotlib.pyplot"]),
+    ("import knight_tour", ["-c", "import knight_tour"]),
+    ("import knight_sim", ["-c", "import knight_sim"]),
+    ("python -m knight_sim --runs 1 --engine loop", ["-m", "knight_sim", "--runs", "1", "--engine", "loop"]),
+    ("python -m knight_sim --runs 1 --engine batch", ["-m", "knight_sim", "--runs", "1", "--engine", "batch"]),
+]
+
+def best_time(arguments, repeats):
+    """
+    Runs the interpreter with the arguments repeats times and returns the fastest wall time in seconds.
+    """
+
+    environment = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], check=True, stdout=subprocess.DEVNULL, env=environment)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    check = "import sys, knight_sim; knight_sim.main(['--runs', '10']); assert 'pygame' not in sys.modules and 'matplotlib' not in sys.modules"
+    subprocess.run([sys.executable, "-c", check], check=True, stdout=subprocess.DEVNULL)
+    print("headless simulator imports neither pygame nor matplotlib")
+
+    for label, arguments in CASES:
+        print(f"{best_time(arguments, 5) * 1000:>9.1f} ms  {label}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measures the time and the number of bytes written per move of a terminal random tour, for Chessboard.print_board after every move, which is how the
+terminal used to draw the board, against the full, incremental and final modes of TerminalRenderer.
+
+Run from the repository root with: python -m benchmarks.bench_terminal
+The output goes to os.devnull, so the numbers are the cost of building and writing the text, not of a terminal drawing it.
+"""
+
+import contextlib
+import os
+import random
+import time
+
+from chessboard import Chessboard
+from knight_tour import KnightTour
+from terminal_renderer import TerminalRenderer
+
+class CountingStream:
+    """
+    A text stream that counts the characters and writes it passes on to another stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.characters = 0
+        self.writes = 0
+
+    def write(self, text):
+        self.characters += len(text)
+        self.writes += 1
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return False
+
+def run_tour(size, show, finish):
+    """
+    Plays one random tour from the corner, calling show after every move and finish at the end.
+
+    Returns:
+        tuple[float, int]: The time per move in milliseconds and the number of moves.
+    """
+
+    chessboard = Chessboard(size)
+    knight_tour = KnightTour(chessboard, None)
+    random.seed(size)
+
+    start = time.perf_counter()
+    for tour_move in knight_tour.random_moves(0, 0):
+        show(chessboard, tour_move)
+    finish(chessboard)
+    return (time.perf_counter() - start) / chessboard.move * 1000, chessboard.move
+
+def main():
+    print(f"{'size':>6} {'moves':>6} {'mode':>12} {'ms/move':>9} {'bytes/move':>11} {'writes/move':>12}")
+    with open(os.devnull, "w") as devnull:
+        for size in (8, 32, 100):
+            stream = CountingStream(devnull)
+            with contextlib.redirect_stdout(stream):
+                per_move, moves = run_tour(size, lambda chessboard, tour_move: chessboard.print_board(), lambda chessboard: None)
+            print(f"{size:>6} {moves:>6} {'print_board':>12} {per_move:>9.3f} {stream.characters / moves:>11.0f} {stream.writes / moves:>12.1f}")
+
+            for mode in TerminalRenderer.MODES:
+                stream = CountingStream(devnull)
+                renderers = {}
+
+                def show(chessboard, tour_move):
+                    if chessboard not in renderers:
+                        renderers[chessboard] = TerminalRenderer(chessboard, stream, mode)
+                    renderers[chessboard].update(tour_move.x, tour_move.y)
+
+                per_move, moves = run_tour(size, show, lambda chessboard: renderers[chessboard].finish())
+                print(f"{size:>6} {moves:>6} {mode:>12} {per_move:>9.3f} {stream.characters / moves:>11.0f} {stream.writes / moves:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Measures how long the Warnsdorff solver takes to complete a tour from the corner on boards of increasing size.
+
+Run from the repository root with: python -m benchmarks.bench_warnsdorff
+"""
+
+import time
+
+from warnsdorff import warnsdorff_tour
+
+def main():
+    print(f"{'size':>6} {'solve time (s)':>15} {'squares/s':>12}")
+    for size in (8, 100, 300, 1000):
+        start = time.perf_counter()
+        tour = warnsdorff_tour(size, 0, 0)
+        elapsed = time.perf_counter() - start
+        if tour is None:
+            print(f"{size:>6} {'no tour':>15}")
+        else:
+            print(f"{size:>6} {elapsed:>15.3f} {len(tour) / elapsed:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Load test of the tour server: sends many requests from concurrent clients and reports the throughput and the latency percentiles.
+
+Start the server, then run from the repository root with:
+    python -m tour_server --workers 4
+    python -m benchmarks.load_test --requests 500 --concurrency 16
+    python -m benchmarks.load_test --endpoint solve --distinct 64 --out load.json
+
+Every request waits for its result ("wait": true), so a latency is the time from sending the request to having the result. With --distinct N
+the requests cycle through N different seeds or start squares, so the share of requests the server can answer from its cache is set by N.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def request_body(endpoint, index, options):
+    """
+    Builds the body of one request.
+
+    Args:
+        endpoint (str): "simulate", "solve" or "validate".
+        index (int): The number of the request.
+        options (argparse.Namespace): The options of the load test.
+
+    Returns:
+        dict: The JSON body.
+    """
+
+    variant = index % options.distinct
+    if endpoint == "simulate":
+        return {"size": options.size, "runs": options.runs, "seed": variant, "wait": True}
+    if endpoint == "solve":
+        square = variant % (options.size * options.size)
+        return {"size": options.size, "start": [square % options.size, square // options.size], "method": "warnsdorff", "wait": True}
+    # A valid tour of the board, which the first solve request of the test fetched.
+    return {"size": options.size, "tour": options.tour, "closed": False}
+
+def send(url, body, timeout):
+    """
+    Sends one request and times it.
+
+    Args:
+        url (str): The URL of the endpoint.
+        body (dict): The JSON body.
+        timeout (float): The most seconds to wait for the answer.
+
+    Returns:
+        tuple[int, float, bool]: The HTTP status (0 if the connection failed), the latency in seconds and whether the answer came from the cache.
+    """
+
+    data = json.dumps(body).encode()
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            answer = json.loads(response.read())
+            status = response.status
+    except urllib.error.HTTPError as error:
+        error.read()
+        return error.code, time.perf_counter() - started, False
+    except (urllib.error.URLError, OSError):
+        return 0, time.perf_counter() - started, False
+    latency = time.perf_counter() - started
+    result = answer.get("result") if isinstance(answer, dict) else None
+    return status, latency, bool(isinstance(result, dict) and result.get("cached"))
+
+def percentile(values, percent):
+    """
+    Finds a percentile of sorted values by the nearest-rank method.
+
+    Args:
+        values (list[float]): The sorted values.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile, or 0 without values.
+    """
+
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+def run(options):
+    """
+    Runs the load test.
+
+    Args:
+        options (argparse.Namespace): The options of the load test.
+
+    Returns:
+        dict: The parameters, the throughput, the status counts, the cache hits and the latency percentiles in milliseconds.
+    """
+
+    url = options.url.rstrip("/") + "/" + options.endpoint
+    if options.endpoint == "validate":
+        solved = json.loads(urllib.request.urlopen(urllib.request.Request(
+            options.url.rstrip("/") + "/solve", data=json.dumps({"size": options.size, "wait": True}).encode(), method="POST")).read())
+        options.tour = solved["result"]["tour"]
+
+    bodies = [request_body(options.endpoint, index, options) for index in range(options.requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        outcomes = list(pool.map(lambda body: send(url, body, options.timeout), bodies))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for status, latency, cached in outcomes if status == 200)
+    statuses = {}
+    for status, latency, cached in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "endpoint": options.endpoint,
+        "requests": options.requests,
+        "concurrency": options.concurrency,
+        "distinct": options.distinct,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "statuses": statuses,
+        "cached": sum(1 for status, latency, cached in outcomes if cached),
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+    }
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="load_test", description="Sends concurrent requests to the tour server and reports latency percentiles.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="base URL of the server")
+    parser.add_argument("--endpoint", choices=["simulate", "solve", "validate"], default="simulate", help="the endpoint to load")
+    parser.add_argument("--requests", type=int, default=200, help="total number of requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="clients sending requests at the same time")
+    parser.add_argument("--distinct", type=int, default=1000000, help="number of different seeds or start squares to cycle through")
+    parser.add_argument("--size", type=int, default=8, help="size of the board")
+    parser.add_argument("--runs", type=int, default=10000, help="tours per simulation request")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for an answer")
+    parser.add_argument("--out", default=None, help="write the report as JSON to this file")
+    options = parser.parse_args(arguments)
+
+    report = run(options)
+    if options.out is not None:
+        with open(options.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+    latency = report["latency_ms"]
+    print(f"{report['requests']} {report['endpoint']} requests, {report['concurrency']} clients, {report['elapsed']:.2f} s")
+    print(f"throughput {report['throughput']:.1f} requests/s, {report['cached']} answered from the cache, statuses {report['statuses']}")
+    print(f"latency (ms)  mean {latency['mean']:.1f}  p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  p99 {latency['p99']:.1f}  "
+          f"max {latency['max']:.1f}")
+    if any(status != "200" for status in report["statuses"]):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
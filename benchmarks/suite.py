@@ -0,0 +1,475 @@
+"""
+The benchmark suite: repeatable micro and macro benchmarks of the tour engine over several board sizes and seeds, with JSON results and a
+comparison that flags regressions against a baseline.
+
+Run from the repository root with:
+    python -m benchmarks.suite run --out benchmarks/baseline.json    (to record a baseline before changing the code)
+    python -m benchmarks.suite run --compare                         (to compare against it afterwards)
+    python -m benchmarks.suite compare results.json
+
+Every case is run once to warm up and calibrate, then timed repeats times, each time running it often enough to take at least min_time
+seconds. The comparison looks at the median of the repeats, and only flags a case that is slower than the threshold plus a margin for the
+spread of the repeats of both runs, measured as the median absolute deviation. So a noisy case needs a larger slowdown to be flagged than a
+steady one, and a few slow repeats on a busy machine cannot flag anything. The rendering cases use the dummy SDL drivers, so the suite
+needs no window or audio device.
+
+A baseline is only meaningful on the machine it was recorded on, so none is kept in the repository: record one before changing the code
+and compare against it afterwards. benchmarks/baseline.json, the default, is ignored by git.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import fnmatch
+import gc
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from chessboard import Chessboard
+from knight_tour import KnightTour
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+#How many times the relative spread of the two runs is added to the threshold before a slowdown counts as a regression.
+NOISE_MARGIN = 3
+
+def filled_board(size, seed):
+    """
+    Builds a chessboard with about half of its squares visited at random, so move checks see a mix of free and visited squares.
+
+    Returns:
+        tuple[Chessboard, random.Random]: The board and the random generator used to fill it, for drawing further inputs.
+    """
+
+    rng = random.Random(seed)
+    chessboard = Chessboard(size)
+    for square in rng.sample(range(chessboard.squares), chessboard.squares // 2):
+        chessboard.mark_index(square, 1)
+    return chessboard, rng
+
+def bench_next_valid_moves(size, seed):
+    """
+    Lists the moves from every square of a half-visited board, in random order.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of calls in one run of it.
+    """
+
+    chessboard, rng = filled_board(size, seed)
+    knight_tour = KnightTour(chessboard, None)
+    squares = [(square % size, square // size) for square in range(chessboard.squares)]
+    rng.shuffle(squares)
+
+    def run():
+        for x, y in squares:
+            knight_tour.next_valid_moves(x, y)
+
+    return run, len(squares)
+
+def bench_is_valid_move(size, seed):
+    """
+    Checks 10,000 random moves, most of them illegal, on a half-visited board.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of calls in one run of it.
+    """
+
+    chessboard, rng = filled_board(size, seed)
+    knight_tour = KnightTour(chessboard, None)
+    checks = [(rng.randrange(size), rng.randrange(size), rng.randrange(size), rng.randrange(size)) for check in range(10000)]
+
+    def run():
+        for current_x, current_y, x, y in checks:
+            knight_tour.is_valid_move(current_x, current_y, x, y)
+
+    return run, len(checks)
+
+def bench_reset_board(size, seed):
+    """
+    Resets a half-visited board 20,000 times.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of resets in one run of it.
+    """
+
+    chessboard, rng = filled_board(size, seed)
+
+    def run():
+        for reset in range(20000):
+            chessboard.reset_board()
+
+    return run, 20000
+
+def bench_random_tour(size, seed):
+    """
+    Plays random tours from the corner without drawing them, resetting the board after each one.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of tours in one run of it.
+    """
+
+    chessboard = Chessboard(size)
+    knight_tour = KnightTour(chessboard, None)
+    tours = max(10, 20000 // chessboard.squares)
+
+    def run():
+        random.seed(seed)
+        for tour in range(tours):
+            knight_tour.random_tour(False, True)
+            chessboard.reset_board()
+
+    return run, tours
+
+def bench_simulation_loop(size, seed):
+    """
+    Runs a simulation with the loop engine.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of tours in one run of it.
+    """
+
+    knight_tour = KnightTour(Chessboard(size), None)
+    runs = max(10, 100000 // (size * size))
+
+    def run():
+        knight_tour.run_simulation(runs, seed=seed)
+
+    return run, runs
+
+def bench_simulation_batch(size, seed):
+    """
+    Runs a simulation with the batch engine.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of tours in one run of it.
+    """
+
+    knight_tour = KnightTour(Chessboard(size), None)
+    runs = max(100, 1000000 // (size * size))
+
+    def run():
+        knight_tour.run_simulation(runs, batch=True, seed=seed)
+
+    return run, runs
+
+def bench_warnsdorff(size, seed):
+    """
+    Solves a tour from the corner with Warnsdorff's rule.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of squares in one run of it.
+    """
+
+    from warnsdorff import warnsdorff_tour
+
+    def run():
+        warnsdorff_tour(size, 0, 0, seed=seed)
+
+    return run, size * size
+
+def bench_update_display(size, seed):
+    """
+    Draws every frame of a random tour in the pygame window, which the dummy video driver keeps off screen.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of frames in one run of it.
+    """
+
+    from user_interaction import UserInteraction
+
+    chessboard = Chessboard(size)
+    ui = UserInteraction(chessboard)
+    knight_tour = KnightTour(chessboard, ui)
+    frames = 0
+
+    def run():
+        nonlocal frames
+        chessboard.reset_board()
+        ui.redraw()
+        frames = 0
+        for tour_move in knight_tour.random_moves(0, 0, random.Random(seed)):
+            ui.update_display()
+            frames += 1
+
+    # The number of frames depends on the tour, so it is measured by one untimed run.
+    run()
+    return run, frames
+
+def bench_terminal_incremental(size, seed):
+    """
+    Draws every move of a random tour with the incremental terminal renderer into a string buffer.
+
+    Args:
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+
+    Returns:
+        tuple[callable, int]: The timed function and the number of moves in one run of it.
+    """
+
+    from terminal_renderer import TerminalRenderer
+
+    chessboard = Chessboard(size)
+    knight_tour = KnightTour(chessboard, None)
+    moves = 0
+
+    def run():
+        nonlocal moves
+        chessboard.reset_board()
+        renderer = TerminalRenderer(chessboard, io.StringIO(), "incremental")
+        renderer.show()
+        moves = 0
+        for tour_move in knight_tour.random_moves(0, 0, random.Random(seed)):
+            renderer.update(tour_move.x, tour_move.y)
+            moves += 1
+
+    run()
+    return run, moves
+
+#Every case: its kind, the function that sets it up for a board size and seed and returns the timed function and the number of operations it
+#does, what an operation is and the default board sizes.
+CASES = {
+    "next_valid_moves": ("micro", bench_next_valid_moves, "call", (8, 32, 128)),
+    "is_valid_move": ("micro", bench_is_valid_move, "call", (8, 32, 128)),
+    "reset_board": ("micro", bench_reset_board, "call", (8, 32, 128, 512)),
+    "random_tour": ("macro", bench_random_tour, "tour", (8, 16, 32)),
+    "simulation_loop": ("macro", bench_simulation_loop, "tour", (8, 16)),
+    "simulation_batch": ("macro", bench_simulation_batch, "tour", (8, 16)),
+    "warnsdorff": ("macro", bench_warnsdorff, "square", (8, 100, 300)),
+    "update_display": ("macro", bench_update_display, "frame", (8, 32)),
+    "terminal_incremental": ("macro", bench_terminal_incremental, "move", (8, 32)),
+}
+
+def measure(case, size, seed, repeats, min_time=0.1):
+    """
+    Times one case on one board size and seed.
+
+    Args:
+        case (str): The name of the case.
+        size (int): The size of the chessboard.
+        seed (int): The seed of the inputs.
+        repeats (int): The number of timed runs.
+        min_time (float): The shortest time in seconds a timed run may take. Short cases are run several times in a row to reach it.
+
+    Returns:
+        dict: The result, with the times per operation in microseconds.
+    """
+
+    kind, setup, unit, sizes = CASES[case]
+    run, ops = setup(size, seed)
+    start = time.perf_counter()
+    run()
+    loops = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)) + 1)
+
+    times = []
+    for repeat in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        for loop in range(loops):
+            run()
+        times.append((time.perf_counter() - start) / (loops * ops) * 1e6)
+
+    median = statistics.median(times)
+    return {
+        "case": case,
+        "kind": kind,
+        "size": size,
+        "seed": seed,
+        "unit": f"us/{unit}",
+        "ops": ops * loops,
+        "repeats": repeats,
+        "median": median,
+        "mad": statistics.median(abs(sample - median) for sample in times),
+        "min": min(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if repeats > 1 else 0.0,
+    }
+
+def run_suite(patterns=("*",), sizes=None, seeds=(0, 1), repeats=10, min_time=0.1, stream=sys.stdout):
+    """
+    Runs every case whose name matches one of the patterns.
+
+    Args:
+        patterns (list[str]): Shell-style patterns of case names.
+        sizes (list[int] | None): The board sizes, defaults to the sizes of each case.
+        seeds (list[int]): The seeds to run every size with.
+        repeats (int): The number of timed runs of every case.
+        min_time (float): The shortest time in seconds a timed run may take.
+        stream: Where the progress table is printed.
+
+    Returns:
+        dict: The machine description and the results, in the layout of the JSON files.
+    """
+
+    results = []
+    print(f"{'case':<22} {'size':>5} {'seed':>5} {'median':>12} {'min':>12} {'mad':>10}", file=stream)
+    for case, (kind, setup, unit, default_sizes) in CASES.items():
+        if not any(fnmatch.fnmatch(case, pattern) for pattern in patterns):
+            continue
+        for size in default_sizes if sizes is None else sizes:
+            for seed in seeds:
+                result = measure(case, size, seed, repeats, min_time)
+                results.append(result)
+                print(f"{case:<22} {size:>5} {seed:>5} {result['median']:>12.3f} {result['min']:>12.3f} {result['mad']:>10.3f}  "
+                      f"{result['unit']}", file=stream, flush=True)
+
+    return {
+        "machine": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                    "platform": platform.platform(), "processor": platform.processor(), "cpus": os.cpu_count()},
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+def compare(baseline, current, threshold, stream=sys.stdout):
+    """
+    Compares two sets of results case by case on the median time per operation.
+
+    A case is only flagged when its slowdown is beyond the threshold plus NOISE_MARGIN times the relative spread of both runs, so noisy
+    cases need a larger slowdown than steady ones. Results recorded before the spread was kept use their standard deviation instead.
+
+    Args:
+        baseline (dict): The stored results.
+        current (dict): The new results.
+        threshold (float): The relative slowdown, such as 0.1 for 10%, beyond which a steady case counts as a regression.
+        stream: Where the comparison table is printed.
+
+    Returns:
+        list[dict]: The results of current that regressed.
+    """
+
+    before = {(result["case"], result["size"], result["seed"]): result for result in baseline["results"]}
+    regressions = []
+    print(f"{'case':<22} {'size':>5} {'seed':>5} {'baseline':>12} {'current':>12} {'change':>8} {'limit':>8}", file=stream)
+    for result in current["results"]:
+        old = before.get((result["case"], result["size"], result["seed"]))
+        row = f"{result['case']:<22} {result['size']:>5} {result['seed']:>5}"
+        if old is None:
+            print(f"{row} {'-':>12} {result['median']:>12.3f} {'new':>8}", file=stream)
+            continue
+        change = result["median"] / old["median"] - 1
+        noise = sum(run.get("mad", run["stdev"]) / run["median"] for run in (old, result))
+        limit = threshold + NOISE_MARGIN * noise
+        flag = ""
+        if change > limit:
+            flag = "  REGRESSION"
+            regressions.append(result)
+        print(f"{row} {old['median']:>12.3f} {result['median']:>12.3f} {change:>+8.1%} {limit:>+8.1%}{flag}", file=stream)
+    return regressions
+
+def load(path):
+    """
+    Reads a JSON results file.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        dict | None: The results, or None if the file does not exist.
+    """
+
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+def main(arguments=None):
+    """
+    Runs the suite or compares results, depending on the command.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="benchmarks.suite",
+                                     description="Runs the benchmark suite and compares results against a baseline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("cases", nargs="*", default=["*"], help="shell-style patterns of the cases to run, all by default")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=None, help="board sizes, defaults to the sizes of each case")
+    run_parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1], help="seeds to run every size with")
+    run_parser.add_argument("--repeats", type=int, default=10, help="timed runs of every case")
+    run_parser.add_argument("--min-time", type=float, default=0.1, help="shortest time in seconds of a timed run")
+    run_parser.add_argument("--out", default=None, help="write the results as JSON to this file")
+    run_parser.add_argument("--compare", nargs="?", const=BASELINE, default=None, metavar="BASELINE",
+                            help="compare the results against a baseline, benchmarks/baseline.json if no file is given")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that counts as a regression, 0.2 for 20%%")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("current", help="the new results")
+    compare_parser.add_argument("--baseline", default=BASELINE, help="the stored results, benchmarks/baseline.json by default")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that counts as a regression, 0.2 for 20%%")
+
+    commands.add_parser("list", help="list the cases")
+    options = parser.parse_args(arguments)
+
+    if options.command == "list":
+        for case, (kind, setup, unit, sizes) in CASES.items():
+            print(f"{case:<22} {kind:<6} us/{unit:<7} sizes {', '.join(map(str, sizes))}")
+        return
+
+    path = options.compare if options.command == "run" else options.baseline
+    baseline = None if path is None else load(path)
+    if path is not None and baseline is None:
+        # Checked before running, so a missing baseline does not waste the whole run.
+        sys.exit(f"there is no baseline at {path}, record one with: python -m benchmarks.suite run --out benchmarks/baseline.json")
+
+    if options.command == "run":
+        current = run_suite(options.cases, options.sizes, options.seeds, options.repeats, options.min_time)
+        if options.out is not None:
+            with open(options.out, "w") as file:
+                json.dump(current, file, indent=2)
+        if baseline is None:
+            return
+    else:
+        current = load(options.current)
+        if current is None:
+            sys.exit(f"there are no results at {options.current}")
+
+    print()
+    regressions = compare(baseline, current, options.threshold)
+    if regressions:
+        sys.exit(f"{len(regressions)} case(s) are more than {options.threshold:.0%} plus their noise slower than the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,89 @@
+from array import array
+from instrumentation import instrument
+
 class Chessboard:
     """
     A chessboard for the knight to move across.
 
+    The board is width squares wide and height squares high, square unless a height is given. The state is kept in two compact arrays:
+    a bitmask of visited squares, stored as 64-bit words, and a flat array of the move number each square was visited on.
+    Squares are identified by their flat index, index = y * width + x.
+    A move number is only meaningful while the square's visited bit is set, which lets reset_board clear the board by zeroing the bitmask alone.
+
     Attributes:
-        size (int): The size of the chessboard.
-        board (list[list[int]]): A 2D list representing each square/position on of the board.
+        width (int): The number of columns.
+        height (int): The number of rows.
+        size (int): The number of columns, the same as width. On a square board it is the size of the board.
+        squares (int): The number of squares on the board.
+        visited (array.array): The visited bitmask, one bit per square packed into 64-bit words.
+        moves (array.array): The move number each square was visited on, indexed by flat square index.
+        board (BoardView): A 2D view of the board, where board[row][col] is the move number of the square or 0 if it is unvisited.
         move (int): The current move number.
     """
 
-    def __init__(self, size):
+    def __init__(self, width, height=None):
         """
         Initializes the chessboard with the provided size and sets all squares to unvisited.
 
         Args:
-            size (int): The size of the chessboard.
+            width (int): The number of columns, or the size of a square board.
+            height (int): The number of rows, defaults to the width.
         """
-        self.size = size
-        self.board = []
+        self.width = width
+        self.height = width if height is None else height
+        self.size = width
+        self.squares = self.width * self.height
         self.move = 0
 
-        for row in range(size):
-            self.board.append([])
-            for column in range(size):
-                self.board[row].append(0)
-    
+        words = (self.squares + 63) // 64
+        self.visited = array('Q', bytes(8 * words))
+        self.cleared = array('Q', bytes(8 * words))
+        self.moves = array('H' if self.squares <= 0xFFFF else 'L', [0]) * self.squares
+        self.board = BoardView(self)
+
+    def is_visited(self, index):
+        """
+        Checks if a square has been visited.
+
+        Args:
+            index (int): The flat index of the square.
+
+        Returns:
+            bool: True if the square has been visited, otherwise False.
+        """
+
+        return self.visited[index >> 6] >> (index & 63) & 1 == 1
+
+    def value(self, index):
+        """
+        Reads the move number of a square.
+
+        Args:
+            index (int): The flat index of the square.
+
+        Returns:
+            int: The move the square was visited on, or 0 if it is unvisited.
+        """
+
+        if self.visited[index >> 6] >> (index & 63) & 1:
+            return self.moves[index]
+        return 0
+
+    def mark_index(self, index, move):
+        """
+        Marks a square as visited with the given move number. Marking a square with move 0 sets it back to unvisited.
+
+        Args:
+            index (int): The flat index of the square.
+            move (int): The current move.
+        """
+
+        if move == 0:
+            self.visited[index >> 6] &= ~(1 << (index & 63))
+        else:
+            self.visited[index >> 6] |= 1 << (index & 63)
+            self.moves[index] = move
+
     def mark_square(self, x, y, move):
         """
         Marks a square on the board as visited with the current move number.
@@ -34,16 +94,14 @@ class Chessboard:
             move (int): The current move.
         """
 
-        self.board[y - 1][x - 1] = move
+        self.mark_index((y - 1) * self.width + x - 1, move)
 
     def reset_board(self):
         """
-        Resets the board and move count to their initial states.
+        Resets the board and move count to their initial states. Only the visited bitmask is cleared, the stale move numbers are ignored until they are overwritten.
         """
 
-        for row in self.board:
-            for column in range(len(row)):
-                row[column] = 0
+        self.visited[:] = self.cleared
         self.move = 0
 
     def print_board(self):
@@ -53,4 +111,80 @@ class Chessboard:
 
         print("-----------")
         for column in range(len(self.board)):
-            print(self.board[len(self.board) - 1 - column])
\ No newline at end of file
+            print(self.board[len(self.board) - 1 - column])
+
+class BoardView:
+    """
+    A read and write view of a Chessboard in the list of lists shape, where board[row][col] is the move number of the square.
+
+    Attributes:
+        chessboard (Chessboard): The chessboard the view reads from.
+    """
+
+    def __init__(self, chessboard):
+        """
+        Initializes the view of the given chessboard.
+
+        Args:
+            chessboard (Chessboard): The chessboard to view.
+        """
+
+        self.chessboard = chessboard
+
+    def __len__(self):
+        return self.chessboard.height
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.chessboard.height:
+            raise IndexError("board row out of range")
+        return BoardRow(self.chessboard, row)
+
+    def __iter__(self):
+        for row in range(self.chessboard.height):
+            yield BoardRow(self.chessboard, row)
+
+class BoardRow:
+    """
+    A single row of a BoardView.
+
+    Attributes:
+        chessboard (Chessboard): The chessboard the row belongs to.
+        offset (int): The flat index of the first square in the row.
+    """
+
+    def __init__(self, chessboard, row):
+        """
+        Initializes the view of one row of the given chessboard.
+
+        Args:
+            chessboard (Chessboard): The chessboard to view.
+            row (int): The row index.
+        """
+
+        self.chessboard = chessboard
+        self.offset = row * chessboard.width
+
+    def __len__(self):
+        return self.chessboard.width
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.chessboard.width:
+            raise IndexError("board column out of range")
+        return self.chessboard.value(self.offset + col)
+
+    def __setitem__(self, col, move):
+        if not 0 <= col < self.chessboard.width:
+            raise IndexError("board column out of range")
+        self.chessboard.mark_index(self.offset + col, move)
+
+    def __iter__(self):
+        for col in range(self.chessboard.width):
+            yield self.chessboard.value(self.offset + col)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+instrument(Chessboard, counters={"reset_board": "resets", "mark_index": "squares marked"})
@@ -0,0 +1,466 @@
+import math
+import random
+from statistics import NormalDist
+from move_table import KNIGHT, leaper_moves
+
+def z_score(confidence):
+    """
+    Finds the number of standard deviations a two-sided normal confidence interval reaches on each side of the estimate.
+
+    Args:
+        confidence (float): The confidence level, such as 0.95.
+
+    Returns:
+        float: The z-score, 1.96 for 0.95.
+    """
+
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def mean_interval(mean, variance, count, confidence=0.95):
+    """
+    Builds the normal-approximation confidence interval of a mean.
+
+    Args:
+        mean (float): The sample mean.
+        variance (float): The sample variance.
+        count (int): The number of samples.
+        confidence (float): The confidence level.
+
+    Returns:
+        tuple[float, float]: The lower and upper end of the interval. With fewer than two samples the variance is unknown, so it is unbounded.
+    """
+
+    if count < 2:
+        return -math.inf, math.inf
+    error = z_score(confidence) * math.sqrt(variance / count)
+    return mean - error, mean + error
+
+def wilson_interval(successes, count, confidence=0.95):
+    """
+    Builds the Wilson score confidence interval of a probability, which unlike the normal approximation stays meaningful when few or no
+    successes have been seen.
+
+    Args:
+        successes (int): The number of successes.
+        count (int): The number of trials.
+        confidence (float): The confidence level.
+
+    Returns:
+        tuple[float, float]: The lower and upper end of the interval. Without trials it is [0, 1].
+    """
+
+    if count == 0:
+        return 0.0, 1.0
+    z = z_score(confidence)
+    rate = successes / count
+    center = (rate + z * z / (2 * count)) / (1 + z * z / count)
+    error = z / (1 + z * z / count) * math.sqrt(rate * (1 - rate) / count + z * z / (4 * count * count))
+    return max(0.0, center - error), min(1.0, center + error)
+
+class Estimate:
+    """
+    The outcome of an adaptive simulation: an estimate, its confidence interval and how many runs it took.
+
+    Attributes:
+        quantity (str): "mean" for the mean tour length or "completion" for the probability that a tour visits every square.
+        method (str): "uniform" for plain random tours or "importance" for importance sampling.
+        estimate (float): The estimated value.
+        low (float): The lower end of the confidence interval.
+        high (float): The upper end of the confidence interval.
+        confidence (float): The confidence level of the interval.
+        target (float): The interval width that was asked for.
+        relative (bool): True if the target is relative to the estimate.
+        runs (int): The number of tours that were run.
+        converged (bool): True if the target was met, False if the simulation stopped at its run limit first.
+        statistics (TourStatistics | None): The tour length statistics of a uniform simulation.
+    """
+
+    def __init__(self, quantity, method, estimate, low, high, confidence, target, relative, runs, statistics=None):
+        """
+        Initializes the estimate.
+
+        Args:
+            quantity (str): "mean" or "completion".
+            method (str): "uniform" or "importance".
+            estimate (float): The estimated value.
+            low (float): The lower end of the confidence interval.
+            high (float): The upper end of the confidence interval.
+            confidence (float): The confidence level of the interval.
+            target (float): The interval width that was asked for.
+            relative (bool): True if the target is relative to the estimate.
+            runs (int): The number of tours that were run.
+            statistics (TourStatistics | None): The tour length statistics of a uniform simulation.
+        """
+
+        self.quantity = quantity
+        self.method = method
+        self.estimate = estimate
+        self.low = low
+        self.high = high
+        self.confidence = confidence
+        self.target = target
+        self.relative = relative
+        self.runs = runs
+        self.converged = target_met(low, high, estimate, target, relative)
+        self.statistics = statistics
+
+    @property
+    def width(self):
+        """
+        float: The width of the confidence interval.
+        """
+
+        return self.high - self.low
+
+    @property
+    def error(self):
+        """
+        float: Half the width of the confidence interval, the achieved plus-or-minus error.
+        """
+
+        return self.width / 2
+
+    def summary(self):
+        """
+        Collects the estimate in a dictionary.
+
+        Returns:
+            dict: Every attribute except the statistics.
+        """
+
+        return {"quantity": self.quantity, "method": self.method, "estimate": self.estimate, "low": self.low, "high": self.high, "error": self.error,
+                "confidence": self.confidence, "target": self.target, "relative": self.relative, "runs": self.runs, "converged": self.converged}
+
+    def __repr__(self):
+        return (f"Estimate({self.quantity}={self.estimate:.6g} +/- {self.error:.3g} at {self.confidence:.0%}, method={self.method}, runs={self.runs}, "
+                f"converged={self.converged})")
+
+def target_met(low, high, estimate, target, relative):
+    """
+    Checks whether a confidence interval is as narrow as asked for.
+
+    Args:
+        low (float): The lower end of the interval.
+        high (float): The upper end of the interval.
+        estimate (float): The estimate, which a relative target is scaled by.
+        target (float): The width asked for.
+        relative (bool): True if the target is relative to the estimate. A relative target is never met while the estimate is 0.
+
+    Returns:
+        bool: True if the interval is at most the target wide.
+    """
+
+    if relative:
+        return estimate > 0 and high - low <= target * estimate
+    return high - low <= target
+
+class ImportanceSampler:
+    """
+    Estimates the probability that a random tour visits every square, by sequential importance sampling.
+
+    A random tour starts on a uniformly random square and then moves to a uniformly random unvisited neighbor until it is stuck. On an 8x8
+    board almost none of them visit every square, so counting complete tours among uniform ones would take billions of runs for a useful estimate.
+    Instead the tours are drawn from a proposal that prefers neighbors with few onward moves, as Warnsdorff's rule does, so many more of them
+    complete, and every move is weighted by how much more likely it was under the uniform walk than under the proposal.
+
+    A neighbor with d > 0 onward moves is proposed with weight exp(-bias * d). Moves after which the tour certainly cannot be completed, such as
+    stepping past a square that then has no way in, are never proposed: those tours would get 0 weight anyway, so leaving them out keeps the
+    estimate unbiased and only removes wasted runs.
+
+    A single weighted tour has a very heavy-tailed weight on large boards, so a sample is a population of particles tours that advance together,
+    one move at a time. After every move the population is resampled in proportion to the weights of that move, which drops the tours that got
+    stuck or became unlikely and copies the likely ones, and the mean weight of the move is multiplied into the sample's estimate. The product is
+    an unbiased estimate of the probability, as is the mean over independent samples, whose spread gives the confidence interval.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        squares (int): The number of squares.
+        piece (Leaper): The piece that moves.
+        bias (float): How strongly the proposal prefers neighbors with few onward moves. 0 is the uniform walk.
+        particles (int): The number of tours in the population of a sample.
+        table (tuple[tuple[int]]): The moves from every square.
+        count (int): The number of samples drawn.
+        tours (int): The number of tours drawn, particles per sample.
+        mean (float): The mean of the sample estimates, which is the estimate.
+        m2 (float): The sum of squared deviations of the sample estimates from their mean.
+    """
+
+    def __init__(self, width, height=None, piece=KNIGHT, bias=0.5, particles=200):
+        """
+        Initializes the sampler.
+
+        Args:
+            width (int): The width of the board.
+            height (int): The height of the board, defaults to the width.
+            piece (Leaper): The piece that moves.
+            bias (float): How strongly the proposal prefers neighbors with few onward moves.
+            particles (int): The number of tours in the population of a sample.
+        """
+
+        self.width = width
+        self.height = width if height is None else height
+        self.squares = self.width * self.height
+        self.piece = piece
+        self.bias = bias
+        self.particles = particles
+        self.table = leaper_moves(piece, self.width, self.height)
+        self.degrees = bytes(len(moves) for moves in self.table)
+        self.weights = [0.0] + [math.exp(-bias * onward) for onward in range(1, len(piece.offsets) + 1)]
+        self.count = 0
+        self.tours = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def start(self, rng):
+        """
+        Starts a tour on a uniformly random square.
+
+        Args:
+            rng (random.Random): The random generator.
+
+        Returns:
+            list: The state of the tour: the square it stands on, the number of unvisited neighbors of every square, the visited squares and the
+                unvisited squares with at most one unvisited neighbor, the only ones that can cut a tour short.
+        """
+
+        degree = bytearray(self.degrees)
+        visited = bytearray(self.squares)
+        low = set()
+        square = rng.randrange(self.squares)
+        visited[square] = 1
+        for neighbor in self.table[square]:
+            degree[neighbor] -= 1
+            if degree[neighbor] <= 1:
+                low.add(neighbor)
+        low.discard(square)
+        return [square, degree, visited, low]
+
+    def step(self, state, remaining, rng):
+        """
+        Moves a tour to a square drawn from the proposal.
+
+        Args:
+            state (list): The state of the tour from start, which is updated.
+            remaining (int): The number of unvisited squares before the move.
+            rng (random.Random): The random generator.
+
+        Returns:
+            float: The weight of the move, its probability under the uniform walk divided by its probability under the proposal, or 0 if no
+                move can lead to a complete tour.
+        """
+
+        square, degree, visited, low = state
+        weights = self.weights
+        candidates = [neighbor for neighbor in self.table[square] if not visited[neighbor]]
+
+        if remaining == 1:
+            # Any candidate completes the tour, so the proposal is the uniform walk.
+            if not candidates:
+                return 0.0
+            square = candidates[rng.randrange(len(candidates))]
+            ratio = 1.0
+        else:
+            allowed = [candidate for candidate in candidates if self.viable(candidate, remaining - 1, degree, visited, low)]
+            total = 0.0
+            for candidate in allowed:
+                total += weights[degree[candidate]]
+            if total == 0.0:
+                return 0.0
+            pick = rng.random() * total
+            for square in allowed:
+                pick -= weights[degree[square]]
+                if pick < 0:
+                    break
+            # The uniform walk picks the square with probability 1 / len(candidates), the proposal with weight / total.
+            ratio = total / (len(candidates) * weights[degree[square]])
+
+        visited[square] = 1
+        low.discard(square)
+        for neighbor in self.table[square]:
+            degree[neighbor] -= 1
+            if degree[neighbor] <= 1 and not visited[neighbor]:
+                low.add(neighbor)
+        state[0] = square
+        return ratio
+
+    def viable(self, candidate, remaining, degree, visited, low):
+        """
+        Checks whether moving to a square still leaves a way to visit every square. A False answer is certain, so leaving the move out of the
+        proposal only drops tours that would have got stuck.
+
+        After the move, an unvisited square without unvisited neighbors can only be visited next, as the last square, and a square with one
+        unvisited neighbor that is not next to the candidate has to be the last square.
+
+        Args:
+            candidate (int): The square to move to.
+            remaining (int): The number of unvisited squares after the move.
+            degree (bytearray): The number of unvisited neighbors of every square before the move.
+            visited (bytearray): The visited squares before the move.
+            low (set[int]): The unvisited squares with at most one unvisited neighbor before the move.
+
+        Returns:
+            bool: False if no tour can be completed after the move.
+        """
+
+        adjacent = self.table[candidate]
+        stuck = 0
+        ends = 0
+        for square in low.union(neighbor for neighbor in adjacent if degree[neighbor] <= 2):
+            if square == candidate or visited[square]:
+                continue
+            next_to = square in adjacent
+            onward = degree[square] - next_to
+            if onward == 0:
+                if not next_to:
+                    return False
+                stuck += 1
+            elif onward == 1 and not next_to:
+                ends += 1
+        if stuck > 0:
+            return stuck == 1 and remaining == 1
+        return ends <= 1
+
+    def sample(self, rng):
+        """
+        Advances a population of tours to the end, resampling after every move.
+
+        Args:
+            rng (random.Random): The random generator.
+
+        Returns:
+            float: The estimate of this sample, 0 if every tour got stuck.
+        """
+
+        particles = self.particles
+        states = [self.start(rng) for particle in range(particles)]
+        estimate = 1.0
+        for remaining in range(self.squares - 1, 0, -1):
+            weights = [self.step(state, remaining, rng) for state in states]
+            total = sum(weights)
+            if total == 0.0:
+                return 0.0
+            estimate *= total / particles
+            if remaining == 1:
+                break
+
+            # Systematic resampling: one random offset, then particles evenly spaced picks along the cumulative weights.
+            resampled = []
+            position = rng.random() * total / particles
+            cumulative = 0.0
+            for state, weight in zip(states, weights):
+                cumulative += weight
+                copies = 0
+                while position < cumulative and len(resampled) < particles:
+                    square, degree, visited, low = state
+                    resampled.append(state if copies == 0 else [square, bytearray(degree), bytearray(visited), set(low)])
+                    copies += 1
+                    position += total / particles
+            states = resampled
+        return estimate
+
+    def run(self, samples, rng):
+        """
+        Draws samples and adds their estimates to the running mean and variance.
+
+        Args:
+            samples (int): The number of samples to draw.
+            rng (random.Random): The random generator.
+        """
+
+        for run in range(samples):
+            estimate = self.sample(rng)
+            self.count += 1
+            self.tours += self.particles
+            delta = estimate - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (estimate - self.mean)
+
+    @property
+    def variance(self):
+        """
+        float: The sample variance of the sample estimates.
+        """
+
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def interval(self, confidence=0.95):
+        """
+        Builds the confidence interval of the estimate. Until there are two samples, at least one of them nonzero, the spread is unknown, so the
+        interval is unbounded.
+
+        Args:
+            confidence (float): The confidence level.
+
+        Returns:
+            tuple[float, float]: The lower and upper end of the interval.
+        """
+
+        if self.count < 2 or self.mean == 0.0:
+            return 0.0, math.inf
+        low, high = mean_interval(self.mean, self.variance, self.count, confidence)
+        return max(0.0, low), high
+
+def estimate_completion(width, height=None, piece=KNIGHT, target=0.1, confidence=0.95, relative=True, bias=0.5, particles=200, max_runs=1000000,
+                        seed=None, min_samples=10):
+    """
+    Estimates the probability that a random tour visits every square with an ImportanceSampler, drawing samples until the confidence interval
+    is narrow enough.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board, defaults to the width.
+        piece (Leaper): The piece that moves.
+        target (float): The interval width to reach, relative to the estimate by default.
+        confidence (float): The confidence level of the interval.
+        relative (bool): True if the target is relative to the estimate, False for an absolute width.
+        bias (float): How strongly the proposal prefers neighbors with few onward moves.
+        particles (int): The number of tours in the population of a sample.
+        max_runs (int): The most tours to draw if the target is not met.
+        seed (int | None): Seed of the random generator.
+        min_samples (int): The fewest samples to draw before trusting the interval, since the spread of a few heavy-tailed samples can look
+            deceptively small.
+
+    Returns:
+        Estimate: The estimate. Its runs are the number of tours drawn.
+    """
+
+    sampler = ImportanceSampler(width, height, piece, bias, particles)
+    rng = random.Random(seed)
+    while sampler.tours + particles <= max_runs or sampler.count < 2:
+        sampler.run(1, rng)
+        low, high = sampler.interval(confidence)
+        if sampler.count >= min_samples and target_met(low, high, sampler.mean, target, relative):
+            break
+
+    low, high = sampler.interval(confidence)
+    return Estimate("completion", "importance", sampler.mean, low, high, confidence, target, relative, sampler.tours)
+
+def statistics_estimate(statistics, quantity="mean", target=0.5, confidence=0.95, relative=False):
+    """
+    Builds the estimate of a uniform simulation from its statistics so far.
+
+    The mean tour length gets a normal confidence interval. The probability that a tour visits every square gets a Wilson interval, which stays
+    meaningful while few or no complete tours have been seen.
+
+    Args:
+        statistics (TourStatistics): The statistics of the simulation.
+        quantity (str): "mean" for the mean tour length or "completion" for the probability that a tour visits every square.
+        target (float): The interval width to reach.
+        confidence (float): The confidence level of the interval.
+        relative (bool): True if the target is relative to the estimate, False for an absolute width.
+
+    Returns:
+        Estimate: The estimate.
+    """
+
+    if quantity == "mean":
+        estimate = statistics.mean
+        low, high = mean_interval(statistics.mean, statistics.variance, statistics.count, confidence)
+    elif quantity == "completion":
+        completed = statistics.histogram[-1]
+        estimate = completed / statistics.count if statistics.count else 0.0
+        low, high = wilson_interval(completed, statistics.count, confidence)
+    else:
+        raise ValueError(f"unknown quantity {quantity!r}, expected mean or completion")
+    return Estimate(quantity, "uniform", estimate, low, high, confidence, target, relative, statistics.count, statistics)
@@ -0,0 +1,74 @@
+import pygame
+
+class EventLoop:
+    """
+    An event-driven pygame loop that sleeps while nothing happens.
+
+    The loop blocks in pygame.event.wait until an event arrives, so an idle window uses no CPU. The screen is only redrawn when the loop is marked dirty:
+    once at the start, whenever the window is exposed, and whenever a handler calls invalidate. An optional tick callback runs at a capped rate,
+    and the loop then waits at most until the next tick is due.
+
+    Attributes:
+        dirty (bool): True if the screen has to be redrawn before the loop waits again.
+    """
+
+    REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+
+    def __init__(self):
+        """
+        Initializes the loop.
+        """
+
+        self.dirty = True
+
+    def invalidate(self):
+        """
+        Marks the screen as changed so that it is redrawn before the loop waits for the next event.
+        """
+
+        self.dirty = True
+
+    def run(self, handle_event, draw=None, tick=None, fps=30):
+        """
+        Runs the loop until a handler returns a result.
+
+        Args:
+            handle_event (Callable[[pygame.event.Event], Any]): Called for every event. Returning anything other than None stops the loop.
+            draw (Callable[[], None]): Redraws and updates the screen. Called only when the loop is dirty.
+            tick (Callable[[], Any]): Called at most fps times per second. Returning anything other than None stops the loop.
+            fps (int): The tick rate.
+
+        Returns:
+            Any: The result returned by the handler or tick that stopped the loop.
+        """
+
+        self.dirty = True
+        interval = 1000 // fps if fps else 0
+        next_tick = pygame.time.get_ticks() + interval
+
+        while True:
+            if self.dirty and draw is not None:
+                self.dirty = False
+                draw()
+
+            if tick is None:
+                event = pygame.event.wait()
+            else:
+                # pygame.event.wait treats a timeout of 0 as no timeout, so a tick that is already due polls instead.
+                timeout = next_tick - pygame.time.get_ticks()
+                event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.poll()
+
+            # Queued events are taken one at a time, so the events after the one that stops the loop stay queued for the next loop.
+            while event.type != pygame.NOEVENT:
+                if event.type in self.REDRAW_EVENTS:
+                    self.dirty = True
+                result = handle_event(event)
+                if result is not None:
+                    return result
+                event = pygame.event.poll()
+
+            if tick is not None and pygame.time.get_ticks() >= next_tick:
+                next_tick = max(next_tick + interval, pygame.time.get_ticks())
+                result = tick()
+                if result is not None:
+                    return result
@@ -0,0 +1,255 @@
+import threading
+from collections import OrderedDict
+from chessboard import Chessboard
+from move_table import KNIGHT, leaper_moves
+from tour_search import TourSearch
+
+class Hint:
+    """
+    What is known about a candidate move of a tour in progress.
+
+    Attributes:
+        status (str): "tour" if a tour that visits every remaining square exists after the move, "dead" if none does and "unknown" if the
+            search ran out of budget before it could tell.
+        remaining (int): The number of squares the tour can still visit, counting the candidate: the exact number for "tour", otherwise the
+            length of a Warnsdorff continuation, a lower bound of what is possible.
+        tour (list[int] | None): The flat square indices of a tour from the candidate over every remaining square, if one was found.
+    """
+
+    def __init__(self, status, remaining, tour=None):
+        """
+        Initializes the hint.
+
+        Args:
+            status (str): "tour", "dead" or "unknown".
+            remaining (int): The number of squares the tour can still visit, counting the candidate.
+            tour (list[int] | None): A tour from the candidate over every remaining square.
+        """
+
+        self.status = status
+        self.remaining = remaining
+        self.tour = tour
+
+    def __repr__(self):
+        return f"Hint(status={self.status!r}, remaining={self.remaining})"
+
+class HintEngine:
+    """
+    Works out, for every move the player can make in a manual tour, whether a tour over every remaining square can still be completed after it.
+
+    The candidates are searched by a TourSearch with a node limit, in a background thread, so the window keeps responding while it thinks.
+    Every result is stored in a transposition table keyed by the visited squares and the square the piece stands on, as a bitmask and an index.
+    When a tour is found, every position along it is stored too, so while the player follows a tour that was found, the hints of the next moves
+    are known at once instead of being searched again. The table is kept for the lifetime of the engine, up to table_size positions, dropping
+    the least recently used.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        piece (Leaper): The piece that tours the board.
+        node_limit (int): The most search nodes to spend on a candidate.
+        table_size (int): The most positions to keep in the transposition table.
+        table (OrderedDict[tuple[int, int], Hint]): The transposition table, from (visited bitmask, square) to the hint of that position.
+        hints (dict[int, Hint]): The hints of the candidates of the current request found so far, by square.
+        hits (int): The number of positions that were found in the table.
+        searches (int): The number of positions that had to be searched.
+    """
+
+    def __init__(self, width, height=None, piece=KNIGHT, node_limit=100000, table_size=100000):
+        """
+        Initializes the engine.
+
+        Args:
+            width (int): The width of the board.
+            height (int): The height of the board, defaults to the width.
+            piece (Leaper): The piece that tours the board.
+            node_limit (int): The most search nodes to spend on a candidate.
+            table_size (int): The most positions to keep in the transposition table.
+        """
+
+        self.width = width
+        self.height = width if height is None else height
+        self.piece = piece
+        self.node_limit = node_limit
+        self.table_size = table_size
+        self.moves = leaper_moves(piece, self.width, self.height)
+        self.table = OrderedDict()
+        self.hints = {}
+        self.hits = 0
+        self.searches = 0
+        self.lock = threading.Lock()
+        self.thread = None
+        self.search = None
+        self.position = None
+        self.cancelled = threading.Event()
+
+    def request(self, chessboard, square):
+        """
+        Starts working out the hints of the moves from a square, cancelling the previous request. Hints already in the table are available at
+        once, the rest are searched in the background.
+
+        Args:
+            chessboard (Chessboard): The board of the tour in progress. It is copied, so the tour can go on while the search runs.
+            square (int): The flat index of the square the piece stands on.
+        """
+
+        visited = sum(word << 64 * index for index, word in enumerate(chessboard.visited))
+        if self.position == (visited, square) and self.busy:
+            # The same position again, for example after an illegal click, so the search carries on.
+            return
+        self.cancel()
+        self.position = (visited, square)
+        candidates = [neighbor for neighbor in self.moves[square] if not visited >> neighbor & 1]
+
+        pending = []
+        with self.lock:
+            self.hints = {}
+            for candidate in candidates:
+                hint = self.lookup(visited | 1 << candidate, candidate)
+                if hint is None:
+                    pending.append(candidate)
+                else:
+                    self.hints[candidate] = hint
+
+        if pending:
+            self.cancelled = threading.Event()
+            self.thread = threading.Thread(target=self.evaluate, args=(visited, pending, self.cancelled), daemon=True)
+            self.thread.start()
+
+    def results(self):
+        """
+        Returns the hints of the current request found so far. Safe to call from the window while the search runs.
+
+        Returns:
+            dict[int, Hint]: The hints by the flat index of the candidate square.
+        """
+
+        with self.lock:
+            return dict(self.hints)
+
+    @property
+    def busy(self):
+        """
+        bool: True while candidates of the current request are being searched.
+        """
+
+        return self.thread is not None and self.thread.is_alive()
+
+    def cancel(self):
+        """
+        Stops the search of the current request and waits for the background thread to finish.
+        """
+
+        self.cancelled.set()
+        search = self.search
+        if search is not None:
+            search.cancel()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def lookup(self, visited, square):
+        """
+        Looks a position up in the transposition table. Must be called with the lock held.
+
+        Args:
+            visited (int): The bitmask of visited squares, including the square.
+            square (int): The flat index of the square the piece stands on.
+
+        Returns:
+            Hint | None: The stored hint, or None if the position is not in the table.
+        """
+
+        hint = self.table.get((visited, square))
+        if hint is not None:
+            self.table.move_to_end((visited, square))
+            self.hits += 1
+        return hint
+
+    def store(self, visited, square, hint):
+        """
+        Stores the hint of a position, and for a tour the hints of every position along it. Must be called with the lock held.
+
+        Args:
+            visited (int): The bitmask of visited squares, including the square.
+            square (int): The flat index of the square the piece stands on.
+            hint (Hint): The hint of the position.
+        """
+
+        if hint.status == "tour":
+            tour = hint.tour
+            for index in range(len(tour)):
+                if index > 0:
+                    visited |= 1 << tour[index]
+                self.table[(visited, tour[index])] = Hint("tour", len(tour) - index, tour[index:])
+                self.table.move_to_end((visited, tour[index]))
+        else:
+            self.table[(visited, square)] = hint
+            self.table.move_to_end((visited, square))
+        while len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+
+    def evaluate(self, visited, candidates, cancelled):
+        """
+        Searches the candidates that are not in the table, in the background thread, and publishes each hint as soon as it is known.
+
+        Args:
+            visited (int): The bitmask of visited squares before the move.
+            candidates (list[int]): The flat indices of the candidate squares to search.
+            cancelled (threading.Event): Set when the request is replaced or cancelled.
+        """
+
+        for candidate in candidates:
+            if cancelled.is_set():
+                return
+            after = visited | 1 << candidate
+            board = Chessboard(self.width, self.height)
+            for index in range(len(board.visited)):
+                board.visited[index] = after >> 64 * index & 0xFFFFFFFFFFFFFFFF
+            search = TourSearch(board, candidate, node_limit=self.node_limit, piece=self.piece)
+            self.search = search
+            if cancelled.is_set():
+                return
+            result = search.run()
+            self.search = None
+            if result.status == "cancelled":
+                return
+
+            if result.status == "found":
+                hint = Hint("tour", len(result.tour), result.tour)
+            else:
+                hint = Hint("dead" if result.status == "exhausted" else "unknown", self.continuation(after, candidate))
+            with self.lock:
+                self.searches += 1
+                self.store(after, candidate, hint)
+                if not cancelled.is_set():
+                    self.hints[candidate] = hint
+
+    def continuation(self, visited, square):
+        """
+        Counts the squares a Warnsdorff continuation visits from a position: always move to the unvisited neighbor with the fewest onward moves.
+
+        Args:
+            visited (int): The bitmask of visited squares, including the square.
+            square (int): The flat index of the square the piece stands on.
+
+        Returns:
+            int: The number of squares visited, counting the square.
+        """
+
+        moves = self.moves
+        length = 1
+        while True:
+            best = None
+            best_degree = len(self.piece.offsets) + 1
+            for neighbor in moves[square]:
+                if not visited >> neighbor & 1:
+                    degree = sum(1 for onward in moves[neighbor] if not visited >> onward & 1)
+                    if degree < best_degree:
+                        best = neighbor
+                        best_degree = degree
+            if best is None:
+                return length
+            square = best
+            visited |= 1 << square
+            length += 1
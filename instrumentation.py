@@ -0,0 +1,272 @@
+import argparse
+import atexit
+import functools
+import json
+import os
+import runpy
+import sys
+import time
+
+#Opt-in counters and timers for the hot paths of the tour engine and the graphics.
+#
+#Classes register the methods worth watching with instrument(). While instrumentation is off nothing else happens, so the methods stay exactly as
+#they are written and cost nothing extra. When it is on, the registered methods are replaced by wrappers that count calls, count the items a
+#generator yields or time each call, and a summary is written when the program exits.
+#
+#Instrumentation is turned on with the KNIGHT_INSTRUMENT environment variable before the program starts, or with enable() (knight_sim --instrument):
+#    KNIGHT_INSTRUMENT=1 or table    a table on stderr at exit
+#    KNIGHT_INSTRUMENT=json          JSON on stderr at exit
+#    KNIGHT_INSTRUMENT=FILE          the summary written to FILE, as JSON if FILE ends in .json and otherwise as a table
+#Only the current process is counted, not the workers of the parallel engine.
+#
+#Any program can be run under instrumentation, cProfile or tracemalloc with:
+#    python -m instrumentation [--instrument [FILE]] [--profile FILE | --tracemalloc FILE] main.py
+#    python -m instrumentation --profile sim.prof -m knight_sim --runs 100000
+
+ENVIRONMENT_VARIABLE = "KNIGHT_INSTRUMENT"
+
+enabled = False
+output = None
+counters = {}
+timers = {}
+registered = []
+
+def counted(function, name):
+    """
+    Wraps a function so every call adds one to a counter.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        counters[name] = counters.get(name, 0) + 1
+        return function(*args, **kwargs)
+
+    return wrapper
+
+def counted_items(function, name):
+    """
+    Wraps a generator function so every item it yields adds one to a counter.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        for item in function(*args, **kwargs):
+            counters[name] = counters.get(name, 0) + 1
+            yield item
+
+    return wrapper
+
+def timed(function, name):
+    """
+    Wraps a function so the number of calls and the time spent in them, including nested calls, are added to a timer.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer = timers.get(name)
+            if timer is None:
+                timer = timers[name] = [0, 0.0]
+            timer[0] += 1
+            timer[1] += time.perf_counter() - start
+
+    return wrapper
+
+WRAPPERS = {"counters": counted, "items": counted_items, "timers": timed}
+
+def instrument(cls, counters=None, items=None, timers=None):
+    """
+    Registers the methods of a class to instrument. The methods are only wrapped while instrumentation is on.
+
+    Args:
+        cls (type): The class.
+        counters (dict[str, str]): Methods whose calls are counted, mapped to the counter name.
+        items (dict[str, str]): Generator methods whose yielded items are counted, mapped to the counter name.
+        timers (dict[str, str]): Methods that are timed, mapped to the timer name.
+    """
+
+    registered.append((cls, {"counters": counters or {}, "items": items or {}, "timers": timers or {}}))
+    if enabled:
+        apply(cls, registered[-1][1])
+
+def apply(cls, methods):
+    """
+    Replaces the registered methods of a class with their wrappers. Timers wrap outside counters when a method has both.
+    """
+
+    for kind in ("counters", "items", "timers"):
+        for method, name in methods[kind].items():
+            setattr(cls, method, WRAPPERS[kind](getattr(cls, method), name))
+
+def enable(destination=None):
+    """
+    Turns instrumentation on, wraps the methods of every class registered so far and writes the summary at exit.
+
+    Args:
+        destination (str | None): "table", "json" or a file, as for the KNIGHT_INSTRUMENT environment variable. Defaults to a table on stderr.
+    """
+
+    global enabled, output
+
+    output = destination or "table"
+    if enabled:
+        return
+    enabled = True
+    for cls, methods in registered:
+        apply(cls, methods)
+    atexit.register(report)
+
+def reset():
+    """
+    Sets every counter and timer back to zero.
+    """
+
+    counters.clear()
+    timers.clear()
+
+def summary():
+    """
+    Collects the counters and timers.
+
+    Returns:
+        dict: The counters by name, and for every timer the number of calls, the total and the mean time in seconds.
+    """
+
+    return {
+        "counters": dict(sorted(counters.items())),
+        "timers": {name: {"calls": calls, "total": total, "mean": total / calls} for name, (calls, total) in sorted(timers.items())},
+    }
+
+def format_table(data):
+    """
+    Formats a summary as a text table.
+
+    Args:
+        data (dict): A summary from summary().
+
+    Returns:
+        str: The table.
+    """
+
+    lines = [f"{'counter':<28} {'count':>14}"]
+    lines += [f"{name:<28} {count:>14,}" for name, count in data["counters"].items()]
+    lines.append("")
+    lines.append(f"{'timer':<28} {'calls':>14} {'total (s)':>12} {'mean (ms)':>12}")
+    lines += [f"{name:<28} {timer['calls']:>14,} {timer['total']:>12.3f} {timer['mean'] * 1000:>12.4f}" for name, timer in data["timers"].items()]
+    return "\n".join(lines) + "\n"
+
+def report(destination=None):
+    """
+    Writes the summary.
+
+    Args:
+        destination (str | None): "table", "json" or a file. Defaults to where enable() was told to write it.
+    """
+
+    destination = destination or output or "table"
+    data = summary()
+    if destination == "json":
+        json.dump(data, sys.stderr, indent=2)
+        sys.stderr.write("\n")
+    elif destination == "table":
+        sys.stderr.write(format_table(data))
+    else:
+        with open(destination, "w") as file:
+            if destination.endswith(".json"):
+                json.dump(data, file, indent=2)
+            else:
+                file.write(format_table(data))
+
+def profile(function, path, kind="cprofile"):
+    """
+    Calls a function under cProfile or tracemalloc and writes the results to a file.
+
+    With cProfile the file holds the raw statistics, which pstats or a viewer such as snakeviz can read, and the 20 functions with the most
+    cumulative time are printed to stderr. With tracemalloc the file lists the 50 source lines that allocated the most memory still held at the
+    end, after the current and peak traced memory.
+
+    Args:
+        function (Callable[[], Any]): The function to call.
+        path (str): The file to write the results to.
+        kind (str): "cprofile" or "tracemalloc".
+
+    Returns:
+        Any: What the function returned.
+    """
+
+    if kind == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(function)
+        finally:
+            profiler.dump_stats(path)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    elif kind == "tracemalloc":
+        import tracemalloc
+
+        tracemalloc.start(10)
+        try:
+            return function()
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(path, "w") as file:
+                file.write(f"current {current / 2**20:.2f} MiB, peak {peak / 2**20:.2f} MiB\n\n")
+                for statistic in snapshot.statistics("lineno")[:50]:
+                    file.write(f"{statistic}\n")
+    else:
+        raise ValueError(f"unknown profiler {kind!r}, expected cprofile or tracemalloc")
+
+def main(arguments=None):
+    """
+    Runs a script or module with instrumentation, cProfile or tracemalloc.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="instrumentation", description="Runs a program with instrumentation or under a profiler.")
+    parser.add_argument("--instrument", nargs="?", const="table", default=None, metavar="FILE",
+                        help="count and time the hot paths and write the summary to FILE, or a table on stderr")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--profile", default=None, metavar="FILE", help="run under cProfile and write the statistics to FILE")
+    group.add_argument("--tracemalloc", default=None, metavar="FILE", help="trace memory allocations and write the largest to FILE")
+    parser.add_argument("-m", dest="module", action="store_true", help="run the target as a module, like python -m")
+    parser.add_argument("target", help="the script or module to run")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="the arguments of the target")
+    options = parser.parse_args(arguments)
+
+    if options.instrument is not None:
+        enable(options.instrument)
+
+    sys.argv = [options.target] + options.arguments
+    if options.module:
+        def run():
+            runpy.run_module(options.target, run_name="__main__", alter_sys=True)
+    else:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(options.target)))
+
+        def run():
+            runpy.run_path(options.target, run_name="__main__")
+
+    if options.profile is not None:
+        profile(run, options.profile, "cprofile")
+    elif options.tracemalloc is not None:
+        profile(run, options.tracemalloc, "tracemalloc")
+    else:
+        run()
+
+if __name__ == "__main__":
+    # Run through the imported module, so the instrumented classes and this command share one set of counters.
+    import instrumentation
+
+    instrumentation.main()
+elif os.environ.get(ENVIRONMENT_VARIABLE, "0") not in ("", "0"):
+    enable("table" if os.environ[ENVIRONMENT_VARIABLE] == "1" else os.environ[ENVIRONMENT_VARIABLE])
@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import sys
+import time
+import instrumentation
+from chessboard import Chessboard
+from knight_tour import KnightTour
+from move_table import KNIGHT, PIECES, parse_piece
+
+#Headless entry point for running simulations without a window or audio device, e.g.
+#python -m knight_sim --size 8 --runs 1000000 --out stats.json
+#python -m knight_sim --target 0.1 --runs 10000000            (until the mean is known to +/- 0.05 squares)
+#python -m knight_sim --target 0.2 --relative --quantity completion --importance
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments of the headless simulator.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(prog="knight_sim", description="Runs random knight tour simulations without graphics.")
+    parser.add_argument("--size", type=int, default=8, help="size of a square chessboard")
+    parser.add_argument("--width", type=int, default=None, help="width of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--height", type=int, default=None, help="height of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--piece", type=parse_piece, default="knight", metavar="PIECE",
+                        help=f"the leaper that tours the board: {', '.join(PIECES)} or m,n for the (m, n) leaper")
+    parser.add_argument("--runs", type=int, default=1000, help="number of tours to simulate")
+    parser.add_argument("--engine", choices=["loop", "batch", "parallel"], default="batch", help="simulation engine")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for the parallel engine")
+    parser.add_argument("--seed", type=int, default=None, help="master seed, makes the run reproducible")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="runs between checkpoints")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file to resume from and save to")
+    parser.add_argument("--log", default=None, help="append every tour to this binary tour log (loop engine only)")
+    parser.add_argument("--out", default=None, help="write the statistics as JSON to this file instead of printing them")
+    parser.add_argument("--plot", nargs="?", const="", default=None, metavar="FILE",
+                        help="plot the histogram, saved to FILE if given, otherwise shown in a window")
+    parser.add_argument("--target", type=float, default=None, metavar="WIDTH",
+                        help="run until the confidence interval of --quantity is at most WIDTH wide, with --runs as the limit")
+    parser.add_argument("--quantity", choices=["mean", "completion"], default="mean",
+                        help="what --target applies to: the mean tour length or the probability of a complete tour")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the interval of --target")
+    parser.add_argument("--relative", action="store_true", help="make --target relative to the estimate, so 0.1 is 10%% of it")
+    parser.add_argument("--importance", action="store_true",
+                        help="estimate the completion probability by importance sampling instead of uniform tours (needs --target)")
+    parser.add_argument("--instrument", nargs="?", const="table", default=None, metavar="FILE",
+                        help="count and time the hot paths, written to FILE at exit (JSON if it ends in .json) or as a table on stderr")
+    profiler = parser.add_mutually_exclusive_group()
+    profiler.add_argument("--profile", default=None, metavar="FILE", help="run the simulation under cProfile and write the statistics to FILE")
+    profiler.add_argument("--tracemalloc", default=None, metavar="FILE", help="trace the memory allocations of the simulation and write them to FILE")
+    return parser.parse_args(arguments)
+
+def main(arguments=None):
+    """
+    Runs the simulation described by the command line and reports the statistics.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    options = parse_arguments(arguments)
+    if options.instrument is not None:
+        instrumentation.enable(options.instrument)
+    width = options.size if options.width is None else options.width
+    height = options.size if options.height is None else options.height
+    if options.log is not None and options.engine != "loop":
+        sys.exit("knight_sim: --log needs --engine loop, the other engines do not keep the moves of the tours")
+    if options.log is not None and (options.piece != KNIGHT or width != height):
+        sys.exit("knight_sim: --log only records knight tours of square boards")
+    if options.target is None and (options.importance or options.quantity != "mean" or options.relative):
+        sys.exit("knight_sim: --quantity, --relative and --importance need --target")
+    if options.importance and options.quantity != "completion":
+        sys.exit("knight_sim: --importance only estimates --quantity completion")
+    if options.target is not None and (options.log is not None or options.checkpoint is not None):
+        sys.exit("knight_sim: --target cannot be combined with --log or --checkpoint")
+
+    chessboard = Chessboard(width, height)
+    knight_tour = KnightTour(chessboard, None, options.piece)
+
+    workers = None
+    if options.engine == "parallel":
+        workers = options.workers or os.cpu_count() or 1
+
+    log = None
+    if options.log is not None:
+        from tour_log import TourLogWriter
+
+        log = TourLogWriter(options.log, width, options.seed)
+
+    def simulate():
+        if options.target is not None:
+            return knight_tour.estimate(options.quantity, options.target, options.confidence, options.relative, options.importance, options.runs,
+                                        batch=options.engine == "batch", workers=workers, seed=options.seed, chunk_size=options.chunk_size)
+        return knight_tour.run_simulation(options.runs, batch=options.engine == "batch", workers=workers, seed=options.seed,
+                                          checkpoint=options.checkpoint, chunk_size=options.chunk_size, log=log)
+
+    start = time.perf_counter()
+    try:
+        if options.profile is not None:
+            outcome = instrumentation.profile(simulate, options.profile, "cprofile")
+        elif options.tracemalloc is not None:
+            outcome = instrumentation.profile(simulate, options.tracemalloc, "tracemalloc")
+        else:
+            outcome = simulate()
+    finally:
+        if log is not None:
+            log.close()
+    elapsed = time.perf_counter() - start
+
+    # An adaptive run returns an Estimate, which holds the statistics unless the tours were importance sampled.
+    estimate = outcome if options.target is not None else None
+    statistics = estimate.statistics if estimate is not None else outcome
+
+    result = {
+        "width": width,
+        "height": height,
+        "piece": options.piece.name,
+        "runs": estimate.runs if estimate is not None else statistics.count,
+        "engine": "importance" if options.importance else options.engine,
+        "workers": workers,
+        "seed": options.seed,
+        "elapsed": elapsed,
+    }
+    if estimate is not None:
+        result["estimate"] = estimate.summary()
+    if statistics is not None:
+        result["statistics"] = statistics.summary()
+        result["histogram"] = statistics.histogram
+
+    if options.out is not None:
+        with open(options.out, "w") as file:
+            json.dump(result, file, indent=2)
+    else:
+        json.dump({key: value for key, value in result.items() if key != "histogram"}, sys.stdout, indent=2)
+        print()
+
+    if options.plot is not None and statistics is not None:
+        import matplotlib
+
+        if options.plot:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        knight_tour.plot_histogram(statistics, options.confidence)
+        if options.plot:
+            plt.savefig(options.plot)
+        else:
+            plt.show()
+
+if __name__ == "__main__":
+    main()
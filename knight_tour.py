@@ -1,35 +1,94 @@
+import os
 import random
-import pygame
-import matplotlib.pyplot as plt
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from estimation import estimate_completion, statistics_estimate
+from instrumentation import instrument
+from move_table import KNIGHT, leaper_moves
+from parallel_simulation import parallel_simulation
+from warnsdorff import warnsdorff_tour
+from tour_statistics import TourStatistics
+
+TourMove = namedtuple("TourMove", ["x", "y", "move", "next_moves"])
+TourMove.__doc__ = """
+A move of a tour, as produced by the move generators of KnightTour.
+
+Attributes:
+    x (int): The x-coordinate index the knight moved to.
+    y (int): The y-coordinate index the knight moved to.
+    move (int): The move number, 1 for the starting square.
+    next_moves (list[list[int, int]]): The squares the knight can move to next. The tour is over when it is empty.
+"""
 
 class KnightTour:
     """
     Manages the knight's movements and the logic of the tour.
 
+    The moving piece is the knight by default, but any leaper such as the camel or the zebra can tour the board instead. Its moves come from
+    a move table that is computed once per piece and board shape and shared by every KnightTour on such a board.
+    pygame and matplotlib are only imported by the methods that need them, so the tour and simulation logic can be used headless.
+
     Attributes:
         chessboard (Chessboard): The chessboard object containing the state of the board.
-        ui (UserInteraction): The user interaction object used for managing graphics.
+        ui (UserInteraction): The user interaction object used for managing graphics, or None when running headless.
+        piece (Leaper): The piece that tours the board.
+        table (tuple[tuple[int]]): The moves of the piece from every square of the board.
         move_sound (pygame.mixer.Sound): Sound effect played after a legal move is made.
         illegal_move_sound (pygame.mixer.Sound): Sound effect played after an illegal move is attempted.
         end_sound (pygame.mixer.Sound): Sound effect played when the last move a tour is made.
+        hint_engine (HintEngine | None): The engine behind the hints of manual tours, created the first time hints are shown and kept, with its
+            transposition table, for the later tours.
     """
 
-    def __init__(self, chessboard, user_interaction):
+    def __init__(self, chessboard, user_interaction, piece=KNIGHT):
         """
-        Initializes the KnightTour with references to chessboard and user interaction objects, as well as pygame's mixer module.
+        Initializes the KnightTour with references to chessboard and user interaction objects.
+        pygame's mixer module and the sound effects are loaded the first time a sound is played.
 
         Args:
             chessboard (Chessboard): The chessboard object containing the board state.
             user_interaction (UserInteraction): The user interaction object for graphical representation.
+            piece (Leaper): The piece that tours the board.
         """
 
         self.chessboard = chessboard
         self.ui = user_interaction
-        
-        pygame.mixer.init()
-        self.move_sound = pygame.mixer.Sound("assets/knight_move_sound1.wav")
-        self.illegal_move_sound = pygame.mixer.Sound("assets/illegal_move.wav")
-        self.end_sound = pygame.mixer.Sound("assets/game_end.wav")
+        self.piece = piece
+        self.table = leaper_moves(piece, chessboard.width, chessboard.height)
+        self.hint_engine = None
+        self.sounds = None
+
+    def load_sounds(self):
+        """
+        Initializes pygame's mixer module and loads the sound effects, unless that has already been done.
+
+        Returns:
+            dict[str, pygame.mixer.Sound]: The sound effects by name.
+        """
+
+        if self.sounds is None:
+            import pygame
+
+            pygame.mixer.init()
+            self.sounds = {
+                "move": pygame.mixer.Sound("assets/knight_move_sound1.wav"),
+                "illegal_move": pygame.mixer.Sound("assets/illegal_move.wav"),
+                "end": pygame.mixer.Sound("assets/game_end.wav"),
+            }
+        return self.sounds
+
+    @property
+    def move_sound(self):
+        return self.load_sounds()["move"]
+
+    @property
+    def illegal_move_sound(self):
+        return self.load_sounds()["illegal_move"]
+
+    @property
+    def end_sound(self):
+        return self.load_sounds()["end"]
 
     def is_valid_move(self, current_x, current_y, x , y):
         """
@@ -44,114 +103,473 @@ class KnightTour:
         Returns:
             bool: True if the move is valid, otherwise False.
         """
-        return [x, y] in self.next_valid_moves(current_x, current_y)
-        
+        width = self.chessboard.width
+        if not (0 <= x < width and 0 <= y < self.chessboard.height):
+            return False
+        if self.chessboard.is_visited(y * width + x):
+            return False
+        return y * width + x in self.table[current_y * width + current_x]
+
     def next_valid_moves(self, x, y):
         """
-        Generates all valid moves that the knight can make from a given position.
+        Generates all valid moves that the piece can make from a given position.
 
         Args:
             x (int): The current x-coordinate index of the knight.
             y (int): The current y-coordinate index of the knight.
 
         Returns:
-            list[list[int, int]]: A list of valid (x, y) positions that the knight can move to.
+            list[list[int, int]]: A list of valid (x, y) positions that the piece can move to.
         """
 
+        width = self.chessboard.width
+        visited = self.chessboard.visited
         valid_moves = []
 
-        positions = [2, 2, -2, -2, 1, -1, 1, -1]
-        for position in range(len(positions)):
-            if y + positions[position] < self.chessboard.size and y + positions[position] > -1 and x + positions[len(positions) - 1 - position] < self.chessboard.size and x + positions[len(positions) - 1 - position] > -1:
-                if self.chessboard.board[y + positions[position]][x + positions[len(positions) - 1 - position]] == 0:
-                    valid_moves.append([x + positions[len(positions) - 1 - position], y + positions[position]])
+        for square in self.table[y * width + x]:
+            if not visited[square >> 6] >> (square & 63) & 1:
+                valid_moves.append([square % width, square // width])
         
         return valid_moves
 
-    def random_tour(self, manual, simulation):
+    def random_moves(self, start_x, start_y, rng=random):
         """
-        Executes a either a random or manual knight tour starting from a given position selected by an on screen click.
+        Generates a random knight tour, marking each move on the chessboard as it is pulled from the generator.
+
+        This is the only implementation of the random tour: the graphical tour animates it, the terminal prints it and the simulation just runs it to the end.
 
         Args:
-            manual (bool): If True, allows the user to manually control the knight's movements. If False runs a random tour.
-            simulation (bool): If True, runs the tour as a part of the simulation function without user input.
-        """
+            start_x (int): The starting x-coordinate index.
+            start_y (int): The starting y-coordinate index.
+            rng (random.Random): The random generator that picks the moves.
 
-        if not simulation:
-            self.ui.update_display()
-            click_square = self.ui.click_to_coordinates()
-            start_x = click_square[0]
-            start_y = click_square[1]
+        Yields:
+            TourMove: Each move of the tour, starting with the starting square.
+        """
 
-            valid_move = True
-        else:
-            start_x = random.randint(0, self.chessboard.size - 1)
-            start_y = random.randint(0, self.chessboard.size - 1)
-        
         self.chessboard.move = 1
         self.chessboard.mark_square(start_x + 1, start_y + 1, self.chessboard.move)
-        if not simulation:
-            self.ui.update_display()
-            self.move_sound.play()
-        
         new_moves = self.next_valid_moves(start_x, start_y)
-        current_x = start_x 
-        current_y = start_y 
+        yield TourMove(start_x, start_y, 1, new_moves)
 
         while len(new_moves) > 0:
+            x, y = rng.choice(new_moves)
             self.chessboard.move += 1
+            self.chessboard.mark_square(x + 1, y + 1, self.chessboard.move)
+            new_moves = self.next_valid_moves(x, y)
+            yield TourMove(x, y, self.chessboard.move, new_moves)
+
+    def replay_moves(self, tour):
+        """
+        Generates the moves of a tour that has already been solved, marking each move on the chessboard as it is pulled from the generator.
 
-            if manual == False or simulation == True:
-                new_move = random.choice(new_moves)
-                if not simulation:
-                    pygame.time.delay(1000)
+        Args:
+            tour (list[int]): The flat indices of the squares of the tour.
+
+        Yields:
+            TourMove: Each move of the tour. next_moves only holds the next square of the tour.
+        """
+
+        width = self.chessboard.width
+        for move, square in enumerate(tour, 1):
+            self.chessboard.move = move
+            self.chessboard.mark_index(square, move)
+            next_moves = [[tour[move] % width, tour[move] // width]] if move < len(tour) else []
+            yield TourMove(square % width, square // width, move, next_moves)
+
+    def play_sound(self, tour_move):
+        """
+        Plays the sound of a move: the end sound after the last move of a tour and otherwise the move sound.
+
+        Args:
+            tour_move (TourMove): The move that was just shown.
+        """
+
+        if len(tour_move.next_moves) == 0:
+            self.end_sound.play()
+        else:
+            self.move_sound.play()
+
+    def animate(self, moves, rate):
+        """
+        Plays moves on the board without blocking the window.
+
+        Args:
+            moves (Iterator[TourMove]): The moves to play.
+            rate (float | None): Moves per second, or None to play as fast as possible.
+
+        Returns:
+            bool: True if all moves were played, False if the window was closed.
+        """
+
+        from animation import AnimationScheduler
+
+        return AnimationScheduler(self.ui, rate).play(moves, self.play_sound)
+
+    def random_tour(self, manual, simulation, rate=1.0, hints=False):
+        """
+        Executes a either a random or manual knight tour starting from a given position selected by an on screen click.
+
+        Args:
+            manual (bool): If True, allows the user to manually control the knight's movements. If False runs a random tour.
+            simulation (bool): If True, runs the tour as a part of the simulation function without user input.
+            rate (float | None): Moves per second of the animated random tour, or None to play it as fast as possible.
+            hints (bool): If True, the legal moves of a manual tour are colored by whether the tour can still visit every square after them,
+                worked out in the background while the player thinks (see HintEngine).
+        """
+
+        if simulation:
+            start_x = random.randint(0, self.chessboard.width - 1)
+            start_y = random.randint(0, self.chessboard.height - 1)
+            for tour_move in self.random_moves(start_x, start_y):
+                pass
+            return
+
+        self.ui.update_display()
+        click_square = self.ui.click_to_coordinates()
+        start_x = click_square[0]
+        start_y = click_square[1]
+
+        moves = self.random_moves(start_x, start_y)
+        first_move = next(moves)
+        self.ui.update_display()
+        self.move_sound.play()
+
+        if not manual:
+            self.animate(moves, rate)
+            return
+
+        new_moves = first_move.next_moves
+        current_x = start_x
+        current_y = start_y
+
+        tick = None
+        if hints:
+            from hint_engine import HintEngine
+
+            if self.hint_engine is None:
+                self.hint_engine = HintEngine(self.chessboard.width, self.chessboard.height, self.piece)
+            shown = {}
+
+            def tick():
+                # Only the hints that arrived since the last tick are drawn.
+                fresh = {square: hint for square, hint in self.hint_engine.results().items() if shown.get(square) is not hint}
+                if fresh:
+                    self.ui.mark_hints(fresh)
+                    shown.update(fresh)
+
+        while len(new_moves) > 0:
+            self.ui.mark_squares_green(new_moves)
+            if hints:
+                self.hint_engine.request(self.chessboard, current_y * self.chessboard.width + current_x)
+                shown.clear()
+                tick()
+            click_square = self.ui.click_to_coordinates(tick)
+
+            x_cord = click_square[0]
+            y_cord = click_square[1]
+            if not self.is_valid_move(current_x, current_y, x_cord, y_cord):
+                self.illegal_move_sound.play()
+                continue
+
+            current_x = x_cord
+            current_y = y_cord
+            self.chessboard.move += 1
+            self.chessboard.mark_square(current_x + 1, current_y + 1, self.chessboard.move)
+            new_moves = self.next_valid_moves(current_x, current_y)
+            self.ui.update_display()
+            if len(new_moves) == 0:
+                self.end_sound.play()
             else:
-                self.ui.mark_squares_green(new_moves)
-                click_square = self.ui.click_to_coordinates()
-
-                x_cord = click_square[0]
-                y_cord = click_square[1]
-                if self.is_valid_move(current_x, current_y, x_cord, y_cord):
-                    new_move = [x_cord, y_cord]
-                    current_x = x_cord
-                    current_y = y_cord
-                    valid_move = True
-                else:
-                    new_move = [current_x, current_y]
-                    self.chessboard.move -= 1
-                    valid_move = False
-
-            self.chessboard.mark_square(new_move[0] + 1, new_move[1] + 1, self.chessboard.move)
-            if not simulation:
-                if valid_move:
-                    self.ui.update_display()
-                    if len(self.next_valid_moves(new_move[0], new_move[1])) == 0:
-                        self.end_sound.play()
-                    else:
-                        self.move_sound.play()
-                else:
-                    self.illegal_move_sound.play()    
+                self.move_sound.play()
 
-            new_moves = self.next_valid_moves(new_move[0], new_move[1])
+        if hints:
+            self.hint_engine.cancel()
 
-    def simulation(self, iterations):
+    def warnsdorff_tour(self, rate=5.0):
+        """
+        Solves a full tour with Warnsdorff's rule from a starting position selected by an on screen click, then plays it back on the board.
+
+        Args:
+            rate (float | None): Moves per second of the playback, or None to play it as fast as possible.
+
+        Returns:
+            float: The time it took to solve the tour, in seconds.
+        """
+
+        self.ui.update_display()
+        click_square = self.ui.click_to_coordinates()
+        start_x = click_square[0]
+        start_y = click_square[1]
+
+        start = time.perf_counter()
+        tour = warnsdorff_tour(self.chessboard.width, start_x, start_y, height=self.chessboard.height, piece=self.piece)
+        solve_time = time.perf_counter() - start
+
+        if tour is None:
+            self.chessboard.move = 1
+            self.chessboard.mark_square(start_x + 1, start_y + 1, self.chessboard.move)
+            self.ui.show_status(f"No Warnsdorff tour found ({solve_time * 1000:.1f} ms)")
+            self.ui.update_display()
+            self.illegal_move_sound.play()
+            return solve_time
+
+        self.ui.show_status(f"Warnsdorff tour solved in {solve_time * 1000:.1f} ms")
+        moves = self.replay_moves(tour)
+        first_move = next(moves)
+        self.ui.update_display()
+        self.play_sound(first_move)
+        self.animate(moves, rate)
+
+        return solve_time
+
+    def start_sweep(self, runs=1000, seed=0, workers=None):
+        """
+        Runs the same number of random tours from every start square and shows the mean, the variance and the completion rate of each square as
+        a heatmap over the board, one after the other, moving on with a click. Seeded sweeps are cached on disk, so showing one again is instant.
+
+        Args:
+            runs (int): The number of tours from every start square.
+            seed (int | None): The master seed of the sweep.
+            workers (int): The number of worker processes, defaults to the number of CPUs.
+
+        Returns:
+            SweepResult: The result of the sweep.
+        """
+
+        from start_sweep import SweepResult, sweep
+
+        self.ui.show_status(f"Running {runs} tours from every square...")
+        result = sweep(self.chessboard.width, self.chessboard.height, self.piece, runs, seed, workers)
+        labels = {"mean": "Mean tour length", "variance": "Variance of the tour length", "completion": "Share of complete tours"}
+        for index, quantity in enumerate(SweepResult.QUANTITIES):
+            if index > 0:
+                self.ui.click_to_coordinates()
+            self.ui.show_heatmap(result.grid(quantity), f"{labels[quantity]} by start square ({runs} tours each)")
+        return result
+
+    def run_simulation(self, iterations, batch=False, workers=None, seed=None, checkpoint=None, chunk_size=100000, on_chunk=None, log=None,
+                       stop=None):
+        """
+        Runs multiple random knight tours and streams the number of squares visited each run into a TourStatistics accumulator, without any graphics.
+
+        The runs are done chunk by chunk, so memory does not grow with the number of iterations.
+        With a checkpoint file the accumulator is saved after every chunk, and a simulation that finds an existing checkpoint resumes from it.
+
+        Args:
+            iterations (int): The number of simulations to run.
+            batch (bool): If True, runs the tours in lockstep with the vectorized batch engine instead of one at a time.
+            workers (int): If given, splits the tours across this many worker processes.
+            seed (int): Seed of the random tours. The result is reproducible for a given seed and worker count.
+            checkpoint (str): Path of a checkpoint file to resume from and save to.
+            chunk_size (int): The number of runs between checkpoints.
+            on_chunk (Callable[[TourStatistics], None]): Called with the statistics so far after every chunk.
+            log (TourLogWriter): If given, every tour is appended to this log. Only the one-at-a-time loop records tours, and only knight tours of square boards.
+            stop (Callable[[TourStatistics], bool]): Checked before every chunk, the simulation ends early once it returns True.
+
+        Returns:
+            TourStatistics: The statistics of all runs.
+        """
+
+        engine = "parallel" if workers is not None else "batch" if batch else "loop"
+        if log is not None and engine != "loop":
+            raise ValueError("tour logs can only be recorded by the one-at-a-time simulation loop")
+        if log is not None and (self.piece != KNIGHT or self.chessboard.width != self.chessboard.height):
+            raise ValueError("tour logs can only record knight tours of square boards")
+        # The offsets are stored as lists, which is how they come back from the JSON of a checkpoint.
+        parameters = {"width": self.chessboard.width, "height": self.chessboard.height, "piece": [list(offset) for offset in self.piece.offsets],
+                      "engine": engine, "workers": workers, "seed": seed, "chunk_size": chunk_size}
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            statistics = TourStatistics.load(checkpoint)
+            # Resuming with other parameters would mix tours of different boards or draw different tours than the interrupted run.
+            if statistics.metadata.get("parameters") != parameters:
+                raise ValueError(f"checkpoint {checkpoint} was written by a simulation with parameters {statistics.metadata.get('parameters')}, not {parameters}")
+            if log is not None:
+                if "logged" not in statistics.metadata:
+                    raise ValueError(f"checkpoint {checkpoint} was written without a tour log")
+                # The tours of the interrupted chunk are run again, so the ones it already wrote to the log are dropped.
+                log.truncate(statistics.metadata["logged"])
+        else:
+            statistics = TourStatistics(self.chessboard.squares)
+            statistics.metadata["parameters"] = parameters
+            if checkpoint is not None:
+                self.save_checkpoint(statistics, checkpoint, log)
+
+        # The parallel engine keeps one process pool for the whole simulation instead of starting one per chunk.
+        executor = ProcessPoolExecutor(max_workers=workers) if workers is not None else None
+
+        try:
+            while statistics.count < iterations and not (stop is not None and stop(statistics)):
+                self.simulate_chunk(statistics, min(chunk_size, iterations - statistics.count), engine, workers, seed, executor, log)
+                if checkpoint is not None:
+                    self.save_checkpoint(statistics, checkpoint, log)
+                if on_chunk is not None:
+                    on_chunk(statistics)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return statistics
+
+    def estimate(self, quantity="mean", target=0.5, confidence=0.95, relative=False, importance=False, max_runs=10000000, batch=False, workers=None,
+                 seed=None, chunk_size=10000, on_chunk=None):
+        """
+        Runs random knight tours in chunks until the confidence interval of an estimate is as narrow as the target, or max_runs tours have run.
+
+        The mean tour length and the probability that a tour visits every square can be estimated from uniform random tours. Complete tours are
+        so rare on larger boards that their probability is better estimated by importance sampling, which draws tours that complete far more
+        often and weights them (see estimation.ImportanceSampler).
+
+        Args:
+            quantity (str): "mean" for the mean tour length or "completion" for the probability that a tour visits every square.
+            target (float): The interval width to reach, in squares for the mean or as a probability for the completion.
+            confidence (float): The confidence level of the interval.
+            relative (bool): If True, the target is relative to the estimate, so 0.1 asks for an interval 10% of the estimate wide.
+            importance (bool): If True, estimates the completion probability by importance sampling instead of uniform tours.
+            max_runs (int): The most tours to run if the target is not met.
+            batch (bool): If True, runs the uniform tours with the vectorized batch engine.
+            workers (int): If given, splits the uniform tours across this many worker processes.
+            seed (int): Seed of the random tours.
+            chunk_size (int): The number of uniform tours between checks of the interval.
+            on_chunk (Callable[[TourStatistics], None]): Called with the statistics so far after every chunk of uniform tours.
+
+        Returns:
+            Estimate: The estimate, its interval, the achieved error and the number of tours run.
+        """
+
+        if importance:
+            if quantity != "completion":
+                raise ValueError("importance sampling only estimates the completion probability")
+            return estimate_completion(self.chessboard.width, self.chessboard.height, self.piece, target, confidence, relative, max_runs=max_runs,
+                                       seed=seed)
+
+        def stop(statistics):
+            return statistics_estimate(statistics, quantity, target, confidence, relative).converged
+
+        statistics = self.run_simulation(max_runs, batch, workers, seed, chunk_size=chunk_size, on_chunk=on_chunk, stop=stop)
+        return statistics_estimate(statistics, quantity, target, confidence, relative)
+
+    def save_checkpoint(self, statistics, checkpoint, log):
+        """
+        Saves a checkpoint of a simulation, together with the number of tours in its log so a resumed simulation can drop the tours written after it.
+
+        Args:
+            statistics (TourStatistics): The statistics so far.
+            checkpoint (str): The checkpoint file.
+            log (TourLogWriter): The tour log of the simulation, or None.
+        """
+
+        if log is not None:
+            log.flush()
+            statistics.metadata["logged"] = log.count
+        statistics.save(checkpoint)
+
+    def simulate_chunk(self, statistics, runs, engine, workers, seed, executor, log):
+        """
+        Runs one chunk of a simulation and adds it to the statistics.
+
+        Every chunk gets its own seed derived from the master seed and the runs done so far, so a resumed simulation draws the same tours.
+
+        Args:
+            statistics (TourStatistics): The statistics to add the runs to.
+            runs (int): The number of runs in the chunk.
+            engine (str): "loop", "batch" or "parallel".
+            workers (int): The number of worker processes of the parallel engine.
+            seed (int): The master seed, or None for unseeded tours.
+            executor (concurrent.futures.Executor): The process pool of the parallel engine.
+            log (TourLogWriter): If given, every tour is appended to this log.
+        """
+
+        chunk_seed = None if seed is None else random.Random(f"{seed}:{statistics.count}").getrandbits(64)
+
+        if engine == "parallel":
+            statistics.merge(parallel_simulation(self.chessboard.width, runs, chunk_seed, workers, executor, self.chessboard.height, self.piece))
+        elif engine == "batch":
+            from batch_simulation import simulate_batch_histogram
+
+            statistics.add_histogram(simulate_batch_histogram(self.chessboard.width, runs, chunk_seed, self.chessboard.height, self.piece))
+        else:
+            width = self.chessboard.width
+            rng = random if chunk_seed is None else random.Random(chunk_seed)
+            for simulation in range(runs):
+                start = rng.randrange(self.chessboard.squares)
+                moves = self.random_moves(start % width, start // width, rng)
+                if log is None:
+                    for tour_move in moves:
+                        pass
+                else:
+                    log.add([tour_move.y * width + tour_move.x for tour_move in moves])
+                statistics.add(self.chessboard.move)
+                self.chessboard.reset_board()
+
+    def simulation(self, iterations, batch=False, workers=None, seed=None, checkpoint=None, chunk_size=100000, live=False, log=None, target=None,
+                   confidence=0.95):
         """
         Runs a simulation of multiple random knight tours, collects statistics on the number of squares visited each run and then displays the results in a histogram.
 
+        With a target the simulation is adaptive: it stops as soon as the confidence interval of the mean tour length is at most target squares wide,
+        and iterations only caps the number of runs. The histogram title shows the achieved error.
+
         Args:
             iterations (int): The number of simulations to run.
+            batch (bool): If True, runs the tours in lockstep with the vectorized batch engine instead of one at a time.
+            workers (int): If given, splits the tours across this many worker processes.
+            seed (int): Seed of the random tours. The result is reproducible for a given seed and worker count.
+            checkpoint (str): Path of a checkpoint file to resume from and save to.
+            chunk_size (int): The number of runs between checkpoints and live updates.
+            live (bool): If True, the histogram is redrawn after every chunk while the simulation runs.
+            log (TourLogWriter): If given, every tour is appended to this log. Only the one-at-a-time loop records tours.
+            target (float): If given, the width of the confidence interval of the mean to stop at.
+            confidence (float): The confidence level of the interval.
+
+        Returns:
+            TourStatistics: The statistics of all runs.
         """
 
-        moves_per_run = []
+        import matplotlib.pyplot as plt
+
+        def redraw(statistics):
+            self.plot_histogram(statistics, confidence)
+            plt.pause(0.001)
 
-        for simulation in range(iterations):
-            self.random_tour(False, True)
-            moves_per_run.append(self.chessboard.move)
-            self.chessboard.reset_board()
+        def stop(statistics):
+            return statistics_estimate(statistics, "mean", target, confidence).converged
 
-        plt.hist(moves_per_run, bins=20, color='blue', edgecolor='black', alpha=0.7)
+        if live:
+            plt.ion()
+        statistics = self.run_simulation(iterations, batch, workers, seed, checkpoint, chunk_size, redraw if live else None, log,
+                                         stop if target is not None else None)
+        if live:
+            plt.ioff()
+
+        self.plot_histogram(statistics, confidence)
+        plt.show()
+        return statistics
+
+    def plot_histogram(self, statistics, confidence=0.95):
+        """
+        Draws the histogram of moves per run from a statistics accumulator into the current figure. The title shows the mean and its error.
+
+        Args:
+            statistics (TourStatistics): The statistics to draw.
+            confidence (float): The confidence level of the error in the title.
+        """
+
+        import matplotlib.pyplot as plt
+
+        plt.clf()
+        plt.hist(range(len(statistics.histogram)), weights=statistics.histogram, bins=20, color='blue', edgecolor='black', alpha=0.7)
         plt.xlabel('Number of Moves')
         plt.ylabel('Frequency')
-        plt.title('Distribution of Moves in Knight Tour Simulations')
+        error = statistics_estimate(statistics, "mean", confidence=confidence).error
+        plt.title(f'Distribution of Moves in Knight Tour Simulations\n({statistics.count} runs, mean {statistics.mean:.2f} ± {error:.2f} at {confidence:.0%})')
         plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.show()
\ No newline at end of file
+
+instrument(
+    KnightTour,
+    counters={"is_valid_move": "valid move checks", "next_valid_moves": "valid move lists"},
+    items={"random_moves": "moves generated", "replay_moves": "moves generated"},
+    timers={"run_simulation": "simulation", "estimate": "adaptive estimate", "simulate_chunk": "simulation chunk", "random_tour": "random tour", "warnsdorff_tour": "warnsdorff tour", "start_sweep": "start sweep",
+            "animate": "animation", "load_sounds": "sound loading", "plot_histogram": "histogram plot"},
+)
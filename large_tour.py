@@ -0,0 +1,408 @@
+from functools import lru_cache
+from move_table import KNIGHT, KNIGHT_OFFSETS, leaper_moves
+
+def block_sizes(length):
+    """
+    Splits one side of the board into block lengths of 6, 8 or 10, using as many 8s as possible.
+
+    Args:
+        length (int): The length of the side. Has to be even and at least 6.
+
+    Returns:
+        list[int]: The lengths of the blocks in order.
+    """
+
+    if length < 6 or length % 2 == 1:
+        raise ValueError("divide and conquer tours need even board sides of at least 6")
+
+    eights, remainder = divmod(length, 8)
+    if remainder == 0:
+        return [8] * eights
+    if remainder == 2:
+        return [8] * (eights - 1) + [10]
+    if remainder == 4:
+        return [8] * (eights - 1) + [6, 6]
+    return [8] * eights + [6]
+
+@lru_cache(maxsize=None)
+def closed_tile(width, height):
+    """
+    Finds a closed knight tour of a small width by height board, used as a tile of the large tour.
+
+    The search is a depth-first search in Warnsdorff order with a node budget, restarted from other squares if the budget runs out.
+
+    Args:
+        width (int): The width of the tile.
+        height (int): The height of the tile.
+
+    Returns:
+        tuple[int]: The squares of the tour in order as local indices x + y * width.
+    """
+
+    squares = width * height
+    table = leaper_moves(KNIGHT, width, height)
+
+    def distance(square):
+        return (2 * (square % width) - width + 1) ** 2 + (2 * (square // width) - height + 1) ** 2
+
+    for start in sorted(range(squares), key=distance):
+        visited = bytearray(squares)
+        visited[start] = 1
+        path = [start]
+        stack = [iter(sorted(table[start], key=lambda square: (len(table[square]), -distance(square))))]
+        nodes = 0
+        while stack and nodes < 200000:
+            square = next(stack[-1], None)
+            if square is None:
+                stack.pop()
+                visited[path.pop()] = 0
+                continue
+            if visited[square]:
+                continue
+            nodes += 1
+            visited[square] = 1
+            path.append(square)
+            if len(path) == squares:
+                if start in table[square]:
+                    return tuple(path)
+                visited[path.pop()] = 0
+                continue
+            onward = [neighbor for neighbor in table[square] if not visited[neighbor]]
+            onward.sort(key=lambda neighbor: (sum(1 for next_square in table[neighbor] if not visited[next_square]), -distance(neighbor)))
+            stack.append(iter(onward))
+
+    raise RuntimeError(f"no closed tile found for {width}x{height}")
+
+class Tile:
+    """
+    A closed tour of a small board together with lookups for walking along it.
+
+    Attributes:
+        width (int): The width of the tile.
+        height (int): The height of the tile.
+        order (tuple[int]): The local squares x + y * width in tour order.
+        position (list[int]): The position of each local square in order.
+    """
+
+    def __init__(self, width, height):
+        """
+        Initializes the tile with its closed tour.
+
+        Args:
+            width (int): The width of the tile.
+            height (int): The height of the tile.
+        """
+
+        self.width = width
+        self.height = height
+        self.order = closed_tile(width, height)
+        self.position = [0] * len(self.order)
+        for index, square in enumerate(self.order):
+            self.position[square] = index
+
+    def edges(self):
+        """
+        Yields every edge of the closed tour, in both directions.
+
+        Yields:
+            tuple[int, int]: A pair of local squares that follow each other in the tour.
+        """
+
+        length = len(self.order)
+        for index in range(length):
+            first, second = self.order[index], self.order[(index + 1) % length]
+            yield first, second
+            yield second, first
+
+    def is_edge(self, first, second):
+        """
+        Checks if two local squares follow each other in the tour.
+        """
+
+        difference = abs(self.position[first] - self.position[second])
+        return difference == 1 or difference == len(self.order) - 1
+
+@lru_cache(maxsize=None)
+def tile(width, height):
+    """
+    Returns the cached Tile of the given size.
+    """
+
+    return Tile(width, height)
+
+def find_merge(first, second, horizontal):
+    """
+    Finds a pair of tour edges, one near the shared side of each of two neighboring tiles, that can be swapped for two knight moves across the side.
+    Removing (a1, a2) and (b1, b2) and adding (a1, b1) and (a2, b2) joins the two closed tours into one.
+
+    Edges used for a horizontal neighbor only ever lie within two columns, and edges used for a vertical neighbor within two rows,
+    so the merges on the different sides of a tile never use the same edge.
+
+    Args:
+        first (Tile): The left tile, or the upper tile if horizontal is False.
+        second (Tile): The right tile, or the lower tile.
+        horizontal (bool): If True, second lies to the right of first, otherwise below it.
+
+    Returns:
+        tuple[int, int, int, int]: The local squares a1, a2 of first and b1, b2 of second.
+    """
+
+    if horizontal:
+        shift_x, shift_y = first.width, 0
+    else:
+        shift_x, shift_y = 0, first.height
+
+    def near_side(square, board, leading):
+        x, y = square % board.width, square // board.width
+        if horizontal:
+            return x >= board.width - 2 if leading else x < 2
+        return y >= board.height - 2 if leading else y < 2
+
+    for a1, a2 in first.edges():
+        if not (near_side(a1, first, True) and near_side(a2, first, True)):
+            continue
+        ax1, ay1 = a1 % first.width - shift_x, a1 // first.width - shift_y
+        ax2, ay2 = a2 % first.width - shift_x, a2 // first.width - shift_y
+        for dx1, dy1 in KNIGHT_OFFSETS:
+            bx1, by1 = ax1 + dx1, ay1 + dy1
+            if not (0 <= bx1 < second.width and 0 <= by1 < second.height):
+                continue
+            b1 = by1 * second.width + bx1
+            for dx2, dy2 in KNIGHT_OFFSETS:
+                bx2, by2 = ax2 + dx2, ay2 + dy2
+                if not (0 <= bx2 < second.width and 0 <= by2 < second.height):
+                    continue
+                b2 = by2 * second.width + bx2
+                if near_side(b1, second, False) and near_side(b2, second, False) and second.is_edge(b1, b2):
+                    return a1, a2, b1, b2
+
+    raise RuntimeError(f"tiles {first.width}x{first.height} and {second.width}x{second.height} cannot be merged")
+
+@lru_cache(maxsize=None)
+def merge(first_width, first_height, second_width, second_height, horizontal):
+    """
+    Returns the cached merge edges of two neighboring tiles, see find_merge.
+    """
+
+    return find_merge(tile(first_width, first_height), tile(second_width, second_height), horizontal)
+
+class LargeTour:
+    """
+    Builds a closed knight tour of a large board by divide and conquer, in the style of Parberry: the board is cut into blocks of 6, 8 or 10 squares a side,
+    every block is covered by a precomputed closed tile tour, and the tile tours are joined into one cycle by swapping pairs of edges across block borders.
+
+    The blocks are joined along a comb: every block is joined to its left neighbor, and the blocks of the first column are also joined to the block above.
+    The tour is produced one square at a time by walking the joined cycle, so memory is bounded by the tile library and the block offsets, never by the number of squares.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        columns (list[int]): The width of each block column.
+        rows (list[int]): The height of each block row.
+        column_offsets (list[int]): The x-coordinate where each block column starts.
+        row_offsets (list[int]): The y-coordinate where each block row starts.
+    """
+
+    def __init__(self, width, height):
+        """
+        Initializes the tour and builds the tile library it needs.
+
+        Args:
+            width (int): The width of the board, even and at least 6.
+            height (int): The height of the board, even and at least 6.
+        """
+
+        self.width = width
+        self.height = height
+        self.columns = block_sizes(width)
+        self.rows = block_sizes(height)
+        self.column_offsets = [sum(self.columns[:index]) for index in range(len(self.columns))]
+        self.row_offsets = [sum(self.rows[:index]) for index in range(len(self.rows))]
+
+        # Building every tile and merge that can occur up front keeps failures out of the middle of a stream.
+        for block_height in set(self.rows):
+            for left, right in set(zip(self.columns, self.columns[1:])):
+                merge(left, block_height, right, block_height, True)
+            for block_width in set(self.columns):
+                tile(block_width, block_height)
+        for upper, lower in set(zip(self.rows, self.rows[1:])):
+            merge(self.columns[0], upper, self.columns[0], lower, False)
+
+    def exits(self, row, column):
+        """
+        Lists the tile edges of a block that are replaced by knight moves into neighboring blocks.
+
+        Args:
+            row (int): The block row.
+            column (int): The block column.
+
+        Returns:
+            dict[int, list[tuple[int, int, int, int]]]: For a local square, the removed partner square and the block row, block column and local square to jump to instead.
+        """
+
+        exits = {}
+
+        def add(square, partner, target_row, target_column, landing):
+            exits.setdefault(square, []).append((partner, target_row, target_column, landing))
+
+        width, height = self.columns[column], self.rows[row]
+        if column > 0:
+            a1, a2, b1, b2 = merge(self.columns[column - 1], height, width, height, True)
+            add(b1, b2, row, column - 1, a1)
+            add(b2, b1, row, column - 1, a2)
+        if column < len(self.columns) - 1:
+            a1, a2, b1, b2 = merge(width, height, self.columns[column + 1], height, True)
+            add(a1, a2, row, column + 1, b1)
+            add(a2, a1, row, column + 1, b2)
+        if column == 0 and row > 0:
+            a1, a2, b1, b2 = merge(width, self.rows[row - 1], width, height, False)
+            add(b1, b2, row - 1, column, a1)
+            add(b2, b1, row - 1, column, a2)
+        if column == 0 and row < len(self.rows) - 1:
+            a1, a2, b1, b2 = merge(width, height, width, self.rows[row + 1], False)
+            add(a1, a2, row + 1, column, b1)
+            add(a2, a1, row + 1, column, b2)
+
+        return exits
+
+    def squares(self):
+        """
+        Walks the joined cycle from the square (0, 0).
+
+        Yields:
+            tuple[int, int]: The (x, y) coordinates of each square of the tour in order. The last square is a knight move away from the first.
+        """
+
+        row = column = 0
+        current = tile(self.columns[0], self.rows[0])
+        exits = self.exits(row, column)
+        square = 0
+        direction = 1
+
+        for step in range(self.width * self.height):
+            yield self.column_offsets[column] + square % current.width, self.row_offsets[row] + square // current.width
+
+            length = len(current.order)
+            following = current.order[(current.position[square] + direction) % length]
+            jump = None
+            for partner, target_row, target_column, landing in exits.get(square, ()):
+                if partner == following:
+                    jump = (target_row, target_column, landing)
+                    break
+
+            if jump is None:
+                square = following
+                continue
+
+            # Crossing into the neighbor removes the tile edge (landing, partner) there, so the walk continues away from that partner.
+            origin = (row, column, square)
+            row, column, square = jump
+            current = tile(self.columns[column], self.rows[row])
+            exits = self.exits(row, column)
+            for partner, target_row, target_column, landing in exits[square]:
+                if (target_row, target_column, landing) == origin:
+                    break
+            forward = current.order[(current.position[square] + 1) % len(current.order)]
+            direction = -1 if forward == partner else 1
+
+def tour_squares(width, height):
+    """
+    Generates a closed knight tour of a width by height board square by square without storing the board.
+
+    Args:
+        width (int): The width of the board, even and at least 6.
+        height (int): The height of the board, even and at least 6.
+
+    Yields:
+        tuple[int, int]: The (x, y) coordinates of each square of the tour in order.
+    """
+
+    return LargeTour(width, height).squares()
+
+def write_tour(path, width, height, buffer_size=1 << 20):
+    """
+    Streams a closed knight tour of a width by height board to a text file, one "x y" line per square.
+
+    Args:
+        path (str): The file to write.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        buffer_size (int): The size of the write buffer in bytes.
+
+    Returns:
+        int: The number of squares written.
+    """
+
+    count = 0
+    with open(path, "w", buffering=buffer_size) as file:
+        file.write(f"{width} {height}\n")
+        for x, y in tour_squares(width, height):
+            file.write(f"{x} {y}\n")
+            count += 1
+    return count
+
+def read_tour(path):
+    """
+    Streams a tour written by write_tour back from a file.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        tuple[int, int, Iterator[tuple[int, int]]]: The width and height of the board and an iterator over the (x, y) squares of the tour.
+    """
+
+    file = open(path)
+    width, height = (int(value) for value in file.readline().split())
+
+    def squares():
+        with file:
+            for line in file:
+                x, y = line.split()
+                yield int(x), int(y)
+
+    return width, height, squares()
+
+def validate_tour(squares, width, height, closed=True, unique=True):
+    """
+    Checks a stream of squares against the knight move rule without holding the tour in memory.
+
+    Args:
+        squares (Iterable[tuple[int, int]]): The (x, y) squares of the tour in order.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        closed (bool): If True, the last square also has to be a knight move away from the first.
+        unique (bool): If True, also checks that no square is visited twice, using one bit per square.
+
+    Returns:
+        tuple[bool, str]: Whether the tour is valid, and a message describing the first problem found.
+    """
+
+    seen = bytearray((width * height + 7) // 8) if unique else None
+    first = previous = None
+    count = 0
+
+    for x, y in squares:
+        if not (0 <= x < width and 0 <= y < height):
+            return False, f"square {count} ({x}, {y}) is off the board"
+        if previous is not None:
+            dx, dy = abs(x - previous[0]), abs(y - previous[1])
+            if not (dx == 1 and dy == 2 or dx == 2 and dy == 1):
+                return False, f"move {count} from {previous} to ({x}, {y}) is not a knight move"
+        else:
+            first = (x, y)
+        if seen is not None:
+            index = y * width + x
+            if seen[index >> 3] >> (index & 7) & 1:
+                return False, f"square ({x}, {y}) is visited twice"
+            seen[index >> 3] |= 1 << (index & 7)
+        previous = (x, y)
+        count += 1
+
+    if count != width * height:
+        return False, f"the tour visits {count} of {width * height} squares"
+    if closed:
+        dx, dy = abs(first[0] - previous[0]), abs(first[1] - previous[1])
+        if not (dx == 1 and dy == 2 or dx == 2 and dy == 1):
+            return False, "the last square is not a knight move away from the first"
+    return True, "valid"
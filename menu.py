@@ -1,4 +1,5 @@
 import pygame
+from event_loop import EventLoop
 
 class Menu:
     """
@@ -11,6 +12,7 @@ class Menu:
             chessboard: The chessboard object used to reset the board once the user exits back to the mode selection after a tour.
             ui: The user interaction object for managing graphics.
             knight_tour: The knight tour object that manages the movement logic. This connects to the buttons.
+            events: The event loop that waits for input without using the CPU while idle.
         """
     
     def __init__(self, screen_width, screen_height, chessboard, knight_tour, user_interaction):
@@ -34,6 +36,7 @@ class Menu:
         self.chessboard = chessboard
         self.ui = user_interaction
         self.knight_tour = knight_tour
+        self.events = EventLoop()
 
     def draw_start_button(self):
         """
@@ -52,17 +55,19 @@ class Menu:
 
     def draw_main_menu_buttons(self):
         """
-        Draws the main menu buttons (Manual, Random, Simulation) on the screen.
+        Draws the main menu buttons (Manual, Random, Simulation, Warnsdorff, Heatmap) on the screen.
 
         Returns:
             list[pygame.Rect]: A list of rectangles representing the buttons.
         """
 
         buttons = []
-        button_labels = ['Manual', 'Random', 'Simulation']
+        button_labels = ['Manual', 'Random', 'Simulation', 'Warnsdorff', 'Heatmap']
         positions = [(self.screen.get_width() // 2 - 160, self.screen.get_height() // 2 - 25),
                      (self.screen.get_width() // 2 + 20, self.screen.get_height() // 2 - 25),
-                     (self.screen.get_width() // 2 - 70, self.screen.get_height() // 2 + 75)]
+                     (self.screen.get_width() // 2 - 160, self.screen.get_height() // 2 + 75),
+                     (self.screen.get_width() // 2 + 20, self.screen.get_height() // 2 + 75),
+                     (self.screen.get_width() // 2 - 70, self.screen.get_height() // 2 + 175)]
 
         for i, label in enumerate(button_labels):
             button = pygame.Rect(positions[i][0], positions[i][1], 140, 50)
@@ -78,64 +83,82 @@ class Menu:
         Displays the main menu with a start button.
         """
 
-        running = True
-        while running:
+        start_button = []
+
+        def draw():
             self.screen.fill((0, 0, 0))
-            start_button = self.draw_start_button()
+            start_button[:] = [self.draw_start_button()]
             pygame.display.flip()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if start_button.collidepoint(event.pos):
-                        running = False
-                        self.select_mode_menu()
+        def handle_event(event):
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.MOUSEBUTTONDOWN and start_button[0].collidepoint(event.pos):
+                return True
+
+        if self.events.run(handle_event, draw):
+            self.select_mode_menu()
 
         pygame.quit()
     
     def select_mode_menu(self):
         """
-        Displays the mode selection menu with options for Manual, Random, or Simulation.
+        Displays the mode selection menu with options for Manual, Random, Simulation, Warnsdorff or Heatmap.
+        Returns when the user closes the window.
         """
 
-        running = True
-        while running:
+        buttons = []
+
+        def draw():
             self.screen.fill((0, 0, 0))
-            buttons = self.draw_main_menu_buttons()
+            buttons[:] = self.draw_main_menu_buttons()
             pygame.display.flip()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    for i, button in enumerate(buttons):
-                        if button.collidepoint(event.pos):
-                            if i == 0:
-                                self.knight_tour.random_tour(True, False)
-                                self.knight_tour_done()
-                            elif i == 1:
-                                self.knight_tour.random_tour(False, False)
-                                self.knight_tour_done()
-                            elif i == 2:
-                                self.knight_tour.simulation(1000)
-                                self.select_mode_menu()
-                            running = False
+        def handle_event(event):
+            if event.type == pygame.QUIT:
+                return -1
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                for i, button in enumerate(buttons):
+                    if button.collidepoint(event.pos):
+                        return i
+
+        running = True
+        while running:
+            i = self.events.run(handle_event, draw)
+            # The menu has drawn over the board, so the tours have to start from a full redraw.
+            self.ui.invalidate()
+            if i == 0:
+                self.knight_tour.random_tour(True, False, hints=True)
+                running = self.knight_tour_done()
+            elif i == 1:
+                self.knight_tour.random_tour(False, False)
+                running = self.knight_tour_done()
+            elif i == 2:
+                self.knight_tour.simulation(1000000, batch=True, chunk_size=10000, target=0.2)
+            elif i == 3:
+                self.knight_tour.warnsdorff_tour()
+                running = self.knight_tour_done()
+            elif i == 4:
+                self.knight_tour.start_sweep()
+                running = self.knight_tour_done()
+            else:
+                running = False
     
     def knight_tour_done(self):
         """
         Waits for the user to click anywhere on the screen after a tour is done, used to prevent the window from closing directly after the tour is complete.
-        Returns to the selection menu if the user clicks on the screen.
+
+        Returns:
+            bool: True if the user clicked to return to the selection menu, False if the window was closed.
         """
 
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self.chessboard.reset_board()
-                    self.select_mode_menu()
-                    running = False
-
-        pygame.quit()
\ No newline at end of file
+        def handle_event(event):
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                return True
+
+        if self.events.run(handle_event):
+            self.chessboard.reset_board()
+            return True
+        return False
@@ -0,0 +1,149 @@
+from functools import lru_cache
+
+KNIGHT_OFFSETS = ((-1, 2), (1, 2), (-1, -2), (1, -2), (-2, 1), (-2, -1), (2, 1), (2, -1))
+
+class Leaper:
+    """
+    A piece that jumps straight to any square a fixed offset away, like the knight. Which squares lie in between does not matter.
+
+    An (m, n) leaper moves m squares along one axis and n along the other in any direction, so the knight is the (1, 2) leaper, the camel the (1, 3)
+    leaper and the zebra the (2, 3) leaper. Any other set of offsets can be given directly, as long as every move can be reversed, which the
+    solvers rely on. Leapers with the same offsets in the same order are equal, so they can be used as cache keys.
+
+    Attributes:
+        name (str): The name of the piece.
+        offsets (tuple[tuple[int, int]]): The (dx, dy) of every move, in the order the moves are listed in the move tables.
+    """
+
+    def __init__(self, name, offsets):
+        """
+        Initializes the leaper.
+
+        Args:
+            name (str): The name of the piece.
+            offsets (Iterable[tuple[int, int]]): The (dx, dy) of every move.
+        """
+
+        self.name = name
+        self.offsets = tuple((int(dx), int(dy)) for dx, dy in offsets)
+        if not self.offsets or (0, 0) in self.offsets or len(set(self.offsets)) != len(self.offsets):
+            raise ValueError(f"a leaper needs distinct nonzero offsets, not {self.offsets}")
+        if any((-dx, -dy) not in self.offsets for dx, dy in self.offsets):
+            raise ValueError(f"every move of a leaper has to be reversible, {self.offsets} is not closed under (dx, dy) -> (-dx, -dy)")
+
+    @classmethod
+    def leap(cls, m, n, name=None):
+        """
+        Creates the (m, n) leaper.
+
+        Args:
+            m (int): The distance along one axis.
+            n (int): The distance along the other axis.
+            name (str): The name of the piece, defaults to "(m, n) leaper".
+
+        Returns:
+            Leaper: The leaper with every combination of signs and both orders of m and n.
+        """
+
+        offsets = []
+        for a, b in ((m, n), (n, m)):
+            for dx, dy in ((-a, b), (a, b), (-a, -b), (a, -b)):
+                if (dx, dy) not in offsets:
+                    offsets.append((dx, dy))
+        return cls(f"({m}, {n}) leaper" if name is None else name, offsets)
+
+    @property
+    def reach(self):
+        """
+        int: The largest distance the piece moves along either axis.
+        """
+
+        return max(max(abs(dx), abs(dy)) for dx, dy in self.offsets)
+
+    @property
+    def color_changing(self):
+        """
+        bool: True if every move lands on a square of the other color, like the knight's, so tours alternate colors.
+        """
+
+        return all((dx + dy) % 2 == 1 for dx, dy in self.offsets)
+
+    def __eq__(self, other):
+        return isinstance(other, Leaper) and self.offsets == other.offsets
+
+    def __hash__(self):
+        return hash(self.offsets)
+
+    def __repr__(self):
+        return f"Leaper({self.name!r}, {self.offsets})"
+
+KNIGHT = Leaper("knight", KNIGHT_OFFSETS)
+CAMEL = Leaper.leap(1, 3, "camel")
+ZEBRA = Leaper.leap(2, 3, "zebra")
+PIECES = {piece.name: piece for piece in (KNIGHT, CAMEL, ZEBRA)}
+
+def parse_piece(text):
+    """
+    Finds a piece by name, or builds a leaper from "m,n".
+
+    Args:
+        text (str): A name from PIECES, such as "camel", or the distances of a leaper, such as "1,4".
+
+    Returns:
+        Leaper: The piece.
+    """
+
+    if text in PIECES:
+        return PIECES[text]
+    try:
+        m, n = (int(part) for part in text.split(","))
+    except ValueError:
+        raise ValueError(f"unknown piece {text!r}, expected one of {', '.join(PIECES)} or m,n") from None
+    return Leaper.leap(m, n)
+
+@lru_cache(maxsize=None)
+def leaper_moves(piece, width, height=None):
+    """
+    Builds the move table of a piece on a width by height board. The table is computed once per piece and board shape and cached.
+
+    Squares are identified by their flat index, index = y * width + x, which matches chessboard.board[y][x].
+
+    Args:
+        piece (Leaper): The piece that moves.
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard, defaults to the width.
+
+    Returns:
+        tuple[tuple[int]]: For every square index, a tuple of the square indices the piece can reach from it, in the order of piece.offsets.
+    """
+
+    if height is None:
+        height = width
+
+    table = []
+    for index in range(width * height):
+        x = index % width
+        y = index // width
+        neighbors = []
+        for dx, dy in piece.offsets:
+            if 0 <= x + dx < width and 0 <= y + dy < height:
+                neighbors.append((y + dy) * width + x + dx)
+        table.append(tuple(neighbors))
+
+    return tuple(table)
+
+@lru_cache(maxsize=None)
+def knight_moves(size):
+    """
+    Builds the knight-move adjacency table for a square board of the given size. The table is computed once per board size and cached.
+
+    Squares are identified by their flat index, index = y * size + x, which matches chessboard.board[y][x].
+
+    Args:
+        size (int): The size of the chessboard.
+
+    Returns:
+        tuple[tuple[int]]: For every square index, a tuple of the square indices a knight can reach from it.
+    """
+
+    return leaper_moves(KNIGHT, size, size)
@@ -0,0 +1,109 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from chessboard import Chessboard
+from move_table import KNIGHT
+from tour_statistics import TourStatistics
+
+def worker_seeds(seed, workers):
+    """
+    Derives one independent seed per worker from a master seed.
+
+    Args:
+        seed (int): The master seed.
+        workers (int): The number of workers.
+
+    Returns:
+        list[int]: A 64-bit seed for each worker.
+    """
+
+    master = random.Random(seed)
+    return [master.getrandbits(64) for worker in range(workers)]
+
+def split_iterations(iterations, workers):
+    """
+    Splits the iterations as evenly as possible between the workers.
+
+    Args:
+        iterations (int): The total number of tours.
+        workers (int): The number of workers.
+
+    Returns:
+        list[int]: The number of tours each worker runs.
+    """
+
+    share, remainder = divmod(iterations, workers)
+    return [share + (1 if worker < remainder else 0) for worker in range(workers)]
+
+def run_worker(size, iterations, seed, height=None, piece=KNIGHT):
+    """
+    Runs random tours with a private random generator and counts how many runs visited each number of squares.
+
+    This runs inside the worker processes. The tours come from KnightTour.random_moves, the same generator the other engines and the interfaces use,
+    and KnightTour only loads pygame when it plays a sound, so the workers never do.
+
+    Args:
+        size (int): The width of the chessboard.
+        iterations (int): The number of tours to run.
+        seed (int): The seed of the worker's random generator.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that tours the board.
+
+    Returns:
+        list[int]: A histogram where entry k is the number of runs that visited k squares.
+    """
+
+    # Imported here because knight_tour imports this module.
+    from knight_tour import KnightTour
+
+    rng = random.Random(seed)
+    chessboard = Chessboard(size, height)
+    knight_tour = KnightTour(chessboard, None, piece)
+    histogram = [0] * (chessboard.squares + 1)
+
+    for simulation in range(iterations):
+        square = rng.randrange(chessboard.squares)
+        for tour_move in knight_tour.random_moves(square % size, square // size, rng):
+            pass
+
+        histogram[chessboard.move] += 1
+        chessboard.reset_board()
+
+    return histogram
+
+def parallel_simulation(size, iterations, seed=0, workers=None, executor=None, height=None, piece=KNIGHT):
+    """
+    Runs random tours split across a pool of worker processes and merges their statistics.
+
+    Each worker gets its own seed derived from the master seed and the results are merged in worker order, so the result is identical for a given seed and worker count.
+
+    Args:
+        size (int): The width of the chessboard.
+        iterations (int): The total number of tours to run.
+        seed (int): The master seed.
+        workers (int): The number of worker processes, defaults to the number of CPUs.
+        executor (concurrent.futures.Executor): A pool to run the workers on, so repeated calls can share one pool. By default a pool is created
+            for this call and shut down afterwards.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that tours the board.
+
+    Returns:
+        TourStatistics: The merged statistics of all runs.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    seeds = worker_seeds(seed, workers)
+    shares = split_iterations(iterations, workers)
+    statistics = TourStatistics(size * (size if height is None else height))
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return parallel_simulation(size, iterations, seed, workers, executor, height, piece)
+
+    futures = [executor.submit(run_worker, size, shares[worker], seeds[worker], height, piece) for worker in range(workers)]
+    for future in futures:
+        statistics.merge(TourStatistics.from_histogram(future.result()))
+
+    return statistics
@@ -0,0 +1,331 @@
+import argparse
+import csv
+import json
+import os
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from chessboard import Chessboard
+from move_table import KNIGHT, PIECES, parse_piece
+
+#Runs the same number of random tours from every start square and collects per-square statistics, e.g.
+#python -m start_sweep --size 8 --runs 10000 --seed 0 --out sweep.csv
+
+# Tours from a square are split into work items of at most this many runs. It is fixed, so the seeds of the work items, and with them the
+# result, only depend on the parameters of the sweep and not on how the work is spread.
+BATCH = 4096
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "knight_tour", "sweeps")
+
+def item_seed(seed, square, batch):
+    """
+    Derives the seed of one work item of a sweep from the master seed.
+
+    Args:
+        seed (int | None): The master seed, or None for unseeded tours.
+        square (int): The flat index of the start square.
+        batch (int): The number of the batch of tours from that square.
+
+    Returns:
+        int | None: A 64-bit seed, or None if the sweep is unseeded.
+    """
+
+    return None if seed is None else random.Random(f"{seed}:{square}:{batch}").getrandbits(64)
+
+def sweep_item(width, height, piece, square, runs, seed, engine):
+    """
+    Runs random tours from one start square and counts how many runs visited each number of squares. This runs inside the worker processes.
+
+    Args:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece that tours the board.
+        square (int): The flat index of the start square.
+        runs (int): The number of tours to run.
+        seed (int | None): The seed of the tours.
+        engine (str): "batch" for the vectorized batch engine or "loop" for KnightTour.random_moves.
+
+    Returns:
+        list[int]: A histogram where entry k is the number of runs that visited k squares.
+    """
+
+    if engine == "batch":
+        from batch_simulation import simulate_batch_histogram
+
+        return simulate_batch_histogram(width, runs, seed, height, piece, square)
+
+    # Imported here because the workers only need it for the loop engine.
+    from knight_tour import KnightTour
+
+    rng = random.Random(seed)
+    chessboard = Chessboard(width, height)
+    knight_tour = KnightTour(chessboard, None, piece)
+    histogram = [0] * (chessboard.squares + 1)
+    for simulation in range(runs):
+        for tour_move in knight_tour.random_moves(square % width, square // width, rng):
+            pass
+        histogram[chessboard.move] += 1
+        chessboard.reset_board()
+    return histogram
+
+class SweepResult:
+    """
+    The tour lengths of a start-square sweep: for every start square, how many of its runs visited each number of squares.
+
+    The per-square statistics are derived from the histograms as height by width arrays, indexed [y][x] like chessboard.board.
+
+    Attributes:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece that toured the board.
+        runs (int): The number of tours from every start square.
+        seed (int | None): The master seed of the sweep.
+        engine (str): The engine that ran the tours.
+        histograms (numpy.ndarray): A (squares, squares + 1) array, entry [s, k] is the number of runs from square s that visited k squares.
+    """
+
+    QUANTITIES = ("mean", "variance", "completion")
+
+    def __init__(self, width, height, piece, runs, seed, engine, histograms):
+        """
+        Initializes the result.
+
+        Args:
+            width (int): The width of the chessboard.
+            height (int): The height of the chessboard.
+            piece (Leaper): The piece that toured the board.
+            runs (int): The number of tours from every start square.
+            seed (int | None): The master seed of the sweep.
+            engine (str): The engine that ran the tours.
+            histograms (numpy.ndarray): The histogram of tour lengths of every start square.
+        """
+
+        self.width = width
+        self.height = height
+        self.piece = piece
+        self.runs = runs
+        self.seed = seed
+        self.engine = engine
+        self.histograms = histograms
+
+    @property
+    def mean(self):
+        """
+        numpy.ndarray: The mean tour length from every start square.
+        """
+
+        lengths = np.arange(self.histograms.shape[1])
+        return (self.histograms @ lengths / self.runs).reshape(self.height, self.width)
+
+    @property
+    def variance(self):
+        """
+        numpy.ndarray: The sample variance of the tour length from every start square.
+        """
+
+        lengths = np.arange(self.histograms.shape[1])
+        mean = self.histograms @ lengths / self.runs
+        squares = self.histograms @ (lengths * lengths)
+        return ((squares - self.runs * mean * mean) / max(1, self.runs - 1)).reshape(self.height, self.width)
+
+    @property
+    def completion(self):
+        """
+        numpy.ndarray: The fraction of the tours from every start square that visited every square.
+        """
+
+        return (self.histograms[:, -1] / self.runs).reshape(self.height, self.width)
+
+    def grid(self, quantity):
+        """
+        Returns one of the per-square statistics by name.
+
+        Args:
+            quantity (str): "mean", "variance" or "completion".
+
+        Returns:
+            numpy.ndarray: The height by width array of the statistic.
+        """
+
+        if quantity not in self.QUANTITIES:
+            raise ValueError(f"unknown quantity {quantity!r}, expected one of {', '.join(self.QUANTITIES)}")
+        return getattr(self, quantity)
+
+    def parameters(self):
+        """
+        Collects the parameters of the sweep.
+
+        Returns:
+            dict: The board, the piece, the runs per square, the seed and the engine.
+        """
+
+        return {"width": self.width, "height": self.height, "piece": self.piece.name, "offsets": [list(offset) for offset in self.piece.offsets],
+                "runs": self.runs, "seed": self.seed, "engine": self.engine}
+
+    def save(self, path):
+        """
+        Saves the result. The format follows the extension: .npz keeps the histograms and can be loaded again, .json holds the parameters
+        and the per-square grids, and .csv has a row per start square.
+
+        Args:
+            path (str): The file to write.
+        """
+
+        if path.endswith(".npz"):
+            np.savez_compressed(path, histograms=self.histograms, parameters=json.dumps(self.parameters()))
+        elif path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump(dict(self.parameters(), **{quantity: self.grid(quantity).tolist() for quantity in self.QUANTITIES}), file, indent=2)
+        elif path.endswith(".csv"):
+            mean, variance, completion = self.mean, self.variance, self.completion
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["x", "y", "runs", "mean", "variance", "completion"])
+                for y in range(self.height):
+                    for x in range(self.width):
+                        writer.writerow([x, y, self.runs, mean[y, x], variance[y, x], completion[y, x]])
+        else:
+            raise ValueError(f"cannot tell the format of {path}, expected .npz, .json or .csv")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a result saved as .npz.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            SweepResult: The result.
+        """
+
+        with np.load(path) as data:
+            parameters = json.loads(str(data["parameters"]))
+            histograms = data["histograms"]
+        piece = PIECES.get(parameters["piece"])
+        if piece is None or [list(offset) for offset in piece.offsets] != parameters["offsets"]:
+            from move_table import Leaper
+
+            piece = Leaper(parameters["piece"], parameters["offsets"])
+        return cls(parameters["width"], parameters["height"], piece, parameters["runs"], parameters["seed"], parameters["engine"], histograms)
+
+def cache_path(cache_dir, width, height, piece, runs, seed, engine):
+    """
+    Builds the name of the cache file of a sweep.
+
+    Args:
+        cache_dir (str): The cache directory.
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece that tours the board.
+        runs (int): The number of tours from every start square.
+        seed (int): The master seed.
+        engine (str): The engine that runs the tours.
+
+    Returns:
+        str: The path of the cache file.
+    """
+
+    name = re.sub(r"[^A-Za-z0-9]+", "_", piece.name).strip("_")
+    if PIECES.get(piece.name) != piece:
+        # Only the named pieces are known by their name alone.
+        name += "-" + "_".join(f"{dx}{dy:+d}" for dx, dy in piece.offsets)
+    return os.path.join(cache_dir, f"{width}x{height}-{name}-K{runs}-seed{seed}-{engine}.npz")
+
+def sweep(width, height=None, piece=KNIGHT, runs=1000, seed=0, workers=None, engine="batch", cache_dir=DEFAULT_CACHE, executor=None):
+    """
+    Runs the same number of random tours from every start square and collects the tour length histogram of every square.
+
+    The (square, batch) work items are spread across a pool of worker processes. Every item has its own seed derived from the master seed,
+    the square and the batch, so the result is the same for any number of workers. A seeded sweep is cached on disk, keyed by the board, the
+    piece, the runs per square, the seed and the engine, so showing it again is instant.
+
+    Args:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that tours the board.
+        runs (int): The number of tours from every start square.
+        seed (int | None): The master seed. Unseeded sweeps are not cached.
+        workers (int): The number of worker processes, defaults to the number of CPUs.
+        engine (str): "batch" for the vectorized batch engine or "loop" for KnightTour.random_moves.
+        cache_dir (str | None): The directory of the cache, or None to neither read nor write it.
+        executor (concurrent.futures.Executor): A pool to run the work items on. By default a pool is created for this call.
+
+    Returns:
+        SweepResult: The result.
+    """
+
+    if height is None:
+        height = width
+    if engine not in ("batch", "loop"):
+        raise ValueError(f"unknown engine {engine!r}, expected batch or loop")
+
+    path = None
+    if cache_dir is not None and seed is not None:
+        path = cache_path(cache_dir, width, height, piece, runs, seed, engine)
+        if os.path.exists(path):
+            return SweepResult.load(path)
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            return sweep(width, height, piece, runs, seed, workers, engine, cache_dir, executor)
+
+    squares = width * height
+    futures = []
+    for square in range(squares):
+        for batch, first in enumerate(range(0, runs, BATCH)):
+            count = min(BATCH, runs - first)
+            futures.append((square, executor.submit(sweep_item, width, height, piece, square, count, item_seed(seed, square, batch), engine)))
+
+    histograms = np.zeros((squares, squares + 1), dtype=np.int64)
+    for square, future in futures:
+        histograms[square] += future.result()
+
+    result = SweepResult(width, height, piece, runs, seed, engine, histograms)
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written under a temporary name and renamed, so an interrupted write never leaves a broken cache file.
+        temporary = path[:-len(".npz")] + f".{os.getpid()}.tmp.npz"
+        result.save(temporary)
+        os.replace(temporary, path)
+    return result
+
+def main(arguments=None):
+    """
+    Runs a start-square sweep from the command line and prints or exports the per-square statistics.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="start_sweep", description="Runs random tours from every start square and reports per-square statistics.")
+    parser.add_argument("--size", type=int, default=8, help="size of a square chessboard")
+    parser.add_argument("--width", type=int, default=None, help="width of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--height", type=int, default=None, help="height of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--piece", type=parse_piece, default="knight", metavar="PIECE", help=f"{', '.join(PIECES)} or m,n for the (m, n) leaper")
+    parser.add_argument("--runs", type=int, default=1000, help="tours from every start square")
+    parser.add_argument("--seed", type=int, default=0, help="master seed, the cache key together with the board and the runs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--engine", choices=["batch", "loop"], default="batch", help="simulation engine")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE, help="directory of the sweep cache")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    parser.add_argument("--quantity", choices=SweepResult.QUANTITIES, default="mean", help="the statistic to print")
+    parser.add_argument("--out", default=None, help="export the result to a .csv, .json or .npz file")
+    options = parser.parse_args(arguments)
+
+    width = options.size if options.width is None else options.width
+    height = options.size if options.height is None else options.height
+    result = sweep(width, height, options.piece, options.runs, options.seed, options.workers, options.engine,
+                   None if options.no_cache else options.cache_dir)
+
+    if options.out is not None:
+        result.save(options.out)
+    else:
+        grid = result.grid(options.quantity)
+        # Row 0 is printed last, so the board reads the same way as in the window.
+        for row in reversed(grid):
+            print(" ".join(f"{value:9.4g}" for value in row))
+
+if __name__ == "__main__":
+    main()
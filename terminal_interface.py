@@ -1,4 +1,7 @@
-import random
+import time
+from warnsdorff import warnsdorff_tour
+from tour_search import TourSearch
+from terminal_renderer import TerminalRenderer
 
 class TerminalInterface:
     """
@@ -10,40 +13,47 @@ class TerminalInterface:
     Attributes:
         chessboard (Chessboard): The chessboard object representing the state of the board.
         knight_tour (KnightTour): The knight tour object containing logic for valid moves.
+        renderer (TerminalRenderer): Draws the board in the terminal.
     """
 
-    def __init__(self, chessboard, knight_tour):
+    def __init__(self, chessboard, knight_tour, renderer=None):
         """
         Initializes the TerminalInterface with the provided Chessboard and KnightTour objects.
 
         Args:
             chessboard (Chessboard): The chessboard object to track the state of the board.
             knight_tour (KnightTour): The knight tour logic manager.
+            renderer (TerminalRenderer): Draws the board, defaults to a renderer on standard output that picks its mode from the terminal.
         """
         self.chessboard = chessboard
         self.knight_tour = knight_tour
+        self.renderer = TerminalRenderer(chessboard) if renderer is None else renderer
     
     def game(self):
         """
-        Starts the game by prompting the user to select a mode (manual or random) and input a starting position.
+        Starts the game by prompting the user to select a mode (manual, random, Warnsdorff or exact search) and input a starting position.
 
         If the user enters an invalid mode, the game is restarted.
         """
-        tour_type = int(input("Select mode: 1 = manual tour, 2 = random tour:"))
-        self.chessboard.print_board()
+        tour_type = int(input("Select mode: 1 = manual tour, 2 = random tour, 3 = Warnsdorff tour, 4 = exact search:"))
+        self.renderer.draw()
 
-        if tour_type == 1 or tour_type == 2:
+        if tour_type in (1, 2, 3, 4):
             start_x = int(input("Enter the starting x coordinate:"))
             start_y = int(input("Enter the starting y coordinate:"))
 
             self.chessboard.move = 1
             self.chessboard.mark_square(start_x, start_y, self.chessboard.move)
-            self.chessboard.print_board()
+            self.renderer.update(start_x - 1, start_y - 1)
 
             if tour_type == 1:
                 self.manual(start_x, start_y)
-            else:
+            elif tour_type == 2:
                 self.random(start_x, start_y)
+            elif tour_type == 3:
+                self.warnsdorff(start_x, start_y)
+            else:
+                self.exact(start_x, start_y)
         else:
             self.game()
     
@@ -68,7 +78,7 @@ class TerminalInterface:
                 self.chessboard.move += 1
 
                 self.chessboard.mark_square(current_x + 1, current_y + 1, self.chessboard.move)
-                self.chessboard.print_board()
+                self.renderer.update(current_x, current_y)
             else:
                 print("Invalid move.")
     
@@ -80,14 +90,57 @@ class TerminalInterface:
             start_x (int): The starting x-coordinate.
             start_y (int): The starting y-coordinate.
         """
-        current_x = start_x - 1
-        current_y = start_y - 1
+        moves = self.knight_tour.random_moves(start_x - 1, start_y - 1)
+        # The starting square has already been marked and printed by game.
+        next(moves)
+        for tour_move in moves:
+            self.renderer.update(tour_move.x, tour_move.y)
+        self.renderer.finish()
 
-        while len(self.knight_tour.next_valid_moves(current_x, current_y)) > 0:
-            new_move = random.choice(self.knight_tour.next_valid_moves(current_x, current_y))
-            current_x = new_move[0] 
-            current_y = new_move[1]
+    def warnsdorff(self, start_x, start_y):
+        """
+        Solves a full Knight Tour with Warnsdorff's rule and prints the finished board together with the solve time.
+
+        Args:
+            start_x (int): The starting x-coordinate.
+            start_y (int): The starting y-coordinate.
+        """
+        start = time.perf_counter()
+        tour = warnsdorff_tour(self.chessboard.width, start_x - 1, start_y - 1, height=self.chessboard.height, piece=self.knight_tour.piece)
+        solve_time = time.perf_counter() - start
+
+        if tour is None:
+            print(f"No Warnsdorff tour found ({solve_time * 1000:.1f} ms).")
+            return
+
+        for square in tour[1:]:
             self.chessboard.move += 1
-            
-            self.chessboard.mark_square(current_x + 1, current_y + 1, self.chessboard.move)
-            self.chessboard.print_board()
\ No newline at end of file
+            self.chessboard.mark_index(square, self.chessboard.move)
+        self.renderer.show()
+        print(f"Warnsdorff tour solved in {solve_time * 1000:.1f} ms.")
+
+    def exact(self, start_x, start_y, time_limit=30):
+        """
+        Runs an exact search for a full Knight Tour and reports whether one exists from the starting position.
+
+        Args:
+            start_x (int): The starting x-coordinate.
+            start_y (int): The starting y-coordinate.
+            time_limit (float): The maximum search time in seconds.
+        """
+        closed = input("Closed tours only? (y/n):").strip().lower() == "y"
+        search = TourSearch(self.chessboard, (start_y - 1) * self.chessboard.width + start_x - 1, closed=closed, time_limit=time_limit,
+                            piece=self.knight_tour.piece)
+        result = search.run()
+
+        if result.status == "found":
+            for square in result.tour[1:]:
+                self.chessboard.move += 1
+                self.chessboard.mark_index(square, self.chessboard.move)
+            self.renderer.show()
+            print("Found a full tour.")
+        elif result.status == "exhausted":
+            print("No full tour exists from this square.")
+        else:
+            print(f"Search stopped ({result.status}) before an answer was found.")
+        print(f"{result.nodes} nodes in {result.elapsed:.3f} s ({result.nodes_per_second:.0f} nodes/s).")
\ No newline at end of file
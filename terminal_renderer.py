@@ -0,0 +1,124 @@
+import shutil
+import sys
+
+class TerminalRenderer:
+    """
+    Draws a chessboard in the terminal with fixed-width cells, writing each frame to the stream in a single buffered write.
+
+    The renderer has three modes:
+        "full": the whole board is written after every move.
+        "incremental": the whole board is written once, after that ANSI cursor addressing rewrites only the cell of each new move.
+        "final": nothing is written while the tour runs, only the finished board, for batch use.
+
+    Attributes:
+        chessboard (Chessboard): The chessboard to draw.
+        stream: The text stream to write to.
+        mode (str): "full", "incremental" or "final".
+        width (int): The width of a cell in characters, enough for the largest move number and a space.
+        cells (list[str]): The padded text of every move number.
+        drawn (bool): True once the whole board has been written in incremental mode.
+    """
+
+    MODES = ("full", "incremental", "final")
+
+    def __init__(self, chessboard, stream=None, mode=None):
+        """
+        Initializes the renderer.
+
+        Args:
+            chessboard (Chessboard): The chessboard to draw.
+            stream: The text stream to write to, defaults to sys.stdout.
+            mode (str): "full", "incremental" or "final". Defaults to incremental when the stream is a terminal that the whole board fits in
+                and otherwise to full, since cursor addressing only works when the board neither scrolls nor wraps.
+        """
+
+        self.chessboard = chessboard
+        self.stream = sys.stdout if stream is None else stream
+        self.width = len(str(chessboard.squares)) + 1
+        if mode is None:
+            mode = "incremental" if self.stream.isatty() and self.fits() else "full"
+        if mode not in self.MODES:
+            raise ValueError(f"unknown terminal rendering mode: {mode}")
+        self.mode = mode
+        self.cells = [str(move).rjust(self.width) for move in range(chessboard.squares + 1)]
+        self.drawn = False
+
+    def fits(self):
+        """
+        Checks whether the board, its separator line and a line for prompts below it fit in the terminal window.
+
+        Returns:
+            bool: True if the board fits.
+        """
+
+        columns, lines = shutil.get_terminal_size()
+        return self.chessboard.width * self.width <= columns and self.chessboard.height + 2 <= lines
+
+    def frame(self):
+        """
+        Builds the text of the whole board, with row 0 at the bottom.
+
+        Returns:
+            str: The board, one line per row, ending with a newline.
+        """
+
+        columns = self.chessboard.width
+        visited = self.chessboard.visited
+        moves = self.chessboard.moves
+        cells = self.cells
+        lines = ["-" * (columns * self.width)]
+        for row in range(self.chessboard.height - 1, -1, -1):
+            offset = row * columns
+            lines.append("".join([cells[moves[index]] if visited[index >> 6] >> (index & 63) & 1 else cells[0] for index in range(offset, offset + columns)]))
+        lines.append("")
+        return "\n".join(lines)
+
+    def draw(self):
+        """
+        Writes the whole board, unless the mode is final.
+        """
+
+        if self.mode != "final":
+            self.show()
+
+    def show(self):
+        """
+        Writes the whole board in any mode. In incremental mode the screen is cleared first, so the board starts at the top left corner where
+        the cursor addressing expects it.
+        """
+
+        text = self.frame()
+        if self.mode == "incremental":
+            text = "\x1b[H\x1b[2J" + text
+            self.drawn = True
+        self.stream.write(text)
+        self.stream.flush()
+
+    def update(self, x, y):
+        """
+        Shows a new move. Depending on the mode this rewrites only its cell, the whole board or nothing.
+
+        Args:
+            x (int): The x-coordinate index of the square that changed.
+            y (int): The y-coordinate index of the square that changed.
+        """
+
+        if self.mode == "final":
+            return
+        if self.mode == "full" or not self.drawn:
+            self.show()
+            return
+
+        height = self.chessboard.height
+        cell = self.cells[self.chessboard.value(y * self.chessboard.width + x)]
+        # Line 1 is the separator, so row y is on line height - y + 1. Afterwards the cursor goes back below the board and clears the rest of the screen.
+        self.stream.write(f"\x1b[{height - y + 1};{x * self.width + 1}H{cell}\x1b[{height + 2};1H\x1b[J")
+        self.stream.flush()
+
+    def finish(self):
+        """
+        Ends a tour. In final mode this is the only time the board is written.
+        """
+
+        if self.mode == "final":
+            self.show()
@@ -0,0 +1,54 @@
+import numpy as np
+from large_tour import tour_squares
+from tour_validation import PAD, TourReport, pad_tours, validate_tours
+
+def closed_tour(size):
+    """
+    Builds a closed knight tour of a square board.
+
+    Args:
+        size (int): The size of the board, even and at least 6.
+
+    Returns:
+        list[int]: The flat square indices of the tour.
+    """
+
+    return [x + y * size for x, y in tour_squares(size, size)]
+
+def test_features_do_not_depend_on_chunk_width():
+    tour = closed_tour(6)
+    for closed in (False, True):
+        alone = validate_tours([tour], 6, closed=closed)
+        padded = validate_tours([tour, list(range(37))], 6, closed=closed)
+        wider = validate_tours(pad_tours([tour, tour + [0, 1, 2, 3]]), 6, closed=closed)
+        for report in (padded, wider):
+            assert report.valid[0]
+            assert report.crossings[0] == alone.crossings[0]
+            assert report.symmetries[0] == alone.symmetries[0]
+            assert report.symmetry_class[0] == alone.symmetry_class[0]
+        assert alone.symmetry_class.dtype == np.uint64
+        assert TourReport.concatenate([alone, padded, wider]).summary()["symmetry_classes"] == 1
+
+def test_cycle_key_ignores_start_and_direction_in_padded_chunks():
+    tour = np.array(closed_tour(6))
+    cycles = [tour, np.roll(tour, 7), np.roll(tour[::-1], 11)]
+    report = validate_tours(pad_tours(cycles + [list(tour) + [0, 1, 2]]), 6, closed=True)
+    assert report.valid[:3].all()
+    assert len(set(report.symmetry_class[:3].tolist())) == 1
+    assert len(set(report.crossings[:3].tolist())) == 1
+
+def test_mirrored_tour_is_in_the_same_class():
+    tour = np.array(closed_tour(8))
+    x, y = tour % 8, tour // 8
+    report = validate_tours(np.array([tour, (7 - x) + 8 * y, y + 8 * x]), 8)
+    assert report.valid.all()
+    assert len(set(report.symmetry_class.tolist())) == 1
+
+def test_problems_are_found():
+    tour = closed_tour(6)
+    report = validate_tours([tour[:20], tour[:5] + [tour[4]] + tour[6:], tour[:-1] + [99], [0, 13, PAD, 2]], 6)
+    assert not report.valid.any()
+    assert report.legal[0] and not report.complete[0]
+    assert report.first_illegal[1] == 5
+    assert not report.in_bounds[2]
+    assert not report.in_bounds[3]
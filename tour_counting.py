@@ -0,0 +1,441 @@
+import sys
+from collections import OrderedDict
+from fractions import Fraction
+from move_table import KNIGHT, leaper_moves
+
+def symmetries(width, height):
+    """
+    Lists the symmetries of a width by height board as permutations of the squares. A square board has 8 symmetries, a rectangle 4.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+
+    Returns:
+        list[tuple[int]]: For every symmetry, the square each square is mapped to. The identity comes first.
+    """
+
+    maps = [
+        lambda x, y: (x, y),
+        lambda x, y: (width - 1 - x, y),
+        lambda x, y: (x, height - 1 - y),
+        lambda x, y: (width - 1 - x, height - 1 - y),
+    ]
+    if width == height:
+        maps += [
+            lambda x, y: (y, x),
+            lambda x, y: (height - 1 - y, x),
+            lambda x, y: (y, width - 1 - x),
+            lambda x, y: (height - 1 - y, width - 1 - x),
+        ]
+
+    permutations = []
+    for transform in maps:
+        permutation = []
+        for square in range(width * height):
+            x, y = transform(square % width, square // width)
+            permutation.append(y * width + x)
+        permutations.append(tuple(permutation))
+    return permutations
+
+class TourCounter:
+    """
+    Counts knight paths, or the paths of another leaper, exactly with a memoized depth-first search, for boards small enough to enumerate.
+
+    Every sub-problem is identified by the set of visited squares as a bitmask and the square the knight stands on. Its answer only depends on that pair,
+    so answers are kept in a transposition table and reused whenever another path reaches the same visited set and square. Each kind of query has its
+    own table, an LRU cache bounded by max_entries. With symmetry reduction the pair is first mapped to the smallest of its images under the board's
+    symmetries, so symmetric positions share one entry, and only one start square of each symmetry class is searched. The tour counts also prune
+    positions where an unvisited square can no longer be fitted into the rest of the tour.
+
+    The number of positions grows exponentially with the number of squares. As a guide, 5x5 and the boards up to about 30 squares take well under
+    a second to a few seconds, the 9862 closed tours of 6x6 about 5 seconds and 0.3 million entries, and the 6637920 open tours of 6x6 about
+    1.5 minutes and 4 million entries (about 1 GB, pass a larger max_entries to keep them all). Larger boards are out of reach. The path counts and
+    the random walk distribution cannot prune, so they only go up to 5x5: the exact walk distribution of 5x5 takes about 20 seconds and 1 GB.
+
+    Squares are numbered y * width + x like on the Chessboard. Other leapers can be counted as well. Symmetries of the board that do not map the
+    piece's moves onto themselves are not used.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        squares (int): The number of squares.
+        piece (Leaper): The piece that moves.
+        table (tuple[tuple[int]]): The moves from every square.
+        neighbors (tuple[int]): The moves from every square as a bitmask.
+        max_entries (int): The maximum number of entries kept in each transposition table.
+        symmetry (bool): True if positions are reduced under the board's symmetries.
+        memos (dict[str, OrderedDict]): The transposition table of every kind of query.
+        hits (int): Lookups answered from a transposition table.
+        misses (int): Lookups that had to be searched.
+        evictions (int): Entries dropped because a table was full.
+    """
+
+    def __init__(self, width, height=None, max_entries=2000000, symmetry=True, piece=KNIGHT):
+        """
+        Initializes the counter.
+
+        Args:
+            width (int): The width of the board.
+            height (int): The height of the board, defaults to the width.
+            max_entries (int): The maximum number of entries kept in each transposition table.
+            symmetry (bool): If True, positions are reduced under the board's symmetries.
+            piece (Leaper): The piece that moves.
+        """
+
+        self.width = width
+        self.height = width if height is None else height
+        self.squares = self.width * self.height
+        self.piece = piece
+        self.table = leaper_moves(piece, width, self.height)
+        self.neighbors = tuple(sum(1 << neighbor for neighbor in moves) for moves in self.table)
+        self.max_entries = max_entries
+        self.symmetry = symmetry
+        self.full = (1 << self.squares) - 1
+        self.permutations = [
+            permutation for permutation in symmetries(width, self.height)
+            if all(set(self.table[permutation[square]]) == {permutation[neighbor] for neighbor in self.table[square]} for square in range(self.squares))
+        ]
+
+        # Mapping a mask through a symmetry one byte at a time: maps[i][b] is the image of byte value b at byte i of the mask.
+        self.byte_maps = []
+        for permutation in self.permutations[1:]:
+            maps = []
+            for byte in range((self.squares + 7) // 8):
+                images = [0] * 256
+                for value in range(256):
+                    for bit in range(8):
+                        square = byte * 8 + bit
+                        if value >> bit & 1 and square < self.squares:
+                            images[value] |= 1 << permutation[square]
+                maps.append(images)
+            self.byte_maps.append((permutation, maps))
+        # Closed tours are counted from square 0, so only the symmetries that keep square 0 in place can be used for them.
+        self.closed_maps = [(permutation, maps) for permutation, maps in self.byte_maps if permutation[0] == 0]
+
+        self.clear()
+
+    def clear(self):
+        """
+        Empties the transposition tables and resets the statistics.
+        """
+
+        self.memos = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, mask, square, byte_maps=None):
+        """
+        Builds the transposition table key of a position, reduced under the symmetries if symmetry is on.
+
+        Args:
+            mask (int): The visited squares as a bitmask.
+            square (int): The square the knight stands on.
+            byte_maps (list): The symmetries to reduce under, defaults to all symmetries of the board.
+
+        Returns:
+            int: The key.
+        """
+
+        best = mask * self.squares + square
+        if not self.symmetry:
+            return best
+
+        for permutation, maps in self.byte_maps if byte_maps is None else byte_maps:
+            image = 0
+            rest = mask
+            for images in maps:
+                image |= images[rest & 255]
+                rest >>= 8
+            key = image * self.squares + permutation[square]
+            if key < best:
+                best = key
+        return best
+
+    def lookup(self, kind, key):
+        """
+        Reads a key from the transposition table of a kind of query, counting the hit or miss.
+
+        Args:
+            kind (str): The kind of query, which selects the table.
+            key (int): The key of the position.
+
+        Returns:
+            Any: The stored answer, or None if the key is not in the table.
+        """
+
+        memo = self.memos.get(kind)
+        if memo is None:
+            memo = self.memos[kind] = OrderedDict()
+        answer = memo.get(key)
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            memo.move_to_end(key)
+        return answer
+
+    def store(self, kind, key, answer):
+        """
+        Adds an answer to the transposition table of a kind of query, evicting the least recently used entry if the table is full.
+        """
+
+        memo = self.memos[kind]
+        memo[key] = answer
+        if len(memo) > self.max_entries:
+            memo.popitem(last=False)
+            self.evictions += 1
+
+    def stranded(self, mask, square, closed=False):
+        """
+        Checks whether the unvisited squares can still all be fitted into the rest of the tour.
+
+        A square in the middle of the rest of the tour needs two ways in or out, the last square one. The knight's square only counts as a way into
+        the square visited next, and for a closed tour square 0 counts as the way out of the last square.
+
+        Args:
+            mask (int): The visited squares as a bitmask.
+            square (int): The square the knight stands on.
+            closed (bool): True if the tour has to end next to square 0.
+
+        Returns:
+            bool: True if no tour can visit all the unvisited squares.
+        """
+
+        free = self.full & ~mask
+        entries = self.neighbors[square]
+        ends = 0
+        rest = free
+        while rest:
+            lowest = rest & -rest
+            rest ^= lowest
+            unvisited = lowest.bit_length() - 1
+            moves = (self.neighbors[unvisited] & free).bit_count() + (entries >> unvisited & 1)
+            if closed:
+                moves += self.neighbors[0] >> unvisited & 1
+                if moves < 2:
+                    return True
+            elif moves == 0:
+                return True
+            elif moves == 1:
+                ends += 1
+                if ends > 1:
+                    return True
+        return False
+
+    def start_classes(self):
+        """
+        Groups the start squares into symmetry classes.
+
+        Returns:
+            list[tuple[int, int]]: A representative square of every class and the size of the class. Without symmetry every square is its own class.
+        """
+
+        if not self.symmetry:
+            return [(square, 1) for square in range(self.squares)]
+
+        classes = {}
+        for square in range(self.squares):
+            representative = min(permutation[square] for permutation in self.permutations)
+            classes[representative] = classes.get(representative, 0) + 1
+        return sorted(classes.items())
+
+    def completions(self, mask, square):
+        """
+        Counts the ways to visit every unvisited square, starting from square.
+
+        Args:
+            mask (int): The visited squares as a bitmask, including square.
+            square (int): The square the knight stands on.
+
+        Returns:
+            int: The number of paths that complete the tour.
+        """
+
+        if mask == self.full:
+            return 1
+
+        key = self.key(mask, square)
+        answer = self.lookup("open", key)
+        if answer is not None:
+            return answer
+
+        answer = 0
+        if not self.stranded(mask, square):
+            for neighbor in self.table[square]:
+                if not mask >> neighbor & 1:
+                    answer += self.completions(mask | 1 << neighbor, neighbor)
+        self.store("open", key, answer)
+        return answer
+
+    def open_tours(self):
+        """
+        Counts the directed open knight's tours, so a tour and its reverse are counted separately and closed tours are included.
+
+        Returns:
+            int: The number of tours.
+        """
+
+        return sum(size * self.completions(1 << square, square) for square, size in self.start_classes())
+
+    def cycle_completions(self, mask, square):
+        """
+        Counts the ways to visit every unvisited square, starting from square and ending a knight move away from square 0.
+
+        Args:
+            mask (int): The visited squares as a bitmask, including square 0 and square.
+            square (int): The square the knight stands on.
+
+        Returns:
+            int: The number of paths that complete a closed tour.
+        """
+
+        if mask == self.full:
+            return self.neighbors[0] >> square & 1
+
+        key = self.key(mask, square, self.closed_maps)
+        answer = self.lookup("closed", key)
+        if answer is not None:
+            return answer
+
+        answer = 0
+        if not self.stranded(mask, square, True):
+            for neighbor in self.table[square]:
+                if not mask >> neighbor & 1:
+                    answer += self.cycle_completions(mask | 1 << neighbor, neighbor)
+        self.store("closed", key, answer)
+        return answer
+
+    def closed_tours(self):
+        """
+        Counts the closed knight's tours, as undirected cycles without a start square.
+
+        Every cycle passes through square 0, so the cycles are the paths from square 0 over the whole board that end a knight move away from it, halved
+        because each cycle is found in both directions. Positions are only reduced under the symmetries that keep square 0 in place.
+
+        Returns:
+            int: The number of closed tours.
+        """
+
+        if (self.squares % 2 == 1 and self.piece.color_changing) or self.squares < 2:
+            # A knight changes color on every move, so a closed tour needs as many squares of each color.
+            return 0
+
+        return self.cycle_completions(1, 0) // 2
+
+    def extensions(self, mask, square):
+        """
+        Counts the self-avoiding paths that start at square and avoid the visited squares, by length.
+
+        Args:
+            mask (int): The visited squares as a bitmask, including square.
+            square (int): The square the knight stands on.
+
+        Returns:
+            tuple[int]: Entry k is the number of paths that visit k more squares, starting with the path that stays on square.
+        """
+
+        key = self.key(mask, square)
+        answer = self.lookup("paths", key)
+        if answer is not None:
+            return answer
+
+        counts = [1]
+        for neighbor in self.table[square]:
+            if not mask >> neighbor & 1:
+                for length, paths in enumerate(self.extensions(mask | 1 << neighbor, neighbor), 1):
+                    if length == len(counts):
+                        counts.append(paths)
+                    else:
+                        counts[length] += paths
+        answer = tuple(counts)
+        self.store("paths", key, answer)
+        return answer
+
+    def path_counts(self):
+        """
+        Counts the directed self-avoiding knight paths of every length.
+
+        Returns:
+            list[int]: Entry k is the number of paths that visit k squares. Entry 1 counts the single squares and the last entry the open tours.
+        """
+
+        counts = [0] * (self.squares + 1)
+        for square, size in self.start_classes():
+            for length, paths in enumerate(self.extensions(1 << square, square), 1):
+                counts[length] += size * paths
+        return counts
+
+    def walk_outcomes(self, mask, square):
+        """
+        Works out where a random walk that picks each unvisited neighbor with equal probability ends.
+
+        Args:
+            mask (int): The visited squares as a bitmask, including square.
+            square (int): The square the knight stands on.
+
+        Returns:
+            dict[int, Fraction]: The probability of every number of further squares the walk visits before it gets stuck.
+        """
+
+        key = self.key(mask, square)
+        answer = self.lookup("walk", key)
+        if answer is not None:
+            return answer
+
+        neighbors = [neighbor for neighbor in self.table[square] if not mask >> neighbor & 1]
+        if len(neighbors) == 0:
+            answer = {0: Fraction(1)}
+        else:
+            answer = {}
+            for neighbor in neighbors:
+                for length, probability in self.walk_outcomes(mask | 1 << neighbor, neighbor).items():
+                    answer[length + 1] = answer.get(length + 1, 0) + probability / len(neighbors)
+        self.store("walk", key, answer)
+        return answer
+
+    def walk_distribution(self):
+        """
+        Works out the exact distribution of the number of squares visited by a random tour as KnightTour.random_tour plays it: a uniformly random start
+        square, then a uniformly random unvisited neighbor until the knight is stuck. This is the ground truth for the simulation's histogram.
+
+        Returns:
+            list[Fraction]: Entry k is the probability that the tour visits k squares.
+        """
+
+        distribution = [Fraction(0)] * (self.squares + 1)
+        for square, size in self.start_classes():
+            for length, probability in self.walk_outcomes(1 << square, square).items():
+                distribution[length + 1] += probability * size / self.squares
+        return distribution
+
+    def statistics(self):
+        """
+        Reports how well the transposition tables work and how much memory they hold.
+
+        Returns:
+            dict: The number of entries in total and per kind of query, hits, misses, evictions, the hit rate and an estimate of the tables' memory in bytes.
+        """
+
+        lookups = self.hits + self.misses
+        memory = 0
+        for memo in self.memos.values():
+            memory += sys.getsizeof(memo)
+            if memo:
+                key, answer = next(reversed(memo.items()))
+                entry = sys.getsizeof(key) + sys.getsizeof(answer)
+                if isinstance(answer, dict):
+                    entry += sum(sys.getsizeof(length) + sys.getsizeof(probability) for length, probability in answer.items())
+                # An OrderedDict entry also costs a hash table slot and a node of the linked list that keeps the order.
+                memory += len(memo) * (entry + 100)
+
+        return {
+            "entries": sum(len(memo) for memo in self.memos.values()),
+            "tables": {kind: len(memo) for kind, memo in self.memos.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory": memory,
+        }
@@ -0,0 +1,420 @@
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from move_table import KNIGHT_OFFSETS
+
+#Binary log of recorded tours. The file starts with a 16 byte header:
+#    magic b"KTLG", format version, flags (bit 0: a seed is stored), board size (uint16) and seed (int64).
+#Every tour is then stored as a record:
+#    start square (uint32), number of moves after the start (uint32) and one 3-bit move code per move, packed 8 codes to 3 bytes.
+#A move code is the index of the move in KNIGHT_OFFSETS. All numbers are little-endian.
+#The index file next to the log (path + ".idx") holds the byte offset of every record as uint64, so tour k can be found without reading the tours before it.
+
+MAGIC = b"KTLG"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHq")
+RECORD = struct.Struct("<II")
+CODES = {offset: code for code, offset in enumerate(KNIGHT_OFFSETS)}
+
+def pack_codes(codes):
+    """
+    Packs 3-bit move codes, 8 codes to 3 bytes.
+
+    Args:
+        codes (list[int]): The move codes, each between 0 and 7.
+
+    Returns:
+        bytes: The packed codes, padded with zero bits to a whole byte.
+    """
+
+    packed = bytearray()
+    for group in range(0, len(codes), 8):
+        value = 0
+        for shift, code in enumerate(codes[group:group + 8]):
+            value |= code << (3 * shift)
+        packed += value.to_bytes(3, "little")
+    return bytes(packed[:(3 * len(codes) + 7) // 8])
+
+def unpack_codes(data, count):
+    """
+    Unpacks move codes packed by pack_codes.
+
+    Args:
+        data (bytes | memoryview): The packed codes.
+        count (int): The number of codes.
+
+    Returns:
+        list[int]: The move codes.
+    """
+
+    codes = []
+    for group in range(0, count, 8):
+        start = group // 8 * 3
+        value = int.from_bytes(data[start:start + 3], "little")
+        for shift in range(min(8, count - group)):
+            codes.append(value >> (3 * shift) & 7)
+    return codes
+
+def encode_tour(squares, size):
+    """
+    Converts a tour to its start square and move codes.
+
+    Args:
+        squares (list[int]): The flat indices of the squares of the tour in order.
+        size (int): The size of the chessboard.
+
+    Returns:
+        tuple[int, list[int]]: The start square and the code of every move.
+    """
+
+    codes = []
+    for before, after in zip(squares, squares[1:]):
+        code = CODES.get((after % size - before % size, after // size - before // size))
+        if code is None:
+            raise ValueError(f"squares {before} and {after} are not a knight move apart")
+        codes.append(code)
+    return squares[0], codes
+
+def decode_tour(start, codes, size):
+    """
+    Converts a start square and move codes back to the squares of the tour.
+
+    Args:
+        start (int): The flat index of the start square.
+        codes (list[int]): The code of every move.
+        size (int): The size of the chessboard.
+
+    Returns:
+        list[int]: The flat indices of the squares of the tour in order.
+    """
+
+    x, y = start % size, start // size
+    squares = [start]
+    for code in codes:
+        dx, dy = KNIGHT_OFFSETS[code]
+        x += dx
+        y += dy
+        squares.append(y * size + x)
+    return squares
+
+def read_header(data):
+    """
+    Reads the header of a tour log.
+
+    Args:
+        data (bytes): At least the first HEADER.size bytes of the log.
+
+    Returns:
+        tuple[int, int | None]: The board size and the seed, or None if no seed was stored.
+    """
+
+    if len(data) < HEADER.size:
+        raise ValueError("not a tour log: the file is too short")
+    magic, version, flags, size, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a tour log: wrong magic number")
+    if version != VERSION:
+        raise ValueError(f"unsupported tour log version {version}")
+    return size, seed if flags & 1 else None
+
+def scan_offsets(data):
+    """
+    Finds the offset of every complete record by walking the record headers.
+
+    Args:
+        data (bytes | mmap.mmap): The whole log.
+
+    Returns:
+        tuple[array.array, int]: The record offsets and the offset where the last complete record ends.
+    """
+
+    offsets = array("Q")
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        start, moves = RECORD.unpack_from(data, offset)
+        end = offset + RECORD.size + (3 * moves + 7) // 8
+        if end > len(data):
+            break
+        offsets.append(offset)
+        offset = end
+    return offsets, offset
+
+def load_offsets(path, data):
+    """
+    Reads the index file of a log, or rebuilds the index by scanning the log if the index file is missing or does not match the log.
+
+    Args:
+        path (str): The log file.
+        data (bytes | mmap.mmap): The whole log.
+
+    Returns:
+        tuple[array.array, int]: The record offsets and the offset where the last complete record ends.
+    """
+
+    index_path = path + ".idx"
+    if os.path.exists(index_path):
+        offsets = array("Q")
+        with open(index_path, "rb") as file:
+            index = file.read()
+        offsets.frombytes(index[:len(index) // offsets.itemsize * offsets.itemsize])
+
+        end = HEADER.size
+        if len(offsets) > 0:
+            last = offsets[-1]
+            end = None
+            if last + RECORD.size <= len(data):
+                end = last + RECORD.size + (3 * RECORD.unpack_from(data, last)[1] + 7) // 8
+        # The index can only be trusted if it ends exactly where the log ends.
+        if end == len(data):
+            return offsets, end
+
+    return scan_offsets(data)
+
+class TourLogWriter:
+    """
+    Appends tours to a tour log and its index.
+
+    Opening an existing log continues it: the board size and seed have to match the header, and a record cut off by a crash is dropped.
+
+    Attributes:
+        path (str): The log file.
+        size (int): The size of the chessboard.
+        seed (int | None): The seed stored in the header.
+        count (int): The number of tours in the log.
+        offset (int): The byte offset the next record is written at.
+    """
+
+    def __init__(self, path, size, seed=None, buffer_size=1 << 20):
+        """
+        Opens a log for appending, creating it if it does not exist.
+
+        Args:
+            path (str): The log file.
+            size (int): The size of the chessboard.
+            seed (int): The seed of the simulation that produced the tours, stored in the header.
+            buffer_size (int): The size of the write buffer in bytes.
+        """
+
+        self.path = path
+        self.size = size
+        self.seed = seed
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                logged_size, logged_seed = read_header(data)
+                if logged_size != size:
+                    raise ValueError(f"the tour log is for a {logged_size}x{logged_size} board, not {size}x{size}")
+                if logged_seed != seed:
+                    raise ValueError(f"the tour log was recorded with seed {logged_seed}, not {seed}")
+                offsets, end = load_offsets(path, data)
+            self.count = len(offsets)
+            self.offset = end
+            with open(path, "r+b") as file:
+                file.truncate(end)
+            with open(path + ".idx", "wb") as file:
+                offsets.tofile(file)
+        else:
+            with open(path, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION, 0 if seed is None else 1, size, 0 if seed is None else seed))
+            open(path + ".idx", "wb").close()
+            self.count = 0
+            self.offset = HEADER.size
+
+        self.file = open(path, "ab", buffering=buffer_size)
+        self.index = open(path + ".idx", "ab", buffering=buffer_size)
+
+    def add(self, squares):
+        """
+        Appends a tour.
+
+        Args:
+            squares (list[int]): The flat indices of the squares of the tour in order.
+        """
+
+        start, codes = encode_tour(squares, self.size)
+        self.add_codes(start, codes)
+
+    def add_codes(self, start, codes):
+        """
+        Appends a tour that is already encoded as a start square and move codes.
+
+        Args:
+            start (int): The flat index of the start square.
+            codes (list[int]): The code of every move.
+        """
+
+        record = RECORD.pack(start, len(codes)) + pack_codes(codes)
+        self.file.write(record)
+        self.index.write(struct.pack("<Q", self.offset))
+        self.offset += len(record)
+        self.count += 1
+
+    def truncate(self, count):
+        """
+        Drops the tours after the first count, for example the tours of an interrupted chunk that a resumed simulation runs again.
+
+        Args:
+            count (int): The number of tours to keep.
+        """
+
+        if count > self.count:
+            raise ValueError(f"cannot keep {count} tours, the tour log only holds {self.count}")
+        if count == self.count:
+            return
+
+        self.flush()
+        if count == 0:
+            offset = HEADER.size
+        else:
+            with open(self.path + ".idx", "rb") as file:
+                file.seek(count * 8)
+                offset = struct.unpack("<Q", file.read(8))[0]
+        self.file.truncate(offset)
+        self.index.truncate(count * 8)
+        self.count = count
+        self.offset = offset
+
+    def flush(self):
+        """
+        Writes the buffered tours to the log and its index.
+        """
+
+        self.file.flush()
+        self.index.flush()
+
+    def close(self):
+        """
+        Flushes and closes the log and its index.
+        """
+
+        self.file.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+class TourLogReader:
+    """
+    Reads a tour log through a memory map, so tours can be read in any order without loading the file.
+
+    Attributes:
+        path (str): The log file.
+        size (int): The size of the chessboard.
+        seed (int | None): The seed stored in the header.
+        offsets (array.array): The byte offset of every record.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a log for reading.
+
+        Args:
+            path (str): The log file.
+        """
+
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size, self.seed = read_header(self.data)
+        self.offsets, end = load_offsets(path, self.data)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record(self, k):
+        """
+        Reads the encoded form of tour k.
+
+        Args:
+            k (int): The number of the tour, negative numbers count from the end.
+
+        Returns:
+            tuple[int, list[int]]: The start square and the code of every move.
+        """
+
+        offset = self.offsets[k]
+        start, moves = RECORD.unpack_from(self.data, offset)
+        offset += RECORD.size
+        return start, unpack_codes(self.data[offset:offset + (3 * moves + 7) // 8], moves)
+
+    def __getitem__(self, k):
+        """
+        Reads tour k.
+
+        Args:
+            k (int): The number of the tour, negative numbers count from the end.
+
+        Returns:
+            list[int]: The flat indices of the squares of the tour in order.
+        """
+
+        start, codes = self.record(k)
+        return decode_tour(start, codes, self.size)
+
+    def __iter__(self):
+        for k in range(len(self.offsets)):
+            yield self[k]
+
+    def lengths(self):
+        """
+        Reads the number of squares of every tour from the record headers, without decoding any moves.
+
+        Yields:
+            int: The number of squares visited by each tour.
+        """
+
+        for offset in self.offsets:
+            yield RECORD.unpack_from(self.data, offset)[1] + 1
+
+    def close(self):
+        """
+        Closes the memory map and the file.
+        """
+
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+def main(arguments=None):
+    """
+    Prints a summary of a tour log, or replays one of its tours in a window.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="tour_log", description="Inspects a tour log written by a simulation.")
+    parser.add_argument("path", help="the tour log")
+    parser.add_argument("--replay", type=int, default=None, metavar="K", help="replay tour K in a window")
+    parser.add_argument("--rate", type=float, default=5.0, help="moves per second of the replay")
+    options = parser.parse_args(arguments)
+
+    with TourLogReader(options.path) as log:
+        if options.replay is None:
+            lengths = list(log.lengths())
+            mean = sum(lengths) / len(lengths) if lengths else 0.0
+            print(f"{options.path}: {len(log)} tours on a {log.size}x{log.size} board, seed {log.seed}, mean length {mean:.2f}, "
+                  f"{os.path.getsize(options.path) / max(1, len(log)):.1f} bytes per tour")
+            return
+        size = log.size
+        tour = log[options.replay]
+
+    from chessboard import Chessboard
+    from user_interaction import UserInteraction
+
+    ui = UserInteraction(Chessboard(size))
+    if ui.replay(tour, options.rate):
+        ui.display_board()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import threading
+import time
+from move_table import KNIGHT, leaper_moves
+
+class SearchResult:
+    """
+    The outcome of a TourSearch.
+
+    Attributes:
+        status (str): "found" if a tour was found, "exhausted" if the whole search space was searched without finding one,
+            "node_limit" or "time_limit" if the search ran out of budget and "cancelled" if it was cancelled.
+        tour (list[int] | None): The flat square indices of the tour in visiting order, starting with the start square, or None.
+        nodes (int): The number of search nodes (squares entered) that were visited.
+        elapsed (float): The search time in seconds.
+    """
+
+    def __init__(self, status, tour, nodes, elapsed):
+        """
+        Initializes the result.
+
+        Args:
+            status (str): The outcome of the search.
+            tour (list[int] | None): The tour that was found, if any.
+            nodes (int): The number of search nodes visited.
+            elapsed (float): The search time in seconds.
+        """
+
+        self.status = status
+        self.tour = tour
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    @property
+    def nodes_per_second(self):
+        """
+        float: The search speed in nodes per second.
+        """
+
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return f"SearchResult(status={self.status!r}, nodes={self.nodes}, elapsed={self.elapsed:.3f}, nodes_per_second={self.nodes_per_second:.0f})"
+
+class TourSearch:
+    """
+    An exact depth-first search for a tour of a knight, or another leaper, that visits every remaining square of a chessboard.
+
+    The search is iterative, so it is not limited by Python's recursion limit. Moves are tried in Warnsdorff order (fewest onward moves first)
+    and a branch is pruned as soon as an unvisited square can no longer be reached, or when more than one unvisited square has become a dead end
+    that could only be the last square of the tour.
+
+    Squares that are already marked on the chessboard are treated as visited, so the search can continue a tour that is in progress.
+
+    Attributes:
+        chessboard (Chessboard): The board to search on.
+        start (int): The flat index of the square the piece starts on.
+        closed (bool): If True, only tours whose last square is a move away from the start are accepted.
+        end (int | None): If given, the flat index of the square the tour has to end on.
+        node_limit (int | None): The maximum number of nodes to visit.
+        time_limit (float | None): The maximum search time in seconds.
+        piece (Leaper): The piece that tours the board.
+    """
+
+    def __init__(self, chessboard, start, closed=False, end=None, node_limit=None, time_limit=None, piece=KNIGHT):
+        """
+        Initializes the search.
+
+        Args:
+            chessboard (Chessboard): The board to search on.
+            start (int): The flat index of the starting square.
+            closed (bool): If True, only closed tours are accepted.
+            end (int | None): The flat index of the square the tour has to end on.
+            node_limit (int | None): The maximum number of nodes to visit.
+            time_limit (float | None): The maximum search time in seconds.
+            piece (Leaper): The piece that tours the board.
+        """
+
+        self.chessboard = chessboard
+        self.start = start
+        self.closed = closed
+        self.end = end
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.piece = piece
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """
+        Asks a running search to stop. It is safe to call from another thread.
+        """
+
+        self.cancelled.set()
+
+    def run(self):
+        """
+        Runs the search.
+
+        Returns:
+            SearchResult: The outcome of the search.
+        """
+
+        width = self.chessboard.width
+        squares = self.chessboard.squares
+        table = leaper_moves(self.piece, width, self.chessboard.height)
+        start = self.start
+        center_x = width - 1
+        center_y = self.chessboard.height - 1
+        started = time.perf_counter()
+
+        # A closed tour is searched for as a path that ends by stepping back onto the start square, so the start square stays unvisited
+        # and acts as the fixed last square. With an explicit end square, the end just has to be a move away from the start.
+        cycle = self.closed and self.end is None
+        end = start if cycle else self.end
+        if self.closed and not cycle and start not in table[end]:
+            return SearchResult("exhausted", None, 0, time.perf_counter() - started)
+
+        visited = bytearray(squares)
+        for square in range(squares):
+            if self.chessboard.is_visited(square):
+                visited[square] = 1
+        visited[start] = 0 if cycle else 1
+        remaining = squares - sum(visited)
+
+        # A color-changing piece such as the knight alternates colors, so after the start square the unvisited squares have to split evenly
+        # between the two colors, with at most one extra square of the other color, and that color decides which color the last square has.
+        def color(square):
+            return (square % width + square // width) % 2
+
+        if self.piece.color_changing:
+            same = sum(1 for square in range(squares) if not visited[square] and color(square) == color(start))
+            other = remaining - same
+            if other - same not in ((0,) if cycle else (0, 1)) or (end is not None and not cycle and color(end) != (color(start) + remaining) % 2):
+                return SearchResult("exhausted", None, 0, time.perf_counter() - started)
+
+        # degree[square] is the number of unvisited neighbors. low and zero count the unvisited squares with at most one and no unvisited neighbors.
+        degree = bytearray(squares)
+        low = 0
+        zero = 0
+        for square in range(squares):
+            degree[square] = sum(1 for neighbor in table[square] if not visited[neighbor])
+            if not visited[square]:
+                if degree[square] <= 1:
+                    low += 1
+                if degree[square] == 0:
+                    zero += 1
+
+        def distance(square):
+            return (2 * (square % width) - center_x) ** 2 + (2 * (square // width) - center_y) ** 2
+
+        def ordered_moves(square):
+            moves = [neighbor for neighbor in table[square] if not visited[neighbor] and (neighbor != end or remaining == 1)]
+            moves.sort(key=lambda neighbor: (degree[neighbor], -distance(neighbor)))
+            return moves
+
+        deadline = started + self.time_limit if self.time_limit is not None else None
+        nodes = 1
+        path = [start]
+        stack = [[start, ordered_moves(start), 0]]
+
+        while stack:
+            if nodes & 1023 == 0:
+                if self.cancelled.is_set():
+                    return SearchResult("cancelled", None, nodes, time.perf_counter() - started)
+                if deadline is not None and time.perf_counter() > deadline:
+                    return SearchResult("time_limit", None, nodes, time.perf_counter() - started)
+
+            frame = stack[-1]
+            square, moves, index = frame
+
+            if index == len(moves):
+                # Every move from this square has been tried, so undo it and backtrack.
+                stack.pop()
+                path.pop()
+                if not stack:
+                    break
+                for neighbor in table[square]:
+                    degree[neighbor] += 1
+                    if not visited[neighbor]:
+                        if degree[neighbor] == 2:
+                            low -= 1
+                        elif degree[neighbor] == 1:
+                            zero -= 1
+                visited[square] = 0
+                remaining += 1
+                if degree[square] <= 1:
+                    low += 1
+                if degree[square] == 0:
+                    zero += 1
+                continue
+
+            frame[2] = index + 1
+            square = moves[index]
+            if self.node_limit is not None and nodes >= self.node_limit:
+                return SearchResult("node_limit", None, nodes, time.perf_counter() - started)
+            nodes += 1
+
+            visited[square] = 1
+            remaining -= 1
+            if degree[square] <= 1:
+                low -= 1
+            if degree[square] == 0:
+                zero -= 1
+            near_low = 0
+            near_zero = 0
+            for neighbor in table[square]:
+                degree[neighbor] -= 1
+                if not visited[neighbor]:
+                    if degree[neighbor] == 1:
+                        low += 1
+                    elif degree[neighbor] == 0:
+                        zero += 1
+                        near_zero += 1
+                    if degree[neighbor] <= 1:
+                        near_low += 1
+            path.append(square)
+            stack.append([square, [], 0])
+
+            if remaining == 0:
+                if end is None or square == end:
+                    tour = path[:-1] if cycle else list(path)
+                    return SearchResult("found", tour, nodes, time.perf_counter() - started)
+                continue
+
+            # An unvisited square without unvisited neighbors can only be reached now, as the final square.
+            if zero > near_zero or (near_zero > 0 and remaining > 1):
+                continue
+            # A square with one unvisited neighbor that is not next to the piece has to be the last square of the tour.
+            dead_ends = low - near_low
+            if end is not None and not visited[end] and degree[end] <= 1 and end not in table[square]:
+                dead_ends -= 1
+                if dead_ends > 0:
+                    continue
+            elif dead_ends > 1 or (dead_ends == 1 and end is not None):
+                continue
+
+            stack[-1][1] = ordered_moves(square)
+
+        return SearchResult("exhausted", None, nodes, time.perf_counter() - started)
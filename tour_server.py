@@ -0,0 +1,790 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from move_table import parse_piece
+from tour_statistics import TourStatistics
+
+#A small HTTP/JSON service that runs simulations and solves tours for several users at once, e.g.
+#python -m tour_server --port 8765 --workers 4
+#curl -X POST localhost:8765/simulate -d '{"size": 8, "runs": 100000, "seed": 1, "wait": true}'
+#
+#Endpoints:
+#    POST   /simulate         {"size" | "width"/"height", "piece", "runs", "seed", "engine": "batch" | "loop", "wait"}
+#    POST   /solve            {"size" | "width"/"height", "piece", "start": [x, y], "method": "warnsdorff" | "search", "closed",
+#                              "node_limit", "time_limit", "wait"}
+#    POST   /validate         {"size" | "width"/"height", "piece", "tour": [[x, y], ...] or [index, ...], "closed"},
+#                              or "tours": [tour, ...] to check several
+#    GET    /jobs             every job the server remembers
+#    GET    /jobs/ID          the status, progress and result of a job
+#    GET    /jobs/ID/events   the progress of a job as a stream of JSON lines, until it ends
+#    DELETE /jobs/ID          cancels a job
+#    GET    /health           the queue, the workers and the cache
+#
+#Simulations and solves are jobs: they wait in a bounded queue and run on a process pool, and a full queue answers 503. A POST answers 202
+#with the job at once, or with "wait": true, 200 with the finished job. Results of seeded simulations and of solves are kept in an LRU cache
+#keyed by the parameters, so asking again answers at once, and a request for a job that is already queued or running joins that job.
+#The server only listens on localhost by default and has no authentication, so it is meant for a trusted machine or network.
+
+MAX_SIDE = 64
+MAX_RUNS = 10 ** 8
+MAX_TIME_LIMIT = 60.0
+
+class RequestError(Exception):
+    """
+    A request that cannot be served, answered with an HTTP error status and a JSON message.
+
+    Attributes:
+        status (int): The HTTP status code.
+        message (str): What was wrong.
+    """
+
+    def __init__(self, status, message):
+        """
+        Initializes the error.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): What was wrong.
+        """
+
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def is_integer(value):
+    """
+    Checks that a JSON value is an integer. JSON true and false are Python bools, which are ints too, so they are ruled out.
+
+    Args:
+        value: The value.
+
+    Returns:
+        bool: True if the value is an integer and not a bool.
+    """
+
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def is_square(value):
+    """
+    Checks that a JSON value is a square, a flat index or an [x, y] pair of integers.
+
+    Args:
+        value: The value.
+
+    Returns:
+        bool: True if the value is a square.
+    """
+
+    return is_integer(value) or isinstance(value, list) and len(value) == 2 and all(map(is_integer, value))
+
+def simulate_chunk(width, height, piece, runs, seed, engine):
+    """
+    Runs one chunk of a simulation job. This runs inside the worker processes.
+
+    Args:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece that tours the board.
+        runs (int): The number of tours.
+        seed (int | None): The seed of the chunk.
+        engine (str): "batch" or "loop".
+
+    Returns:
+        dict: The statistics of the chunk, from TourStatistics.to_dict.
+    """
+
+    from chessboard import Chessboard
+    from knight_tour import KnightTour
+
+    knight_tour = KnightTour(Chessboard(width, height), None, piece)
+    return knight_tour.run_simulation(runs, batch=engine == "batch", seed=seed, chunk_size=runs).to_dict()
+
+def solve(width, height, piece, start, method, closed, node_limit, time_limit):
+    """
+    Solves a tour. This runs inside the worker processes.
+
+    Args:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece that tours the board.
+        start (int): The flat index of the start square.
+        method (str): "warnsdorff" for Warnsdorff's rule or "search" for the exact TourSearch.
+        closed (bool): If True, the exact search only accepts closed tours.
+        node_limit (int | None): The most nodes the exact search may visit.
+        time_limit (float): The most seconds the exact search may run.
+
+    Returns:
+        dict: The status, the tour as flat square indices or None, the nodes searched and the time taken.
+    """
+
+    started = time.perf_counter()
+    if method == "warnsdorff":
+        from warnsdorff import warnsdorff_tour
+
+        tour = warnsdorff_tour(width, start % width, start // width, height=height, piece=piece)
+        return {"status": "found" if tour is not None else "not_found", "tour": tour, "nodes": None, "elapsed": time.perf_counter() - started}
+
+    from chessboard import Chessboard
+    from tour_search import TourSearch
+
+    result = TourSearch(Chessboard(width, height), start, closed, node_limit=node_limit, time_limit=time_limit, piece=piece).run()
+    return {"status": result.status, "tour": result.tour, "nodes": result.nodes, "elapsed": result.elapsed}
+
+def validate(width, height, piece, tours, closed):
+    """
+    Checks tours with the bulk validator and describes the first problem of each.
+
+    Args:
+        width (int): The width of the chessboard.
+        height (int): The height of the chessboard.
+        piece (Leaper): The piece whose moves are legal.
+        tours (list[list]): The tours, each the squares in order as [x, y] pairs or flat indices.
+        closed (bool): If True, the last square of a tour also has to be a move away from the first.
+
+    Returns:
+        list[dict]: For every tour, whether it is valid, a message describing the first problem found and its features.
+    """
+
+    from tour_validation import pad_tours, validate_tours
+
+    def index(square):
+        if is_integer(square):
+            return square if 0 <= square < width * height else width * height
+        x, y = square
+        return x + y * width if 0 <= x < width and 0 <= y < height else width * height
+
+    report = validate_tours(pad_tours([index(square) for square in tour] for tour in tours), width, height, piece, closed)
+    return [{"valid": bool(report.valid[k]), "message": report.problem(k), "crossings": int(report.crossings[k]),
+             "symmetries": int(report.symmetries[k]), "symmetry_class": f"{int(report.symmetry_class[k]):016x}"}
+            for k in range(len(report))]
+
+class Job:
+    """
+    A simulation or solve that was asked for, from the moment it is queued until it ends.
+
+    Every change bumps the version and wakes up the clients streaming the job's progress.
+
+    Attributes:
+        id (str): The id of the job.
+        kind (str): "simulate" or "solve".
+        parameters (dict): The normalized parameters of the job.
+        piece (Leaper): The piece of the job.
+        key (str | None): The cache key of the job, or None if its result is not cached.
+        status (str): "queued", "running", "done", "failed" or "cancelled".
+        progress (float): The share of the job that is done, from 0 to 1.
+        result (dict | None): The result of a finished job.
+        error (str | None): The error of a failed job.
+        created (float): When the job was queued, in seconds since the epoch.
+        started (float | None): When the job started running.
+        finished (float | None): When the job ended.
+        version (int): The number of changes of the job so far.
+    """
+
+    ENDED = ("done", "failed", "cancelled")
+
+    def __init__(self, id, kind, parameters, piece, key):
+        """
+        Initializes a queued job.
+
+        Args:
+            id (str): The id of the job.
+            kind (str): "simulate" or "solve".
+            parameters (dict): The normalized parameters of the job.
+            piece (Leaper): The piece of the job.
+            key (str | None): The cache key of the job.
+        """
+
+        self.id = id
+        self.kind = kind
+        self.parameters = parameters
+        self.piece = piece
+        self.key = key
+        self.status = "queued"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.version = 0
+        self.changed = asyncio.Condition()
+
+    @property
+    def ended(self):
+        """
+        bool: True once the job is done, has failed or was cancelled.
+        """
+
+        return self.status in self.ENDED
+
+    async def update(self, **changes):
+        """
+        Changes the job and wakes up everyone waiting for a change.
+
+        Args:
+            **changes: The attributes to set.
+        """
+
+        for name, value in changes.items():
+            setattr(self, name, value)
+        if self.ended and self.finished is None:
+            self.finished = time.time()
+        async with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    async def wait(self, version):
+        """
+        Waits until the job has changed since a version, or has ended.
+
+        Args:
+            version (int): The version last seen.
+        """
+
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.version != version or self.ended)
+
+    def to_dict(self, result=True):
+        """
+        Describes the job as JSON.
+
+        Args:
+            result (bool): If False, the result is left out, as in job listings.
+
+        Returns:
+            dict: The job.
+        """
+
+        data = {"id": self.id, "kind": self.kind, "parameters": self.parameters, "status": self.status, "progress": self.progress,
+                "error": self.error, "created": self.created, "started": self.started, "finished": self.finished}
+        if result:
+            data["result"] = self.result
+        return data
+
+class TourServer:
+    """
+    The HTTP/JSON service: parses requests, queues jobs, runs them on a process pool and caches their results.
+
+    A fixed number of dispatcher tasks, one per worker process, take jobs from the queue. A simulation runs as a sequence of chunks, so its
+    progress can be reported and a cancelled simulation stops after the current chunk. A running solve cannot be interrupted inside its
+    worker process, so cancelling it only drops its result, and its time limit bounds how long it can keep a worker busy.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on, the actual one once it is started with port 0.
+        workers (int): The number of worker processes and dispatchers.
+        chunk_size (int): The number of tours per chunk of a simulation.
+        queue (asyncio.Queue): The jobs waiting for a dispatcher.
+        jobs (OrderedDict[str, Job]): The jobs the server remembers, by id, up to job_history of the ended ones.
+        cache (OrderedDict[str, dict]): The LRU cache of results by key.
+        cache_size (int): The most results to cache.
+        hits (int): The requests answered from the cache.
+        misses (int): The cacheable requests that had to run.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, workers=None, queue_size=64, cache_size=256, chunk_size=50000, job_history=1000):
+        """
+        Initializes the server. Nothing runs until start is called.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+            workers (int): The number of worker processes, defaults to the number of CPUs.
+            queue_size (int): The most jobs that may wait in the queue.
+            cache_size (int): The most results to cache.
+            chunk_size (int): The number of tours per chunk of a simulation.
+            job_history (int): The most ended jobs to remember.
+        """
+
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.cache_size = cache_size
+        self.chunk_size = chunk_size
+        self.job_history = job_history
+        self.queue = None
+        self.jobs = OrderedDict()
+        self.active = {}
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.ids = itertools.count(1)
+        self.executor = None
+        self.server = None
+        self.dispatchers = []
+
+    async def start(self):
+        """
+        Starts the worker processes, the dispatchers and listening for connections.
+        """
+
+        self.queue = asyncio.Queue(self.queue_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for worker in range(self.workers)]
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops listening, cancels the dispatchers and shuts the worker processes down.
+        """
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def serve_forever(self):
+        """
+        Runs the server until it is interrupted.
+        """
+
+        await self.start()
+        print(f"tour_server listening on http://{self.host}:{self.port} with {self.workers} workers", flush=True)
+        # Stopping the server with SIGTERM shuts the worker processes down too, instead of leaving them behind.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.server.close)
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.stop()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves one request per connection.
+
+        Args:
+            reader (asyncio.StreamReader): The request.
+            writer (asyncio.StreamWriter): The response.
+        """
+
+        try:
+            try:
+                method, path, query, body = await self.read_request(reader)
+                await self.route(method, path, query, body, writer)
+            except RequestError as error:
+                await self.respond(writer, error.status, {"error": error.message})
+            except Exception as error:
+                await self.respond(writer, 500, {"error": f"{type(error).__name__}: {error}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client went away, there is no one left to answer.
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """
+        Reads the request line, the headers and the JSON body of a request.
+
+        Args:
+            reader (asyncio.StreamReader): The connection.
+
+        Returns:
+            tuple[str, str, dict, dict]: The method, the path, the query parameters and the body.
+        """
+
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise RequestError(400, "malformed request line")
+        method, target, version = request_line
+
+        length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                value = value.strip()
+                if not value.isdigit():
+                    raise RequestError(400, "Content-Length has to be a non-negative integer")
+                length = int(value)
+        if length > 1 << 24:
+            raise RequestError(413, "request body too large")
+
+        body = {}
+        if length:
+            try:
+                data = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                raise RequestError(400, "the body is shorter than Content-Length") from None
+            try:
+                body = json.loads(data)
+            except ValueError:
+                raise RequestError(400, "the body is not valid JSON") from None
+            if not isinstance(body, dict):
+                raise RequestError(400, "the body has to be a JSON object")
+
+        url = urlsplit(target)
+        return method, url.path.rstrip("/") or "/", {name: values[-1] for name, values in parse_qs(url.query).items()}, body
+
+    async def respond(self, writer, status, data):
+        """
+        Writes a complete JSON response.
+
+        Args:
+            writer (asyncio.StreamWriter): The connection.
+            status (int): The HTTP status code.
+            data (dict | list): The body.
+        """
+
+        body = json.dumps(data).encode()
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                   500: "Internal Server Error", 503: "Service Unavailable"}
+        writer.write(f"HTTP/1.1 {status} {reasons.get(status, '')}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def route(self, method, path, query, body, writer):
+        """
+        Answers a request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path, without a trailing slash.
+            query (dict[str, str]): The query parameters.
+            body (dict): The JSON body.
+            writer (asyncio.StreamWriter): The connection.
+        """
+
+        parts = path.strip("/").split("/")
+        if path in ("/simulate", "/solve"):
+            if method != "POST":
+                raise RequestError(405, f"{path} needs POST")
+            await self.submit(parts[0], body, writer)
+        elif path == "/validate":
+            if method != "POST":
+                raise RequestError(405, f"{path} needs POST")
+            width, height, piece = self.board(body)
+            tours = body["tours"] if "tours" in body else [body.get("tour")]
+            if not isinstance(tours, list) or not all(isinstance(tour, list) and all(map(is_square, tour)) for tour in tours):
+                raise RequestError(400, "tour has to be a list of [x, y] pairs or square indices, and tours a list of them")
+            # Validation runs on the process pool, as its first call on a board builds tables that would stall every other client.
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, validate, width, height, piece, tours,
+                                                                       bool(body.get("closed", False)))
+            if "tours" in body:
+                await self.respond(writer, 200, {"tours": results, "valid": sum(result["valid"] for result in results)})
+            else:
+                await self.respond(writer, 200, results[0])
+        elif path == "/health":
+            await self.respond(writer, 200, self.health())
+        elif path == "/jobs" and method == "GET":
+            await self.respond(writer, 200, [job.to_dict(result=False) for job in self.jobs.values()])
+        elif parts[0] == "jobs" and len(parts) in (2, 3):
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise RequestError(404, f"no job {parts[1]}")
+            if len(parts) == 3 and parts[2] == "events" and method == "GET":
+                await self.stream(job, writer)
+            elif len(parts) == 2 and method == "GET":
+                await self.respond(writer, 200, job.to_dict())
+            elif len(parts) == 2 and method == "DELETE":
+                await self.cancel(job)
+                await self.respond(writer, 200, job.to_dict())
+            else:
+                raise RequestError(405, f"{method} {path} is not supported")
+        else:
+            raise RequestError(404, f"no endpoint {method} {path}")
+
+    def board(self, body):
+        """
+        Reads and checks the board and the piece of a request.
+
+        Args:
+            body (dict): The JSON body.
+
+        Returns:
+            tuple[int, int, Leaper]: The width, the height and the piece.
+        """
+
+        size = body.get("size", 8)
+        width = body.get("width", size)
+        height = body.get("height", size)
+        for name, value in (("width", width), ("height", height)):
+            if not is_integer(value) or not 1 <= value <= MAX_SIDE:
+                raise RequestError(400, f"{name} has to be an integer from 1 to {MAX_SIDE}")
+        try:
+            piece = parse_piece(str(body.get("piece", "knight")))
+        except ValueError as error:
+            raise RequestError(400, str(error)) from None
+        return width, height, piece
+
+    def parameters(self, kind, body):
+        """
+        Reads and checks the parameters of a job, filling in the defaults.
+
+        Args:
+            kind (str): "simulate" or "solve".
+            body (dict): The JSON body.
+
+        Returns:
+            tuple[dict, Leaper]: The normalized parameters and the piece.
+        """
+
+        width, height, piece = self.board(body)
+        parameters = {"width": width, "height": height, "piece": [list(offset) for offset in piece.offsets]}
+        if kind == "simulate":
+            runs = body.get("runs", 1000)
+            seed = body.get("seed")
+            engine = body.get("engine", "batch")
+            if not is_integer(runs) or not 1 <= runs <= MAX_RUNS:
+                raise RequestError(400, f"runs has to be an integer from 1 to {MAX_RUNS}")
+            if seed is not None and not is_integer(seed):
+                raise RequestError(400, "seed has to be an integer or null")
+            if engine not in ("batch", "loop"):
+                raise RequestError(400, "engine has to be batch or loop")
+            parameters.update(runs=runs, seed=seed, engine=engine)
+        else:
+            start = body.get("start", [0, 0])
+            method = body.get("method", "warnsdorff")
+            node_limit = body.get("node_limit")
+            time_limit = body.get("time_limit", 10.0)
+            if not (isinstance(start, list) and len(start) == 2 and all(is_integer(value) for value in start)
+                    and 0 <= start[0] < width and 0 <= start[1] < height):
+                raise RequestError(400, "start has to be an [x, y] square on the board")
+            if method not in ("warnsdorff", "search"):
+                raise RequestError(400, "method has to be warnsdorff or search")
+            if node_limit is not None and (not is_integer(node_limit) or node_limit < 1):
+                raise RequestError(400, "node_limit has to be a positive integer or null")
+            if (isinstance(time_limit, bool) or not isinstance(time_limit, (int, float))
+                    or not 0 < time_limit <= MAX_TIME_LIMIT):
+                raise RequestError(400, f"time_limit has to be a number of seconds up to {MAX_TIME_LIMIT}")
+            parameters.update(start=start, method=method, closed=bool(body.get("closed", False)), node_limit=node_limit, time_limit=time_limit)
+        return parameters, piece
+
+    async def submit(self, kind, body, writer):
+        """
+        Answers a simulate or solve request from the cache, by joining a job with the same parameters, or by queuing a new job.
+
+        Args:
+            kind (str): "simulate" or "solve".
+            body (dict): The JSON body.
+            writer (asyncio.StreamWriter): The connection.
+        """
+
+        parameters, piece = self.parameters(kind, body)
+        # Unseeded simulations draw different tours every time, so only seeded ones are cached. Solves are deterministic, except those that
+        # hit their time limit, which run_solve keeps out of the cache.
+        cacheable = kind == "solve" or parameters["seed"] is not None
+        key = json.dumps([kind, parameters], sort_keys=True) if cacheable else None
+
+        if key is not None and key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            job = self.add_job(kind, parameters, piece, None)
+            job.status = "done"
+            job.progress = 1.0
+            job.result = dict(self.cache[key], cached=True)
+            job.started = job.finished = job.created
+            await self.respond(writer, 200, job.to_dict())
+            return
+
+        job = self.active.get(key) if key is not None else None
+        if job is None:
+            if self.queue.full():
+                raise RequestError(503, f"the job queue is full ({self.queue_size} jobs), try again later")
+            if key is not None:
+                self.misses += 1
+            job = self.add_job(kind, parameters, piece, key)
+            if key is not None:
+                self.active[key] = job
+            self.queue.put_nowait(job)
+
+        if body.get("wait"):
+            while not job.ended:
+                await job.wait(job.version)
+            await self.respond(writer, 200, job.to_dict())
+        else:
+            await self.respond(writer, 202, job.to_dict())
+
+    def add_job(self, kind, parameters, piece, key):
+        """
+        Creates a job and remembers it, forgetting the oldest ended jobs beyond the history limit.
+
+        Args:
+            kind (str): "simulate" or "solve".
+            parameters (dict): The normalized parameters.
+            piece (Leaper): The piece of the job.
+            key (str | None): The cache key.
+
+        Returns:
+            Job: The job.
+        """
+
+        job = Job(str(next(self.ids)), kind, parameters, piece, key)
+        self.jobs[job.id] = job
+        ended = [id for id, old in self.jobs.items() if old.ended]
+        for id in ended[:max(0, len(ended) - self.job_history)]:
+            del self.jobs[id]
+        return job
+
+    async def cancel(self, job):
+        """
+        Cancels a job. A queued job never runs, a running simulation stops after its current chunk and a running solve has its result dropped.
+
+        Args:
+            job (Job): The job to cancel.
+        """
+
+        if not job.ended:
+            self.release(job)
+            await job.update(status="cancelled")
+
+    def release(self, job):
+        """
+        Stops new requests from joining a job, once it has ended or is about to.
+
+        Args:
+            job (Job): The job.
+        """
+
+        if job.key is not None and self.active.get(job.key) is job:
+            del self.active[job.key]
+
+    async def dispatch(self):
+        """
+        Takes jobs from the queue and runs them, one at a time, for as long as the server runs.
+        """
+
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.ended:
+                    continue
+                await job.update(status="running", started=time.time())
+                if job.kind == "simulate":
+                    result = await self.run_simulation(job)
+                else:
+                    result = await self.run_solve(job)
+                if job.ended:
+                    continue
+                if job.key is not None:
+                    self.cache[job.key] = result
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+                await job.update(status="done", progress=1.0, result=result)
+            except Exception as error:
+                if not job.ended:
+                    await job.update(status="failed", error=f"{type(error).__name__}: {error}")
+            finally:
+                self.release(job)
+                self.queue.task_done()
+
+    async def run_simulation(self, job):
+        """
+        Runs a simulation job chunk by chunk on the process pool. The chunks get their seeds from the master seed and the runs done so far,
+        like the chunks of KnightTour.run_simulation.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            dict | None: The statistics summary and histogram, or None if the job was cancelled.
+        """
+
+        parameters = job.parameters
+        loop = asyncio.get_running_loop()
+        statistics = TourStatistics(parameters["width"] * parameters["height"])
+        started = time.perf_counter()
+        while statistics.count < parameters["runs"]:
+            runs = min(self.chunk_size, parameters["runs"] - statistics.count)
+            seed = None if parameters["seed"] is None else random.Random(f"{parameters['seed']}:{statistics.count}").getrandbits(64)
+            chunk = await loop.run_in_executor(self.executor, simulate_chunk, parameters["width"], parameters["height"], job.piece, runs, seed,
+                                               parameters["engine"])
+            if job.ended:
+                return None
+            statistics.merge(TourStatistics.from_dict(chunk))
+            await job.update(progress=statistics.count / parameters["runs"])
+        return {"statistics": statistics.summary(), "histogram": statistics.histogram, "elapsed": time.perf_counter() - started}
+
+    async def run_solve(self, job):
+        """
+        Runs a solve job on the process pool.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            dict: The outcome of the solve.
+        """
+
+        parameters = job.parameters
+        x, y = parameters["start"]
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor, solve, parameters["width"], parameters["height"], job.piece, y * parameters["width"] + x, parameters["method"],
+            parameters["closed"], parameters["node_limit"], parameters["time_limit"])
+        if result["status"] in ("time_limit", "cancelled"):
+            # How far a timed search gets depends on how busy the machine is, so it is not cached.
+            self.release(job)
+            job.key = None
+        return result
+
+    async def stream(self, job, writer):
+        """
+        Streams the progress of a job as JSON lines until it ends. The last line holds the result.
+
+        Args:
+            job (Job): The job.
+            writer (asyncio.StreamWriter): The connection.
+        """
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        while True:
+            version = job.version
+            writer.write(json.dumps(job.to_dict(result=job.ended)).encode() + b"\n")
+            await writer.drain()
+            if job.ended:
+                return
+            await job.wait(version)
+
+    def health(self):
+        """
+        Describes the state of the server.
+
+        Returns:
+            dict: The queued and running jobs, the workers and the cache.
+        """
+
+        running = sum(1 for job in self.jobs.values() if job.status == "running")
+        return {"status": "ok", "workers": self.workers, "queued": self.queue.qsize(), "queue_size": self.queue_size, "running": running,
+                "cache": {"size": len(self.cache), "capacity": self.cache_size, "hits": self.hits, "misses": self.misses}}
+
+def main(arguments=None):
+    """
+    Runs the server from the command line.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="tour_server", description="Serves tour simulations, solving and validation over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on, localhost by default")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--queue-size", type=int, default=64, help="most jobs waiting in the queue before requests are refused")
+    parser.add_argument("--cache-size", type=int, default=256, help="most results kept in the cache")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="tours per chunk of a simulation, the granularity of progress and cancelling")
+    options = parser.parse_args(arguments)
+
+    server = TourServer(options.host, options.port, options.workers, options.queue_size, options.cache_size, options.chunk_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import json
+import math
+import os
+
+class TourStatistics:
+    """
+    Streaming statistics over the number of squares visited per tour.
+
+    The accumulator holds a fixed-size histogram indexed by tour length, so its memory does not grow with the number of runs, together with the
+    running mean and sum of squared deviations (Welford's method) and the shortest and longest tour. Accumulators from different workers can be merged,
+    and an accumulator can be saved to and loaded from a JSON checkpoint.
+
+    Attributes:
+        histogram (list[int]): Entry k is the number of runs that visited k squares.
+        count (int): The number of runs added.
+        mean (float): The mean tour length.
+        m2 (float): The sum of squared deviations from the mean.
+        minimum (int | None): The shortest tour length, or None if nothing has been added.
+        maximum (int | None): The longest tour length, or None if nothing has been added.
+        metadata (dict): JSON-compatible information saved with a checkpoint, such as the parameters of the simulation that wrote it.
+    """
+
+    def __init__(self, squares):
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            squares (int): The number of squares on the board, which bounds the tour length.
+        """
+
+        self.histogram = [0] * (squares + 1)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.metadata = {}
+
+    @classmethod
+    def from_histogram(cls, histogram):
+        """
+        Creates an accumulator from a histogram of tour lengths.
+
+        Args:
+            histogram (list[int]): Entry k is the number of runs that visited k squares.
+
+        Returns:
+            TourStatistics: The accumulator.
+        """
+
+        statistics = cls(len(histogram) - 1)
+        statistics.add_histogram(histogram)
+        return statistics
+
+    def add(self, length):
+        """
+        Adds the length of a single tour.
+
+        Args:
+            length (int): The number of squares the tour visited.
+        """
+
+        self.histogram[length] += 1
+        self.count += 1
+        delta = length - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (length - self.mean)
+        if self.minimum is None or length < self.minimum:
+            self.minimum = length
+        if self.maximum is None or length > self.maximum:
+            self.maximum = length
+
+    def add_histogram(self, histogram):
+        """
+        Adds many tours at once from a histogram of tour lengths.
+
+        Args:
+            histogram (list[int]): Entry k is the number of runs that visited k squares.
+        """
+
+        batch = TourStatistics(len(self.histogram) - 1)
+        batch.count = sum(histogram)
+        if batch.count == 0:
+            return
+
+        for length, runs in enumerate(histogram):
+            if runs:
+                batch.histogram[length] = runs
+                if batch.minimum is None:
+                    batch.minimum = length
+                batch.maximum = length
+        batch.mean = sum(length * runs for length, runs in enumerate(histogram)) / batch.count
+        batch.m2 = sum(runs * (length - batch.mean) ** 2 for length, runs in enumerate(histogram))
+        self.merge(batch)
+
+    def merge(self, other):
+        """
+        Merges the runs of another accumulator into this one.
+
+        Args:
+            other (TourStatistics): The accumulator to merge, for example from another worker.
+        """
+
+        if len(other.histogram) != len(self.histogram):
+            raise ValueError("cannot merge statistics of different board sizes")
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        for length, runs in enumerate(other.histogram):
+            self.histogram[length] += runs
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        """
+        float: The sample variance of the tour lengths.
+        """
+
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """
+        float: The sample standard deviation of the tour lengths.
+        """
+
+        return math.sqrt(self.variance)
+
+    def percentile(self, percent):
+        """
+        Reads a percentile of the tour lengths from the histogram, using the nearest-rank method.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            int | None: The smallest length that at least percent of the runs do not exceed, or None if nothing has been added.
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for length, runs in enumerate(self.histogram):
+            seen += runs
+            if seen >= rank:
+                return length
+        return self.maximum
+
+    def summary(self):
+        """
+        Collects the statistics in a dictionary.
+
+        Returns:
+            dict: The count, mean, variance, standard deviation, minimum, maximum and median, 90th and 99th percentiles.
+        """
+
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+    def to_dict(self):
+        """
+        Converts the accumulator to a JSON-compatible dictionary.
+        """
+
+        return {"histogram": self.histogram, "count": self.count, "mean": self.mean, "m2": self.m2, "min": self.minimum, "max": self.maximum,
+                "metadata": self.metadata}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates an accumulator from a dictionary made by to_dict.
+        """
+
+        statistics = cls(len(data["histogram"]) - 1)
+        statistics.histogram = list(data["histogram"])
+        statistics.count = data["count"]
+        statistics.mean = data["mean"]
+        statistics.m2 = data["m2"]
+        statistics.minimum = data["min"]
+        statistics.maximum = data["max"]
+        statistics.metadata = data.get("metadata", {})
+        return statistics
+
+    def save(self, path):
+        """
+        Writes a checkpoint of the accumulator. The file is replaced atomically, so an interrupted write never corrupts an earlier checkpoint.
+
+        Args:
+            path (str): The checkpoint file.
+        """
+
+        temporary = path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a checkpoint written by save.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            TourStatistics: The accumulator.
+        """
+
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
@@ -0,0 +1,624 @@
+import argparse
+import json
+import sys
+import time
+from functools import lru_cache
+import numpy as np
+from move_table import KNIGHT, PIECES, leaper_moves, parse_piece
+from tour_counting import symmetries
+
+#Bulk validation and analysis of tours that come from elsewhere, such as the output of a solver or a batch of submissions, e.g.
+#python -m tour_validation tours.txt --size 8 --closed --out report.csv
+#
+#Tours are rows of an integer array of flat square indices (y * width + x). Tours shorter than the longest one are padded with PAD at the
+#end.
+#Every check and feature is computed for a whole chunk of tours at once with NumPy, so a chunk costs a few array operations, not a Python
+#loop per move.
+
+PAD = -1
+
+class TourReport:
+    """
+    The checks and features of a batch of tours, one entry per tour in every array.
+
+    Attributes:
+        length (numpy.ndarray): The number of squares in each tour.
+        in_bounds (numpy.ndarray): True if every square is on the board and the padding is only at the end.
+        legal (numpy.ndarray): True if every move is a move of the piece.
+        first_illegal (numpy.ndarray): The number of the first illegal move (1 for the move onto the second square), or -1 if there is none
+            or a square is off the board.
+        unique (numpy.ndarray): True if no square is visited twice.
+        complete (numpy.ndarray): True if the tour visits every square.
+        closed (numpy.ndarray): True if the tour is complete and its last square is a move away from the first.
+        valid (numpy.ndarray): True if the tour passes every check that was asked for.
+        crossings (numpy.ndarray): The number of pairs of moves whose segments between square centers cross, with the move back to the start
+            for closed tours when closed tours were asked for. -1 for tours that are not legal, or when the board is too large to count
+            them.
+        symmetries (numpy.ndarray): A bitmask of the board symmetries, numbered as in tour_counting.symmetries, that map the tour onto
+            itself as a path, or as a cycle when closed tours were asked for. Bit 0, the identity, is always set for legal tours.
+        symmetry_class (numpy.ndarray): A 64-bit key that is the same for two tours exactly when a board symmetry, reversing the direction
+            or, for cycles, starting elsewhere turns one into the other (up to hash collisions). 0 for tours that are not legal.
+    """
+
+    FIELDS = ("length", "in_bounds", "legal", "first_illegal", "unique", "complete", "closed", "valid", "crossings", "symmetries",
+              "symmetry_class")
+
+    def __init__(self, **arrays):
+        """
+        Initializes the report.
+
+        Args:
+            **arrays: An array for every name in FIELDS.
+        """
+
+        for name in self.FIELDS:
+            setattr(self, name, arrays[name])
+
+    def __len__(self):
+        return len(self.length)
+
+    @classmethod
+    def concatenate(cls, reports):
+        """
+        Joins the reports of consecutive chunks.
+
+        Args:
+            reports (list[TourReport]): The reports in order.
+
+        Returns:
+            TourReport: One report of all their tours.
+        """
+
+        return cls(**{name: np.concatenate([getattr(report, name) for report in reports]) for name in cls.FIELDS})
+
+    def summary(self):
+        """
+        Counts how many tours pass each check and summarizes the features.
+
+        Returns:
+            dict: The counts, the mean number of crossings of the legal tours and the number of distinct symmetry classes of the valid
+                tours.
+        """
+
+        counted = self.crossings >= 0
+        valid_classes = self.symmetry_class[self.valid]
+        return {
+            "tours": len(self),
+            "in_bounds": int(self.in_bounds.sum()),
+            "legal": int(self.legal.sum()),
+            "unique": int(self.unique.sum()),
+            "complete": int(self.complete.sum()),
+            "closed": int(self.closed.sum()),
+            "valid": int(self.valid.sum()),
+            "mean_crossings": float(self.crossings[counted].mean()) if counted.any() else None,
+            "symmetric": int(((self.symmetries & ~1) != 0).sum()),
+            "symmetry_classes": int(np.unique(valid_classes).size),
+        }
+
+    def problem(self, index):
+        """
+        Describes the first problem of a tour.
+
+        Args:
+            index (int): The number of the tour.
+
+        Returns:
+            str: The problem, or "valid".
+        """
+
+        if not self.in_bounds[index]:
+            return "the tour leaves the board or has a gap"
+        if not self.legal[index]:
+            return f"move {self.first_illegal[index]} is not a move of the piece"
+        if not self.unique[index]:
+            return "the tour visits a square twice"
+        if self.valid[index]:
+            return "valid"
+        if not self.complete[index]:
+            return f"the tour visits {self.length[index]} squares, not every square"
+        return "the last square is not a move away from the first"
+
+    def save(self, path):
+        """
+        Writes a row per tour, as .csv, .json or .npz depending on the extension.
+
+        Args:
+            path (str): The file to write.
+        """
+
+        if path.endswith(".npz"):
+            np.savez_compressed(path, **{name: getattr(self, name) for name in self.FIELDS})
+        elif path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump({"summary": self.summary(), "tours": [dict(zip(self.FIELDS, row)) for row in self.rows()]}, file, indent=2)
+        elif path.endswith(".csv"):
+            with open(path, "w") as file:
+                file.write(",".join(self.FIELDS) + "\n")
+                for row in self.rows():
+                    file.write(",".join(str(int(value)) for value in row) + "\n")
+        else:
+            raise ValueError(f"cannot tell the format of {path}, expected .csv, .json or .npz")
+
+    def rows(self):
+        """
+        Yields the values of every tour as Python numbers.
+
+        Yields:
+            list: The values of one tour, in the order of FIELDS.
+        """
+
+        columns = [getattr(self, name).tolist() for name in self.FIELDS]
+        return (list(row) for row in zip(*columns))
+
+class TourValidator:
+    """
+    Checks batches of tours on one board and computes their features, with tables that are built once per board and piece.
+
+    A move is looked up by its (dx, dy) in a small table, so checking every move of a batch is one gather. A pair of moves crosses if the
+    segments between the centers of their squares properly intersect, which is looked up in a list of the crossing pairs of the board.
+    Symmetries are found by hashing every tour under every board symmetry, in both directions.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        squares (int): The number of squares.
+        piece (Leaper): The piece whose moves are legal.
+        permutations (numpy.ndarray): The board symmetries that map the piece's moves onto themselves, one permutation of the squares per
+            row.
+        symmetry_bits (numpy.ndarray): The bit of every permutation in the symmetries bitmask.
+    """
+
+    MAX_EDGES = 4096
+
+    def __init__(self, width, height=None, piece=KNIGHT):
+        """
+        Initializes the validator.
+
+        Args:
+            width (int): The width of the board.
+            height (int): The height of the board, defaults to the width.
+            piece (Leaper): The piece whose moves are legal.
+        """
+
+        self.width = width
+        self.height = width if height is None else height
+        self.squares = self.width * self.height
+        self.piece = piece
+
+        reach = piece.reach
+        self.span = 2 * reach + 1
+        # move_index[(dx + reach) * span + dy + reach] is the index of the move in piece.offsets, or -1 if it is not a move.
+        self.move_index = np.full(self.span * self.span, -1, dtype=np.int64)
+        for index, (dx, dy) in enumerate(piece.offsets):
+            self.move_index[(dx + reach) * self.span + dy + reach] = index
+
+        table = leaper_moves(piece, self.width, self.height)
+        keep = [(bit, permutation) for bit, permutation in enumerate(symmetries(self.width, self.height))
+                if all(set(table[permutation[square]]) == {permutation[neighbor] for neighbor in table[square]}
+                       for square in range(self.squares))]
+        self.symmetry_bits = np.array([1 << bit for bit, permutation in keep], dtype=np.int64)
+        self.permutations = np.array([permutation for bit, permutation in keep], dtype=np.int64)
+        self.edges, self.edge_count, self.pairs = crossing_table(self.width, self.height, piece)
+
+    def check(self, tours, closed=False, complete=True):
+        """
+        Checks a batch of tours and computes their features.
+
+        Args:
+            tours (numpy.ndarray): A (tours, length) integer array of flat square indices, padded with PAD.
+            closed (bool): If True, a valid tour also has to be closed, and tours are compared as cycles.
+            complete (bool): If True, a valid tour also has to visit every square.
+
+        Returns:
+            TourReport: The checks and features of every tour.
+        """
+
+        tours = np.asarray(tours, dtype=np.int64)
+        if tours.ndim != 2:
+            raise ValueError(f"tours have to be a two-dimensional array, not {tours.ndim}-dimensional")
+        if tours.shape[1] == 0:
+            tours = np.full((len(tours), 1), PAD, dtype=np.int64)
+        count, columns = tours.shape
+
+        pad = tours == PAD
+        length = columns - pad.sum(axis=1)
+        # Padding is only allowed at the end, so a tour of length n has no padding in its first n columns.
+        in_bounds = ((tours >= 0) & (tours < self.squares) | pad).all(axis=1) & ~(pad[:, :-1] & ~pad[:, 1:]).any(axis=1)
+        board = np.where(pad | ~in_bounds[:, None], 0, tours)
+
+        moves = self.moves(board[:, :-1], board[:, 1:])
+        present = ~pad[:, 1:]
+        illegal = present & (moves < 0)
+        legal = in_bounds & ~illegal.any(axis=1)
+        first_illegal = np.where(illegal.any(axis=1), illegal.argmax(axis=1) + 1, -1) if columns > 1 else np.full(count, -1)
+        first_illegal[~in_bounds] = -1
+
+        # Padding gets distinct negative values, so sorting each row finds repeated squares by comparing neighbors.
+        ranked = np.sort(np.where(pad, -2 - np.arange(columns), tours), axis=1)
+        unique = in_bounds & ~(ranked[:, 1:] == ranked[:, :-1]).any(axis=1)
+        full = in_bounds & unique & (length == self.squares)
+        last = board[np.arange(count), np.maximum(length - 1, 0)]
+        is_closed = full & legal & (self.moves(last, board[:, 0]) >= 0)
+
+        valid = legal & unique
+        if complete:
+            valid &= full
+        if closed:
+            valid &= is_closed
+
+        cycle = is_closed if closed else np.zeros(count, dtype=bool)
+        crossings = self.crossings(board, length, moves, present, legal, cycle)
+        symmetry_mask, symmetry_class = self.symmetry(board, pad, length, legal, cycle)
+
+        return TourReport(length=length, in_bounds=in_bounds, legal=legal, first_illegal=first_illegal, unique=unique, complete=full,
+                          closed=is_closed, valid=valid, crossings=crossings, symmetries=symmetry_mask, symmetry_class=symmetry_class)
+
+    def moves(self, first, second):
+        """
+        Finds which move of the piece leads from each square to the next.
+
+        Args:
+            first (numpy.ndarray): The squares moved from.
+            second (numpy.ndarray): The squares moved to, the same shape.
+
+        Returns:
+            numpy.ndarray: The index of the move in piece.offsets, or -1 where it is not a move.
+        """
+
+        reach = self.piece.reach
+        dx = second % self.width - first % self.width
+        dy = second // self.width - first // self.width
+        near = (np.abs(dx) <= reach) & (np.abs(dy) <= reach)
+        index = np.where(near, (dx + reach) * self.span + dy + reach, 0)
+        return np.where(near, self.move_index[index], -1)
+
+    def crossings(self, board, length, moves, present, legal, cycle):
+        """
+        Counts the pairs of moves of every tour that cross.
+
+        Args:
+            board (numpy.ndarray): The tours, with padding replaced by square 0.
+            length (numpy.ndarray): The length of every tour.
+            moves (numpy.ndarray): The index of every move of the tours.
+            present (numpy.ndarray): True where a move exists and is not padding.
+            legal (numpy.ndarray): True for the legal tours.
+            cycle (numpy.ndarray): True for the tours whose move back to the start counts too.
+
+        Returns:
+            numpy.ndarray: The number of crossing pairs, -1 for tours that are not legal.
+        """
+
+        count, columns = board.shape
+        result = np.full(count, -1, dtype=np.int64)
+        if self.pairs is None:
+            return result
+
+        none = self.edge_count
+        edges = np.where(present & (moves >= 0), self.edges[board[:, :-1], np.maximum(moves, 0)], none)
+        last = board[np.arange(count), np.maximum(length - 1, 0)]
+        closing = self.moves(last, board[:, 0])
+        closing_edge = np.where(cycle & (closing >= 0), self.edges[last, np.maximum(closing, 0)], none)
+        edges = np.concatenate([edges, closing_edge[:, None]], axis=1)[legal]
+
+        # With used[e] the number of times a tour uses edge e, the crossing pairs of the tour are the sum of used[a] * used[b] over the
+        # crossing pairs (a, b) of the board. Edges that share a square never cross, so neighboring moves and repeated edges add nothing.
+        # The tours are counted in blocks to bound the memory.
+        first, second = self.pairs
+        counted = np.empty(len(edges), dtype=np.int64)
+        block = max(1, (1 << 22) // (none + 1 + len(first)))
+        for start in range(0, len(edges), block):
+            part = edges[start:start + block]
+            used = np.bincount((np.arange(len(part))[:, None] * (none + 1) + part).ravel(), minlength=len(part) * (none + 1))
+            used = used.reshape(len(part), none + 1).astype(np.int32)
+            counted[start:start + block] = (used[:, first] * used[:, second]).sum(axis=1)
+        result[legal] = counted
+        return result
+
+    def symmetry(self, board, pad, length, legal, cycle):
+        """
+        Finds the board symmetries that map every tour onto itself, and a key of its symmetry class.
+
+        Every tour is hashed under every symmetry in both directions, and cycles are first turned to start at their smallest square. The
+        class key is the smallest of those hashes, and a symmetry maps the tour onto itself if its smaller hash equals that of the tour.
+
+        Args:
+            board (numpy.ndarray): The tours, with padding replaced by square 0.
+            pad (numpy.ndarray): True where a tour is padded.
+            length (numpy.ndarray): The length of every tour.
+            legal (numpy.ndarray): True for the legal tours.
+            cycle (numpy.ndarray): True for the tours that are compared as cycles.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The symmetries bitmask and the class key of every tour, 0 for tours that are not legal.
+        """
+
+        count, columns = board.shape
+        powers = hash_powers(columns)
+        positions = np.arange(columns)
+        padded = pad.any()
+        if padded:
+            # Reading a tour backwards: column i of the reversed tour is column length - 1 - i, and the padding stays at the end.
+            backwards = np.where(positions < length[:, None], length[:, None] - 1 - positions, positions)
+        cycles = np.flatnonzero(cycle)
+        cycle_pad = pad[cycles]
+        cycle_length = length[cycles, None]
+
+        offsets = np.concatenate([np.zeros(1, dtype=np.uint64), np.cumsum(powers, dtype=np.uint64)])[length]
+        hashes = []
+        for permutation in self.permutations:
+            image = permutation[board]
+            if padded:
+                image[pad] = 0
+            best = None
+            for variant in (image, np.take_along_axis(image, backwards, axis=1) if padded else image[:, ::-1]):
+                if cycles.size:
+                    # A cycle is turned to start at its smallest square, so where it was started does not matter. Only its own squares turn,
+                    # so the padding of a wider chunk stays at the end.
+                    start = np.where(cycle_pad, self.squares, variant[cycles]).argmin(axis=1)
+                    turn = np.where(positions < cycle_length, (positions + start[:, None]) % cycle_length, positions)
+                    variant = variant.copy()
+                    variant[cycles] = np.take_along_axis(variant[cycles], turn, axis=1)
+                # Squares are hashed as index + 1 and padding as 0, so the key does not depend on how wide the chunk is. The + 1 of every
+                # square adds the sum of the powers up to the length.
+                value = (variant.astype(np.uint64) * powers).sum(axis=1, dtype=np.uint64) + offsets
+                best = value if best is None else np.minimum(best, value)
+            hashes.append(best)
+
+        hashes = np.array(hashes)
+        symmetry_class = np.where(legal, hashes.min(axis=0), np.uint64(0))
+        mask = ((hashes == hashes[0]) * self.symmetry_bits[:, None]).sum(axis=0)
+        return np.where(legal, mask, 0), symmetry_class
+
+@lru_cache(maxsize=64)
+def cached_validator(width, height, piece):
+    """
+    Builds the validator of a board once, so checking small batches often, as the tour server does, does not rebuild its tables.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        piece (Leaper): The piece whose moves are legal.
+
+    Returns:
+        TourValidator: The validator.
+    """
+
+    return TourValidator(width, height, piece)
+
+@lru_cache(maxsize=None)
+def hash_powers(columns):
+    """
+    Builds the multipliers of the tour hash, the powers of a large odd number modulo 2**64.
+
+    Args:
+        columns (int): The number of columns of the tours.
+
+    Returns:
+        numpy.ndarray: The multiplier of every column.
+    """
+
+    powers = np.empty(columns, dtype=np.uint64)
+    value = 1
+    for column in range(columns):
+        powers[column] = value
+        value = value * 0x9E3779B97F4A7C15 % 2 ** 64
+    return powers
+
+@lru_cache(maxsize=None)
+def crossing_table(width, height, piece):
+    """
+    Numbers the moves of a piece on a board and lists the pairs of them that cross.
+
+    A move and its reverse are the same edge. Two edges cross if the segments between the centers of their squares properly intersect, so
+    edges that share a square, or only touch, do not cross. A segment only crosses the few segments near it, so the pairs are kept as a list
+    instead of a table of every pair of edges.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        piece (Leaper): The piece.
+
+    Returns:
+        tuple[numpy.ndarray, int, numpy.ndarray | None]: edges[square, move] is the number of the edge of that move, the number of
+            edges, and a (2, pairs) array of the numbers of the edges of every crossing pair, the smaller first. The pairs are None if the
+            board has more than TourValidator.MAX_EDGES edges.
+    """
+
+    numbers = {}
+    edges = np.zeros((width * height, len(piece.offsets)), dtype=np.int64)
+    for square in range(width * height):
+        x, y = square % width, square // width
+        for index, (dx, dy) in enumerate(piece.offsets):
+            if 0 <= x + dx < width and 0 <= y + dy < height:
+                pair = (min(square, (y + dy) * width + x + dx), max(square, (y + dy) * width + x + dx))
+                edges[square, index] = numbers.setdefault(pair, len(numbers))
+    if len(numbers) > TourValidator.MAX_EDGES:
+        return edges, len(numbers), None
+
+    ends = np.array(list(numbers), dtype=np.int64).reshape(-1, 2)
+    x = ends % width
+    y = ends // width
+
+    def orientation(ax, ay, bx, by, cx, cy):
+        return np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+    low, high = y.min(axis=1), y.max(axis=1)
+    pairs = []
+    for block in range(0, len(numbers), 512):
+        rows = slice(block, min(block + 512, len(numbers)))
+        # Edges are numbered row by row, so a block only has to be compared with the edges whose rows overlap its rows.
+        near = np.flatnonzero((low <= high[rows].max()) & (high >= low[rows].min()))
+        ax, ay, bx, by = x[rows, 0, None], y[rows, 0, None], x[rows, 1, None], y[rows, 1, None]
+        cx, cy, dx, dy = x[None, near, 0], y[None, near, 0], x[None, near, 1], y[None, near, 1]
+        first, second = np.nonzero((orientation(ax, ay, bx, by, cx, cy) * orientation(ax, ay, bx, by, dx, dy) < 0)
+                                   & (orientation(cx, cy, dx, dy, ax, ay) * orientation(cx, cy, dx, dy, bx, by) < 0))
+        first += block
+        second = near[second]
+        pairs.append(np.stack([first[first < second], second[first < second]]))
+    return edges, len(numbers), np.concatenate(pairs, axis=1)
+
+def pad_tours(tours):
+    """
+    Packs tours of any lengths into one array, padding the shorter ones with PAD.
+
+    Args:
+        tours (Iterable[Sequence[int]]): The tours.
+
+    Returns:
+        numpy.ndarray: A (tours, longest) integer array.
+    """
+
+    tours = [np.asarray(tour, dtype=np.int64) for tour in tours]
+    array = np.full((len(tours), max((len(tour) for tour in tours), default=0)), PAD, dtype=np.int64)
+    for row, tour in enumerate(tours):
+        array[row, :len(tour)] = tour
+    return array
+
+def read_chunks(source, chunk_size=65536):
+    """
+    Reads tours from a file or stream in chunks, so any number of tours can be checked in bounded memory.
+
+    A .npy file holds a two-dimensional array and is memory-mapped. A tour log written by knight_sim --log is decoded tour by tour. Anything
+    else is read as text with one tour per line, the squares separated by commas or spaces; blank lines and lines starting with # are
+    skipped.
+
+    Args:
+        source (str | TextIO): A file name, "-" for standard input, or an open text stream.
+        chunk_size (int): The most tours per chunk.
+
+    Yields:
+        numpy.ndarray: A (tours, length) array of the tours of the chunk, padded with PAD.
+    """
+
+    if isinstance(source, str) and source.endswith(".npy"):
+        tours = np.load(source, mmap_mode="r")
+        for first in range(0, len(tours), chunk_size):
+            yield np.asarray(tours[first:first + chunk_size], dtype=np.int64)
+        return
+
+    if isinstance(source, str) and source != "-":
+        with open(source, "rb") as file:
+            is_log = file.read(4) == b"KTLG"
+        if is_log:
+            from tour_log import TourLogReader
+
+            with TourLogReader(source) as log:
+                for first in range(0, len(log), chunk_size):
+                    yield pad_tours(log[k] for k in range(first, min(first + chunk_size, len(log))))
+            return
+
+    stream = sys.stdin if source == "-" else open(source) if isinstance(source, str) else source
+    try:
+        lines = []
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            lines.append(line.replace(",", " "))
+            if len(lines) == chunk_size:
+                yield parse_lines(lines)
+                lines = []
+        if lines:
+            yield parse_lines(lines)
+    finally:
+        if stream is not sys.stdin and isinstance(source, str):
+            stream.close()
+
+def parse_lines(lines):
+    """
+    Parses lines of squares separated by spaces into padded tours. The numbers of all lines are parsed in one call instead of one by one.
+
+    Args:
+        lines (list[str]): The lines, one tour per line.
+
+    Returns:
+        numpy.ndarray: A (tours, longest) integer array padded with PAD.
+    """
+
+    lengths = np.array([len(line.split()) for line in lines], dtype=np.int64)
+    try:
+        values = np.fromstring(" ".join(lines), dtype=np.int64, sep=" ")
+    except ValueError:
+        values = None
+    if values is None or len(values) != lengths.sum():
+        raise ValueError("tours have to be lines of integers separated by commas or spaces")
+    tours = np.full((len(lines), lengths.max()), PAD, dtype=np.int64)
+    tours[np.arange(tours.shape[1]) < lengths[:, None]] = values
+    return tours
+
+def validate_tours(tours, width, height=None, piece=KNIGHT, closed=False, complete=True, chunk_size=65536):
+    """
+    Checks many tours and computes their features, chunk by chunk.
+
+    Args:
+        tours (numpy.ndarray | Iterable[Sequence[int]] | Iterable[numpy.ndarray]): A (tours, length) array, a list of tours, or chunks
+            from read_chunks.
+        width (int): The width of the board.
+        height (int): The height of the board, defaults to the width.
+        piece (Leaper): The piece whose moves are legal.
+        closed (bool): If True, a valid tour also has to be closed, and tours are compared as cycles.
+        complete (bool): If True, a valid tour also has to visit every square.
+        chunk_size (int): The most tours checked at once.
+
+    Returns:
+        TourReport: The checks and features of every tour, in order.
+    """
+
+    validator = cached_validator(width, width if height is None else height, piece)
+    if isinstance(tours, np.ndarray):
+        chunks = (tours[first:first + chunk_size] for first in range(0, len(tours), chunk_size))
+    else:
+        tours = list(tours)
+        if tours and isinstance(tours[0], np.ndarray) and tours[0].ndim == 2:
+            chunks = tours
+        else:
+            chunks = (pad_tours(tours[first:first + chunk_size]) for first in range(0, len(tours), chunk_size))
+    reports = [validator.check(chunk, closed, complete) for chunk in chunks]
+    if not reports:
+        return validator.check(np.zeros((0, 1), dtype=np.int64), closed, complete)
+    return TourReport.concatenate(reports)
+
+def main(arguments=None):
+    """
+    Checks the tours in files or on standard input and prints a summary.
+
+    Args:
+        arguments (list[str]): The arguments to parse, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="tour_validation", description="Checks many tours at once and reports their features.")
+    parser.add_argument("sources", nargs="+",
+                        help="files of tours (.npy, a tour log, or text with one tour per line), - for standard input")
+    parser.add_argument("--size", type=int, default=8, help="size of a square chessboard")
+    parser.add_argument("--width", type=int, default=None, help="width of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--height", type=int, default=None, help="height of a rectangular chessboard, defaults to --size")
+    parser.add_argument("--piece", type=parse_piece, default="knight", metavar="PIECE",
+                        help=f"{', '.join(PIECES)} or m,n for the (m, n) leaper")
+    parser.add_argument("--closed", action="store_true", help="require closed tours and compare tours as cycles")
+    parser.add_argument("--partial", action="store_true", help="accept tours that do not visit every square")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="tours checked at once")
+    parser.add_argument("--out", default=None, help="write a row per tour to a .csv, .json or .npz file")
+    options = parser.parse_args(arguments)
+
+    width = options.size if options.width is None else options.width
+    height = options.size if options.height is None else options.height
+    validator = cached_validator(width, height, options.piece)
+
+    started = time.perf_counter()
+    reports = []
+    for source in options.sources:
+        for chunk in read_chunks(source, options.chunk_size):
+            reports.append(validator.check(chunk, options.closed, not options.partial))
+    report = TourReport.concatenate(reports) if reports else validate_tours([], width, height, options.piece)
+    elapsed = time.perf_counter() - started
+
+    summary = dict(report.summary(), elapsed=elapsed, tours_per_second=len(report) / elapsed if elapsed > 0 else None)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    if options.out is not None:
+        report.save(options.out)
+    if summary["valid"] != summary["tours"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
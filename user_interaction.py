@@ -1,19 +1,36 @@
 import pygame
 import sys
+from event_loop import EventLoop
+from instrumentation import instrument
 
 class UserInteraction:
     """
     Handles user interaction and visualization for the knight tour.
 
+    The board is drawn in retained mode: the empty board is rendered once into a background surface, every move number is rendered once into a glyph cache,
+    and update_display only redraws the squares that changed since the last frame and pushes just those rectangles to the window.
+
     Attributes:
         chessboard (Chessboard): The chessboard object to represent graphically.
         square_size (int): The size of each square on the chessboard.
-        board_size (int): The total size of the chessboard in pixels.
+        board_width (int): The width of the chessboard in pixels.
+        board_height (int): The height of the chessboard in pixels.
         screen: The Pygame window for displaying the board.
         knight_sprite: The icon representing the knight piece.
         font: The font used for rendering text on the board.
+        events: The event loop that waits for input without using the CPU while idle.
+        background: The pre-rendered empty board, or None until it is first needed.
+        glyphs (dict[int, pygame.Surface]): The rendered move numbers by value.
+        shown (list[int]): What each square currently shows on screen: 0 for an empty square, a move number, KNIGHT or HIGHLIGHT.
+        shown_visited (array.array): The chessboard's visited bitmask as of the last frame.
+        knight_square (int | None): The square the knight is drawn on.
+        highlighted (set[int]): The squares that are highlighted in green.
     """
 
+    KNIGHT = -1
+    HIGHLIGHT = -2
+    HINT_COLORS = {"tour": (0, 160, 255), "dead": (220, 40, 40), "unknown": (255, 170, 0)}
+
     def __init__(self, chessboard):
         """
         Initializes the UserInteraction class with the given chessboard and sets up Pygame for visualization.
@@ -24,39 +41,192 @@ class UserInteraction:
 
         pygame.init()
         self.chessboard = chessboard
-        self.square_size = 80
-        self.board_size = chessboard.size * self.square_size
-        self.screen = pygame.display.set_mode((self.board_size, self.board_size))
+        self.square_size = max(10, 640 // max(chessboard.width, chessboard.height))
+        self.board_width = chessboard.width * self.square_size
+        self.board_height = chessboard.height * self.square_size
+        self.screen = pygame.display.set_mode((self.board_width, self.board_height))
         pygame.display.set_caption('Knight Tour')
-        self.knight_sprite = pygame.image.load('assets/knight.png')
-        self.knight_sprite = pygame.transform.scale(self.knight_sprite, (self.square_size, self.square_size))
-        self.font = pygame.font.Font(None, 36)
+        self.sprite = None
+        self.font = pygame.font.Font(None, max(10, self.square_size * 36 // 80))
+        self.events = EventLoop()
+        self.background = None
+        self.glyphs = {}
+        self.invalidate()
+
+    @property
+    def knight_sprite(self):
+        """
+        The knight icon, loaded from the assets and scaled to a square the first time it is drawn.
+        """
+
+        if self.sprite is None:
+            self.sprite = pygame.image.load('assets/knight.png')
+            self.sprite = pygame.transform.scale(self.sprite, (self.square_size, self.square_size))
+        return self.sprite
+
+    def invalidate(self):
+        """
+        Forgets what is on screen, so the next update_display redraws the whole board. Needed after something else, such as a menu, has drawn over the window.
+        """
+
+        self.shown = None
+        self.shown_visited = None
+        self.knight_square = None
+        self.highlighted = set()
+
+    def square_rect(self, square):
+        """
+        Finds the screen rectangle of a square. Row 0 of the board is drawn at the bottom of the window.
+
+        Args:
+            square (int): The flat index of the square.
+
+        Returns:
+            pygame.Rect: The rectangle the square covers.
+        """
+
+        col = square % self.chessboard.width
+        row = square // self.chessboard.width
+        return pygame.Rect(col * self.square_size, (self.chessboard.height - 1 - row) * self.square_size, self.square_size, self.square_size)
+
+    def glyph(self, value):
+        """
+        Returns the rendered text of a move number, rendering it only the first time it is needed.
+
+        Args:
+            value (int): The move number.
+
+        Returns:
+            pygame.Surface: The rendered number.
+        """
+
+        text = self.glyphs.get(value)
+        if text is None:
+            text = self.glyphs[value] = self.render_glyph(value)
+        return text
+
+    def render_glyph(self, value):
+        """
+        Renders the text of a move number.
+
+        Args:
+            value (int): The move number.
+
+        Returns:
+            pygame.Surface: The rendered number.
+        """
+
+        return self.font.render(str(value), True, (255, 0, 0))
 
     def draw_board(self):
         """
-        Draws the chessboard on the screen.
+        Draws the chessboard on the screen from the pre-rendered background.
+        """
+
+        if self.background is None:
+            self.background = pygame.Surface((self.board_width, self.board_height))
+            colors = [(255, 255, 255), (0, 0, 0)]
+            for row in range(self.chessboard.height):
+                for col in range(self.chessboard.width):
+                    color = colors[(row + col) % 2]
+                    pygame.draw.rect(self.background, color, pygame.Rect(col * self.square_size, row * self.square_size, self.square_size, self.square_size))
+
+        self.screen.blit(self.background, (0, 0))
+
+    def draw_square(self, square, content):
+        """
+        Redraws a single square with the given content.
+
+        Args:
+            square (int): The flat index of the square.
+            content (int): 0 for an empty square, a move number, KNIGHT or HIGHLIGHT.
+
+        Returns:
+            pygame.Rect: The rectangle that was redrawn.
+        """
+
+        rect = self.square_rect(square)
+        if content == self.HIGHLIGHT:
+            pygame.draw.rect(self.screen, (0, 255, 0), rect)
+        else:
+            self.screen.blit(self.background, rect, rect)
+            if content == self.KNIGHT:
+                self.screen.blit(self.knight_sprite, rect)
+            elif content != 0:
+                text = self.glyph(content)
+                self.screen.blit(text, text.get_rect(center=rect.center))
+
+        self.shown[square] = content
+        if content == self.HIGHLIGHT:
+            self.highlighted.add(square)
+        else:
+            self.highlighted.discard(square)
+        return rect
+
+    def square_content(self, square):
+        """
+        Works out what a square should show according to the chessboard.
+
+        Args:
+            square (int): The flat index of the square.
+
+        Returns:
+            int: 0 for an unvisited square, KNIGHT for the square of the current move and otherwise the move number.
         """
 
-        colors = [(255, 255, 255), (0, 0, 0)]
-        for row in range(self.chessboard.size):
-            for col in range(self.chessboard.size):
-                color = colors[(row + col) % 2]
-                pygame.draw.rect(self.screen, color, pygame.Rect(col * self.square_size, row * self.square_size, self.square_size, self.square_size))
+        value = self.chessboard.value(square)
+        if value != 0 and value == self.chessboard.move:
+            return self.KNIGHT
+        return value
 
     def draw_knight(self):
         """
         Draws the knight piece and move numbers on the board.
         """
 
-        for row in range(self.chessboard.size):
-            for col in range(self.chessboard.size):
-                if self.chessboard.board[row][col] != 0 and self.chessboard.board[row][col] == self.chessboard.move:
-                    self.screen.blit(self.knight_sprite, (col * self.square_size, (self.chessboard.size - 1 - row) * self.square_size))
-                elif self.chessboard.board[row][col] != 0:
-                    text = self.font.render(str(self.chessboard.board[row][col]), True, (255, 0, 0))
-                    text_rect = text.get_rect(center=(col * self.square_size + self.square_size // 2, (self.chessboard.size - 1 - row) * self.square_size + self.square_size // 2))
-                    self.screen.blit(text, text_rect)
-    
+        self.knight_square = None
+        for square in range(self.chessboard.squares):
+            content = self.square_content(square)
+            if content == self.KNIGHT:
+                self.knight_square = square
+            if content != 0:
+                self.draw_square(square, content)
+            else:
+                self.shown[square] = 0
+
+    def redraw(self):
+        """
+        Redraws the whole board and the knight and updates the whole window.
+        """
+
+        self.shown = [0] * self.chessboard.squares
+        self.highlighted = set()
+        self.draw_board()
+        self.draw_knight()
+        self.shown_visited = self.chessboard.visited[:]
+        pygame.display.flip()
+
+    def changed_squares(self):
+        """
+        Finds the squares that may look different from the last frame: squares whose visited bit changed, the old and new knight square and highlighted squares.
+
+        Returns:
+            set[int]: The flat indices of the squares to check.
+        """
+
+        changed = set()
+        for word, (current, shown) in enumerate(zip(self.chessboard.visited, self.shown_visited)):
+            difference = current ^ shown
+            while difference:
+                lowest = difference & -difference
+                changed.add(word * 64 + lowest.bit_length() - 1)
+                difference ^= lowest
+
+        if self.knight_square is not None:
+            changed.add(self.knight_square)
+        changed.update(self.highlighted)
+        return changed
+
     def mark_squares_green(self, coordinates):
         """
         Highlights all valid squares that the knight can move to in green.
@@ -65,57 +235,157 @@ class UserInteraction:
             coordinates (list[list[int]]): A list of coordinates for valid moves.
         """
 
-        color = (0, 255, 0)
+        if self.shown is None:
+            self.redraw()
+
+        rects = []
         for squares in coordinates:
-            pygame.draw.rect(self.screen, color, pygame.Rect(squares[0] * self.square_size, (self.chessboard.size - 1 - squares[1]) * self.square_size, self.square_size, self.square_size))
-        
+            square = squares[1] * self.chessboard.width + squares[0]
+            rects.append(self.draw_square(square, self.HIGHLIGHT))
+
+        pygame.display.update(rects)
+
+    def mark_hints(self, hints):
+        """
+        Colors the candidate moves by their hints: blue if a tour over every remaining square can still be completed, red if it cannot and
+        orange if the search ran out of budget, with the number of squares a Warnsdorff continuation would still visit.
+
+        Args:
+            hints (dict[int, Hint]): The hints by the flat index of the square.
+        """
+
+        if self.shown is None:
+            self.redraw()
+
+        rects = []
+        for square, hint in hints.items():
+            rect = self.draw_square(square, self.HIGHLIGHT)
+            pygame.draw.rect(self.screen, self.HINT_COLORS[hint.status], rect)
+            if hint.status == "unknown":
+                text = self.glyph(hint.remaining)
+                self.screen.blit(text, text.get_rect(center=rect.center))
+            rects.append(rect)
+
+        pygame.display.update(rects)
+
+    def show_heatmap(self, grid, label):
+        """
+        Colors every square by a per-square statistic, from blue for the lowest value to red for the highest, and writes the value on it.
+
+        Args:
+            grid (numpy.ndarray): A height by width array of values, indexed [y][x] like chessboard.board.
+            label (str): What the values are, shown in the window title with their range.
+        """
+
+        low = float(grid.min())
+        high = float(grid.max())
+        for square in range(self.chessboard.squares):
+            value = float(grid[square // self.chessboard.width][square % self.chessboard.width])
+            share = (value - low) / (high - low) if high > low else 0.5
+            rect = self.square_rect(square)
+            pygame.draw.rect(self.screen, (int(255 * share), 64, int(255 * (1 - share))), rect)
+            text = self.font.render(f"{value:.3g}", True, (255, 255, 255))
+            self.screen.blit(text, text.get_rect(center=rect.center))
+
+        self.show_status(f"{label} from {low:.4g} to {high:.4g}")
         pygame.display.flip()
+        # The overlay covers the whole board, so the next frame starts from a full redraw.
+        self.invalidate()
+
+    def show_status(self, text):
+        """
+        Shows a status message, such as the time it took to solve a tour, in the window title.
+
+        Args:
+            text (str): The message to show.
+        """
+
+        pygame.display.set_caption(f'Knight Tour - {text}')
 
     def update_display(self):
         """
-        Updates the display by drawing the board and the knight.
+        Updates the display by redrawing the squares that changed since the last frame, and only pushing those squares to the window.
         """
 
-        self.draw_board()
-        self.draw_knight()
-        pygame.display.flip()
+        if self.shown is None:
+            self.redraw()
+            return
+
+        changed = self.changed_squares()
+        knight = None
+        rects = []
+        for square in changed:
+            content = self.square_content(square)
+            if content == self.KNIGHT:
+                knight = square
+            if content != self.shown[square]:
+                rects.append(self.draw_square(square, content))
+
+        if knight is None and self.chessboard.move > 0:
+            # The knight stands on an unchanged square, for example after an illegal move, so look it up.
+            for square in range(self.chessboard.squares):
+                if self.square_content(square) == self.KNIGHT:
+                    knight = square
+                    if self.shown[square] != self.KNIGHT:
+                        rects.append(self.draw_square(square, self.KNIGHT))
+                    break
+
+        self.knight_square = knight
+        self.shown_visited = self.chessboard.visited[:]
+        pygame.display.update(rects)
+
+    def replay(self, tour, rate=5.0):
+        """
+        Animates a stored tour, for example one read from a tour log, on a cleared board.
+
+        Args:
+            tour (list[int]): The flat indices of the squares of the tour in order.
+            rate (float | None): Moves per second, or None to play as fast as possible.
+
+        Returns:
+            bool: True if the whole tour was played, False if the window was closed.
+        """
+
+        from knight_tour import KnightTour
+
+        self.chessboard.reset_board()
+        self.invalidate()
+        knight_tour = KnightTour(self.chessboard, self)
+        return knight_tour.animate(knight_tour.replay_moves(tour), rate)
 
     def display_board(self):
         """
-        Continuously displays the board until the user quits.
+        Displays the board until the user quits, redrawing it only when the window needs it.
         """
 
-        running = True
-        clock = pygame.time.Clock()
-        while running:
-            pygame.event.pump()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-            self.update_display()
-            clock.tick(30)
+        self.events.run(lambda event: True if event.type == pygame.QUIT else None, self.redraw)
         pygame.quit()
     
-    def click_to_coordinates(self):
+    def click_to_coordinates(self, tick=None):
         """
         Waits for the user to click on the screen and returns the chessboard coordinates of the click.
 
+        Args:
+            tick (Callable[[], None]): Called regularly while waiting, for example to draw hints as they come in.
+
         Returns:
             list[int, int]: The x and y-coordinates of the clicked square.
         """
 
-        waiting_for_click = True
-        coordinates = []
-        while waiting_for_click:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = event.pos
-                    col = x // self.square_size
-                    row = (self.board_size - y) // self.square_size 
-                    coordinates = [col, row]
-                    waiting_for_click = False
-                    break
-        return coordinates
\ No newline at end of file
+        def handle_event(event):
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                x, y = event.pos
+                col = x // self.square_size
+                row = (self.board_height - y) // self.square_size 
+                return [col, row]
+
+        return self.events.run(handle_event, tick=tick)
+
+instrument(
+    UserInteraction,
+    counters={"update_display": "frames drawn", "redraw": "full redraws", "render_glyph": "glyphs rendered", "mark_hints": "hint updates"},
+    timers={"update_display": "update_display", "redraw": "redraw", "draw_board": "draw_board", "click_to_coordinates": "waiting for a click"},
+)
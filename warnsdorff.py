@@ -0,0 +1,226 @@
+import ctypes
+import hashlib
+import os
+import random
+import subprocess
+import tempfile
+from functools import lru_cache
+from move_table import KNIGHT
+
+#The walk of Warnsdorff's rule is sequential, so on large boards the time goes into the Python loop that makes one move at a time, about a
+#microsecond per move. The same loop is also kept as a small C function, built with the system C compiler the first time it is needed and
+#cached in KERNEL_CACHE, which walks 1000x1000 boards in a few hundredths of a second. Without a compiler the Python loop is used; both make
+#exactly the same moves.
+
+KERNEL_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "knight_tour", "kernels")
+KERNEL_SOURCE = r"""
+long warnsdorff_walk(unsigned char *degree, long square, long moves, const long *offsets, int count, long width, long size, long pad,
+                     long center_x, long center_y, long *path)
+{
+    long length = 1;
+    path[0] = (square / width - pad) * size + square % width - pad;
+    for (long move = 0; move < moves; move++) {
+        long best = -1;
+        int best_degree = count + 1;
+        int tied = 0;
+        for (int index = 0; index < count; index++) {
+            long neighbor = square + offsets[index];
+            int onward = degree[neighbor];
+            if (onward <= count) {
+                onward--;
+                degree[neighbor] = (unsigned char)onward;
+                if (onward < best_degree) {
+                    best = neighbor;
+                    best_degree = onward;
+                    tied = 0;
+                } else if (onward == best_degree) {
+                    tied = 1;
+                }
+            }
+        }
+        if (best < 0)
+            break;
+        if (tied) {
+            long farthest = -1;
+            for (int index = 0; index < count; index++) {
+                long neighbor = square + offsets[index];
+                if (degree[neighbor] == best_degree) {
+                    long dx = 2 * (neighbor % width) - center_x;
+                    long dy = 2 * (neighbor / width) - center_y;
+                    if (dx * dx + dy * dy > farthest) {
+                        farthest = dx * dx + dy * dy;
+                        best = neighbor;
+                    }
+                }
+            }
+        }
+        square = best;
+        degree[square] = 255;
+        path[length++] = (square / width - pad) * size + square % width - pad;
+    }
+    return length;
+}
+"""
+
+def warnsdorff_tour(size, start_x, start_y, attempts=20, seed=0, height=None, piece=KNIGHT):
+    """
+    Searches for a full tour with Warnsdorff's rule: always move to the unvisited neighbor with the fewest onward moves.
+
+    The board is padded with a border as wide as the piece's reach that is never free, so neighbors can be found by adding a fixed offset
+    without bounds checks. The onward-move count of every square is kept up to date as squares are visited: entering a square lowers the
+    count of each of its unvisited neighbors by one. Ties are broken by picking the square farthest from the center of the board. If that
+    gets stuck, the search is retried with ties broken at random by a generator seeded with seed.
+
+    Args:
+        size (int): The width of the chessboard.
+        start_x (int): The x-coordinate index of the starting square.
+        start_y (int): The y-coordinate index of the starting square.
+        attempts (int): The maximum number of tries before giving up.
+        seed (int): Seed for the random tie-breaking used by the retries.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that tours the board.
+
+    Returns:
+        list[int] | None: The flat square indices (y * size + x) of the tour in visiting order, or None if no tour was found.
+    """
+
+    if height is None:
+        height = size
+    if piece.color_changing and size * height % 2 == 1 and (start_x + start_y) % 2 == 1:
+        # On boards with an odd number of squares a tour of a color-changing piece has to start on the color with the extra square.
+        return None
+
+    rng = random.Random(seed)
+    for attempt in range(attempts):
+        path = warnsdorff_walk(size, start_x, start_y, rng if attempt > 0 else None, height, piece)
+        if len(path) == size * height:
+            return path
+
+    return None
+
+def warnsdorff_walk(size, start_x, start_y, rng=None, height=None, piece=KNIGHT):
+    """
+    Walks the piece with Warnsdorff's rule until it gets stuck.
+
+    Args:
+        size (int): The width of the chessboard.
+        start_x (int): The x-coordinate index of the starting square.
+        start_y (int): The y-coordinate index of the starting square.
+        rng (random.Random | None): If given, ties are broken at random instead of by distance from the center.
+        height (int): The height of the chessboard, defaults to the width.
+        piece (Leaper): The piece that walks.
+
+    Returns:
+        list[int]: The flat square indices (y * size + x) of the visited squares in order.
+    """
+
+    if height is None:
+        height = size
+    pad = piece.reach
+    width = size + 2 * pad
+    offsets = tuple(dy * width + dx for dx, dy in piece.offsets)
+    limit = len(offsets)
+
+    # The onward-move count of every free square, and 255 for visited squares and the border, so one lookup tells both.
+    degree = bytearray(b'\xff') * (width * (height + 2 * pad))
+    free = bytearray(len(degree))
+    for y in range(height):
+        row = (y + pad) * width + pad
+        free[row:row + size] = b'\x01' * size
+
+    # The onward-move count of a square only depends on how close it is to the edges, so each distinct row is computed once.
+    rows = {}
+    for y in range(height):
+        row = (y + pad) * width + pad
+        key = (min(y, pad), min(height - 1 - y, pad))
+        if key not in rows:
+            rows[key] = bytes(sum(free[row + x + offset] for offset in offsets) for x in range(size))
+        degree[row:row + size] = rows[key]
+
+    # In padded coordinates the center of the board is at ((size - 1) / 2 + pad, (height - 1) / 2 + pad), so 2 * x - center_x is twice the
+    # distance from it.
+    center_x = size - 1 + 2 * pad
+    center_y = height - 1 + 2 * pad
+    square = (start_y + pad) * width + start_x + pad
+    degree[square] = 255
+
+    kernel = load_kernel() if rng is None else None
+    if kernel is not None:
+        path = (ctypes.c_long * (size * height))()
+        length = kernel((ctypes.c_ubyte * len(degree)).from_buffer(degree), square, size * height - 1, (ctypes.c_long * limit)(*offsets), limit,
+                        width, size, pad, center_x, center_y, path)
+        return path[:length]
+
+    path = [square]
+    for move in range(size * height - 1):
+        best = -1
+        best_degree = limit + 1
+        tied = False
+        for offset in offsets:
+            onward = degree[square + offset]
+            if onward <= limit:
+                onward -= 1
+                degree[square + offset] = onward
+                if onward < best_degree:
+                    best = square + offset
+                    best_degree = onward
+                    tied = False
+                elif onward == best_degree:
+                    tied = True
+
+        if best < 0:
+            break
+
+        if tied:
+            ties = [square + offset for offset in offsets if degree[square + offset] == best_degree]
+            if rng is not None:
+                best = ties[rng.randrange(len(ties))]
+            else:
+                farthest = -1
+                for neighbor in ties:
+                    y, x = divmod(neighbor, width)
+                    distance = (2 * x - center_x) ** 2 + (2 * y - center_y) ** 2
+                    if distance > farthest:
+                        farthest = distance
+                        best = neighbor
+
+        square = best
+        degree[square] = 255
+        path.append(square)
+
+    return [(square // width - pad) * size + square % width - pad for square in path]
+
+@lru_cache(maxsize=None)
+def load_kernel():
+    """
+    Loads the C version of the walk, building it with the system C compiler the first time. The library is cached in KERNEL_CACHE under a
+    hash of its source, so it is only built again when the source changes.
+
+    Returns:
+        ctypes._CFuncPtr | None: The walk function, or None if no C compiler is available or the build failed, in which case the walk runs
+            in Python.
+    """
+
+    library = os.path.join(KERNEL_CACHE, f"warnsdorff-{hashlib.sha1(KERNEL_SOURCE.encode()).hexdigest()[:16]}.so")
+    if not os.path.exists(library):
+        try:
+            os.makedirs(KERNEL_CACHE, exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=KERNEL_CACHE) as build:
+                source = os.path.join(build, "warnsdorff.c")
+                with open(source, "w") as file:
+                    file.write(KERNEL_SOURCE)
+                subprocess.run([os.environ.get("CC", "cc"), "-O2", "-shared", "-fPIC", "-o", os.path.join(build, "warnsdorff.so"), source],
+                               check=True, capture_output=True, timeout=60)
+                # Moving the finished library into place keeps a half-written one from being loaded by another process.
+                os.replace(os.path.join(build, "warnsdorff.so"), library)
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    try:
+        function = ctypes.CDLL(library).warnsdorff_walk
+    except OSError:
+        return None
+    function.restype = ctypes.c_long
+    function.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.c_long, ctypes.c_long, ctypes.POINTER(ctypes.c_long), ctypes.c_int, ctypes.c_long,
+                         ctypes.c_long, ctypes.c_long, ctypes.c_long, ctypes.c_long, ctypes.POINTER(ctypes.c_long)]
+    return function